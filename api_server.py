@@ -0,0 +1,306 @@
+"""
+Local HTTP API
+
+Read-only JSON views of the capture history, stats and objectives, plus a
+capture trigger, for overlays and stream tools. Bound to localhost and
+disabled unless "api": {"enabled": true} is set in config.json.
+
+Endpoints:
+    GET  /captures?game_id=1&since=2024-01-01&limit=100
+    GET  /stats
+    GET  /objectives/progress
+    POST /capture            body (optional): {"game_id": 1}
+
+GET responses are kept in memory (up to MAX_CACHED_RESPONSES, keyed by the
+query parameters each endpoint reads) until Storage changes and carry an ETag;
+clients sending If-None-Match get 304 Not Modified without any work.
+
+Requests must carry a Host header of 127.0.0.1:<port> or localhost:<port>
+(blocks DNS-rebinding pages), and POST requires Content-Type:
+application/json, which browsers can't send cross-site without a CORS
+preflight that this server never approves.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from storage import Storage
+
+
+# Largest page /captures returns
+MAX_CAPTURES_LIMIT = 1000
+
+# Responses kept in the cache (least recently used are dropped)
+MAX_CACHED_RESPONSES = 256
+
+# Query parameters each endpoint reads; the others don't split the cache
+CACHE_KEY_PARAMS = {
+    "/captures": ("game_id", "since", "limit")
+}
+
+
+class ApiServer:
+    """Localhost JSON API over Storage with an in-memory, ETag-validated response cache."""
+
+    def __init__(
+        self,
+        storage: Storage,
+        port: int = 8765,
+        storage_call: Optional[Callable[..., Any]] = None,
+        capture_func: Optional[Callable[[Optional[int]], Tuple[int, dict]]] = None,
+        host: str = "127.0.0.1"
+    ):
+        """
+        Initialize the server (call start() to listen).
+
+        Args:
+            storage: Storage instance to serve
+            port: TCP port
+            storage_call: Runs a Storage method, e.g. StorageWorker.call
+                          (default: call it directly)
+            capture_func: Handles POST /capture; receives the requested game ID
+                          (None: current game) and returns (HTTP status, JSON body).
+                          POST /capture answers 501 if omitted
+            host: Interface to bind (localhost only by default)
+        """
+        self.storage = storage
+        self.storage_call = storage_call or (lambda func, *args, **kwargs: func(*args, **kwargs))
+        self.capture_func = capture_func
+        self.address = (host, port)
+
+        # cache key -> (version, etag, body), least recently used first
+        self._cache: "OrderedDict[str, Tuple[tuple, str, bytes]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.storage.add_listener(self._on_storage_event)
+
+    def start(self) -> bool:
+        """
+        Start serving in a background thread.
+
+        Returns:
+            True if the server is listening
+        """
+        try:
+            self._server = ThreadingHTTPServer(self.address, self._make_handler())
+        except OSError as e:
+            print(f"Warning: could not start API server on {self.address[0]}:{self.address[1]}: {e}")
+            return False
+
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="api-server", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop serving."""
+        self.storage.remove_listener(self._on_storage_event)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _on_storage_event(self, event: str, payload: dict):
+        """Invalidate cached responses when the history changes."""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+    def _get_version(self) -> tuple:
+        """Version of the served data: local changes plus file signatures (other processes)."""
+        return self._generation, self.storage.get_signature()
+
+    @staticmethod
+    def make_cache_key(path: str, query: Dict[str, list]) -> str:
+        """Cache key of a GET request: the endpoint and the parameters it uses (first values)."""
+        params = sorted(
+            (name, query[name][0])
+            for name in CACHE_KEY_PARAMS.get(path, ())
+            if name in query
+        )
+        return f"{path}?{urlencode(params)}" if params else path
+
+    def get_cached(self, key: str, build: Callable[[], Any]) -> Tuple[str, bytes]:
+        """
+        Get a GET response body, building it only if the data changed.
+
+        Args:
+            key: Cache key (see make_cache_key)
+            build: Produces the JSON-serializable response
+
+        Returns:
+            Tuple of (etag, body)
+        """
+        version = self._get_version()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(key)
+                return cached[1], cached[2]
+
+        body = json.dumps(build(), ensure_ascii=False, default=str).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+        with self._lock:
+            self._cache[key] = (version, etag, body)
+            self._cache.move_to_end(key)
+            if len(self._cache) > MAX_CACHED_RESPONSES:
+                self._cache.popitem(last=False)
+
+        return etag, body
+
+    # Endpoint builders (run in request threads)
+
+    def build_captures(self, query: Dict[str, list]) -> dict:
+        """Captures, most recent first, filtered by game_id/since and limited."""
+        game_id = int(query["game_id"][0]) if "game_id" in query else None
+        since = query["since"][0] if "since" in query else None
+        limit = min(max(int(query.get("limit", ["100"])[0]), 0), MAX_CAPTURES_LIMIT)
+
+        captures = []
+        total = self.storage_call(self.storage.count_captures)
+        offset = 0
+
+        # Pages are already sorted most recent first; stop at `since`
+        while len(captures) < limit and offset < total:
+            page = self.storage_call(self.storage.load_history_page, offset, MAX_CAPTURES_LIMIT)
+            offset += len(page)
+            if not page:
+                break
+
+            for capture in page:
+                if since is not None and capture.get("timestamp", "") < since:
+                    offset = total
+                    break
+                if game_id is not None and capture.get("game_id", 1) != game_id:
+                    continue
+                captures.append(capture)
+                if len(captures) >= limit:
+                    break
+
+        return {"captures": captures, "count": len(captures)}
+
+    def build_stats(self) -> dict:
+        """Per-game stats and last captures."""
+        snapshot = self.storage_call(self.storage.snapshot, 0)
+        return {
+            "stats": snapshot["stats"],
+            "last_captures": snapshot["last_captures"],
+            "count": snapshot["count"]
+        }
+
+    def build_objectives_progress(self) -> dict:
+        """Progress and real probability of every objective."""
+        return {"objectives": self.storage_call(self.storage.get_all_objectives_progress)}
+
+    def get_allowed_hosts(self) -> set:
+        """Host header values accepted (the loopback names with the bound port)."""
+        port = self._server.server_address[1] if self._server else self.address[1]
+        return {f"127.0.0.1:{port}", f"localhost:{port}"}
+
+    def _make_handler(self):
+        """Create the request handler class bound to this server."""
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _check_host(self) -> bool:
+                # Pages on other origins can reach 127.0.0.1 (DNS rebinding)
+                host = (self.headers.get("Host") or "").lower()
+                if host not in api.get_allowed_hosts():
+                    self._send_json(403, {"error": "forbidden host"})
+                    return False
+                return True
+
+            def do_GET(self):
+                if not self._check_host():
+                    return
+
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                builders = {
+                    "/captures": lambda: api.build_captures(query),
+                    "/stats": api.build_stats,
+                    "/objectives/progress": api.build_objectives_progress
+                }
+
+                build = builders.get(url.path)
+                if build is None:
+                    self._send_json(404, {"error": "not found"})
+                    return
+
+                try:
+                    etag, body = api.get_cached(api.make_cache_key(url.path, query), build)
+                except ValueError as e:
+                    self._send_json(400, {"error": f"invalid parameter: {e}"})
+                    return
+                except Exception as e:
+                    self._send_json(500, {"error": str(e)})
+                    return
+
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self._send_body(200, body, etag)
+
+            def do_POST(self):
+                if not self._check_host():
+                    return
+
+                if urlparse(self.path).path != "/capture":
+                    self._send_json(404, {"error": "not found"})
+                    return
+
+                # Not a CORS "simple" content type: cross-site forms and fetches need a preflight
+                content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+                if content_type != "application/json":
+                    self._send_json(415, {"error": "Content-Type must be application/json"})
+                    return
+
+                if api.capture_func is None:
+                    self._send_json(501, {"error": "capture not available"})
+                    return
+
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    request = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                    game_id = request.get("game_id")
+                    game_id = int(game_id) if game_id is not None else None
+                except (ValueError, AttributeError) as e:
+                    self._send_json(400, {"error": f"invalid body: {e}"})
+                    return
+
+                status, payload = api.capture_func(game_id)
+                self._send_json(status, payload)
+
+            def _send_json(self, status: int, payload: dict):
+                self._send_body(status, json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+            def _send_body(self, status: int, body: bytes, etag: Optional[str] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-cache")
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Polling clients would flood the console
+                pass
+
+        return Handler
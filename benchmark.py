@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Ntropy Capture Pipeline Benchmark
+
+Runs the same capture → OCR → Storage pipeline as the GUI (CapturePipeline
+with Storage calls through a StorageWorker) without a display, against a
+temporary Storage pre-filled with N captures, and reports for each history
+size:
+
+    - captures per second
+    - per-stage latency percentiles (from tracing.py spans)
+    - Python allocations during captures (tracemalloc)
+    - peak RSS of the process
+
+Results are written as JSON so runs can be compared over time.
+
+Usage:
+    python benchmark.py                                # synthetic frames, real Tesseract
+    python benchmark.py --stub-ocr                     # leave Tesseract out (non-OCR cost)
+    python benchmark.py --source replay:frames/        # recorded frames (frame_source.py)
+    python benchmark.py --sizes 0 1000 100000 1000000 --captures 200 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from storage import Storage
+from storage_worker import StorageWorker
+from pipeline import CapturePipeline
+from tracing import tracer
+
+
+# History sizes measured by default
+DEFAULT_SIZES = [0, 1000, 10000, 100000, 1000000]
+
+# Regions used when the frame source doesn't dictate them
+DEFAULT_REGIONS = ({"x": 0, "y": 0, "width": 200, "height": 40}, {"x": 0, "y": 50, "width": 200, "height": 40})
+
+# Captures measured with tracemalloc on (it slows allocation-heavy code down)
+ALLOCATION_CAPTURES = 5
+
+
+class StubOCR:
+    """Stands in for OCRProcessor so the benchmark measures everything but Tesseract."""
+
+    @staticmethod
+    def extract_number(image, debug: bool = False) -> Optional[float]:
+        # Touch the pixels like Tesseract's input conversion would
+        image.tobytes()
+        return 12345.0
+
+
+def fill_history(storage: Storage, size: int):
+    """
+    Replace the history with size synthetic captures spread over the past days.
+
+    Written in one go (like a long-used data.json), not through save_capture.
+    """
+    start = datetime.now() - timedelta(minutes=size)
+    captures = [
+        {
+            "id": index + 1,
+            "value": 1000 + (index * 37) % 5000 + index / 100,
+            "game_id": index % 4 + 1,
+            "timestamp": (start + timedelta(minutes=index)).strftime("%Y-%m-%d %H:%M:%S"),
+            "notes": ""
+        }
+        for index in range(size)
+    ]
+    storage._write_json(storage.data_file, {"captures": captures})
+
+
+def get_regions(source) -> tuple:
+    """Converted/integer regions: the first two recorded ones for replays, else the defaults."""
+    regions = []
+    for frame in getattr(source, "frames", []):
+        region = frame.get("region")
+        if region and region not in regions:
+            regions.append(region)
+
+    if len(regions) < 2:
+        return DEFAULT_REGIONS
+
+    return tuple(
+        {"x": x, "y": y, "width": width, "height": height}
+        for x, y, width, height in regions[:2]
+    )
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        memory = psutil.Process().memory_info()
+        # Windows reports the peak working set
+        return getattr(memory, "peak_wset", memory.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def run_size(source, ocr, size: int, captures: int, game_id: int, workdir: str) -> dict:
+    """
+    Benchmark the pipeline against a history of the given size.
+
+    Returns:
+        Result dictionary for the JSON report
+    """
+    storage = Storage(
+        data_file=os.path.join(workdir, f"data_{size}.json"),
+        config_file=os.path.join(workdir, "config.json")
+    )
+    region_converted, region_integer = get_regions(source)
+    storage.save_game_region_converted(game_id, **region_converted)
+    storage.save_game_region_integer(game_id, **region_integer)
+    fill_history(storage, size)
+
+    worker = StorageWorker(storage)
+    pipeline = CapturePipeline(storage, source, ocr, storage_call=worker.call)
+
+    try:
+        # Warm-up: first OCR call, file cache, lazily built Storage caches
+        pipeline.capture(game_id)
+
+        tracer.clear()
+        start = time.perf_counter()
+        for _ in range(captures):
+            pipeline.capture(game_id)
+        elapsed = time.perf_counter() - start
+        stages = tracer.get_stats()
+
+        tracemalloc.start()
+        for _ in range(min(captures, ALLOCATION_CAPTURES)):
+            pipeline.capture(game_id)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        worker.stop()
+
+    return {
+        "history_size": size,
+        "captures": captures,
+        "elapsed_s": elapsed,
+        "captures_per_sec": captures / elapsed if elapsed > 0 else None,
+        "stages_ms": stages,
+        "tracemalloc": {
+            "captures": min(captures, ALLOCATION_CAPTURES),
+            "current_kb": current / 1024,
+            "peak_kb": peak / 1024
+        },
+        "peak_rss_mb": get_peak_rss_mb(),
+        "data_file_mb": os.path.getsize(storage.data_file) / (1024 * 1024)
+    }
+
+
+def print_result(result: dict):
+    """Print one history size's summary."""
+    print(
+        f"\nHistórico {result['history_size']:>9,}: {result['captures_per_sec']:8.1f} capturas/s, "
+        f"pico tracemalloc {result['tracemalloc']['peak_kb']:,.0f} KB, "
+        f"RSS máx {result['peak_rss_mb'] or 0:,.0f} MB"
+    )
+    for name, stage in result["stages_ms"].items():
+        print(
+            f"  {name:<24} p50 {stage['p50']:8.2f} ms  p95 {stage['p95']:8.2f} ms  "
+            f"p99 {stage['p99']:8.2f} ms  ({stage['count']} chamadas)"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Ntropy - benchmark do pipeline de captura")
+    parser.add_argument("--source", default="synthetic", help="origem dos quadros: synthetic[:SEMENTE] ou replay:PASTA (padrão: synthetic)")
+    parser.add_argument("--stub-ocr", action="store_true", help="substituir o Tesseract por um OCR fixo (mede só o resto do pipeline)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, metavar="N", help="tamanhos de histórico medidos")
+    parser.add_argument("--captures", type=int, default=50, help="capturas medidas por tamanho (padrão: 50)")
+    parser.add_argument("--game-id", type=int, default=1, help="jogo usado nas capturas (padrão: 1)")
+    parser.add_argument("--output", help="arquivo JSON de resultados (padrão: benchmark_AAAAMMDD_HHMMSS.json)")
+    args = parser.parse_args(argv)
+
+    if args.source == "live":
+        parser.error("o benchmark não usa a tela; escolha synthetic ou replay:PASTA")
+
+    try:
+        from frame_source import ReplayFrameSource, create_frame_source
+
+        kind, _, directory = args.source.partition(":")
+        if kind == "replay":
+            # Loop so every size gets the same number of captures; decode up front
+            source = ReplayFrameSource(directory, loop=True, preload=True)
+        else:
+            source = create_frame_source(args.source)
+
+        if args.stub_ocr:
+            ocr = StubOCR()
+        else:
+            from ocr_processor import OCRProcessor
+            ocr = OCRProcessor()
+    except ImportError as e:
+        print(f"❌ Dependência faltando: {e}")
+        print("Execute: pip install -r requirements.txt (ou use --stub-ocr sem o pytesseract)")
+        return 1
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ Origem de quadros inválida: {e}")
+        return 1
+
+    report = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "source": args.source,
+            "stub_ocr": args.stub_ocr,
+            "captures": args.captures,
+            "game_id": args.game_id
+        },
+        "results": []
+    }
+
+    workdir = tempfile.mkdtemp(prefix="ntropy_bench_")
+    try:
+        # Ascending, since peak RSS only grows
+        for size in sorted(args.sizes):
+            result = run_size(source, ocr, size, args.captures, args.game_id, workdir)
+            report["results"].append(result)
+            print_result(result)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nResultados salvos em {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,13 @@
 from PIL import ImageGrab, Image
 from typing import Tuple, Optional
 
+from tracing import traced
+
 class ScreenCapture:
     """Handles screen capture operations."""
 
     @staticmethod
+    @traced("capture.grab")
     def capture_region(x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
         """
         Capture a specific region of the screen.
@@ -43,6 +46,7 @@ class ScreenCapture:
             return None
 
     @staticmethod
+    @traced("capture.preprocess")
     def preprocess_for_ocr(image: Image.Image) -> Image.Image:
         """
         Preprocess image to improve OCR accuracy.
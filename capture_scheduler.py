@@ -0,0 +1,235 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+class _CaptureRequest:
+    """A pending capture for one game (possibly several coalesced presses)."""
+
+    def __init__(self, game_id: int, due: float):
+        self.game_id = game_id
+        self.due = due
+        self.presses = 1
+
+        # Handed to the workers; heap entries for it are stale from then on
+        self.released = False
+
+
+class CaptureScheduler:
+    """
+    Runs capture requests through a fixed pool of worker threads.
+
+    Requests for a game that already has a capture waiting (inside its delay
+    window or queued for a worker) are merged into it instead of adding a new
+    capture; if the new request is due sooner (e.g. F9 during an F3/F4 delay),
+    the waiting capture is moved up. Coalescing keeps waiting captures to one
+    per game, so max_pending only matters for callers that can name any game
+    ID (the HTTP API): once that many captures are waiting, requests for
+    other games are rejected instead of piling up work. Queue depth and
+    per-capture latency are kept for reporting.
+    """
+
+    # Latency samples kept for the percentiles
+    LATENCY_SAMPLES = 200
+
+    def __init__(
+        self,
+        capture_func: Callable[[int], object],
+        workers: int = 2,
+        max_pending: int = 4
+    ):
+        """
+        Start the dispatcher and worker threads.
+
+        Args:
+            capture_func: Performs one capture for a game ID (runs in a worker
+                          thread); returning False or raising counts as a failure
+            workers: Number of worker threads
+            max_pending: Maximum captures waiting (delayed or queued) at once
+        """
+        self.capture_func = capture_func
+        self.max_pending = max_pending
+
+        self._lock = threading.Condition()
+        self._pending: Dict[int, _CaptureRequest] = {}
+        self._delayed: List[tuple] = []
+        self._sequence = itertools.count()
+        self._ready: "queue.Queue" = queue.Queue()
+        self._running = 0
+        self._stopped = False
+
+        # Measurements
+        self.requested = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        self._durations = deque(maxlen=self.LATENCY_SAMPLES)
+
+        self._dispatcher = threading.Thread(target=self._dispatch, name="capture-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"capture-worker-{index}", daemon=True)
+            for index in range(max(workers, 1))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def request(self, game_id: int, delay: float = 0.0) -> Optional[str]:
+        """
+        Ask for a capture of a game.
+
+        Args:
+            game_id: Game to capture
+            delay: Seconds to wait before capturing (auto-capture hotkeys)
+
+        Returns:
+            "scheduled", "coalesced" (merged into a waiting capture), or None
+            if rejected because too many captures are waiting
+        """
+        with self._lock:
+            self.requested += 1
+
+            request = self._pending.get(game_id)
+            if request is not None:
+                request.presses += 1
+                self.coalesced += 1
+
+                due = time.monotonic() + delay
+                if not request.released and due < request.due:
+                    request.due = due
+                    if delay > 0:
+                        # The old heap entry is skipped by the dispatcher (due mismatch)
+                        heapq.heappush(self._delayed, (request.due, next(self._sequence), request))
+                        self._lock.notify_all()
+                    else:
+                        self._release(request)
+                return "coalesced"
+
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                return None
+
+            request = _CaptureRequest(game_id, time.monotonic() + delay)
+            self._pending[game_id] = request
+
+            if delay > 0:
+                heapq.heappush(self._delayed, (request.due, next(self._sequence), request))
+                self._lock.notify_all()
+            else:
+                self._release(request)
+
+        return "scheduled"
+
+    def _release(self, request: _CaptureRequest):
+        """Hand a request to the workers (lock held)."""
+        request.released = True
+        self._ready.put(request)
+
+    def get_queue_depth(self) -> int:
+        """Get the number of captures waiting or running."""
+        with self._lock:
+            return len(self._pending) + self._running
+
+    def get_stats(self) -> dict:
+        """
+        Get scheduler measurements.
+
+        Returns:
+            Dictionary with request counters, queue depth and latency
+            percentiles in milliseconds (latency = from the moment the capture
+            was due until it finished, i.e. queue wait + duration; duration =
+            time spent in capture_func)
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            durations = sorted(self._durations)
+
+            return {
+                "requested": self.requested,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed,
+                "waiting": len(self._pending),
+                "running": self._running,
+                "latency_ms": self._percentiles(latencies),
+                "duration_ms": self._percentiles(durations)
+            }
+
+    @staticmethod
+    def _percentiles(samples: List[float]) -> Dict[str, float]:
+        """Get p50/p95/max of sorted samples in milliseconds."""
+        if not samples:
+            return {}
+
+        def at(fraction: float) -> float:
+            return samples[min(int(fraction * len(samples)), len(samples) - 1)] * 1000
+
+        return {"p50": at(0.5), "p95": at(0.95), "max": samples[-1] * 1000}
+
+    def stop(self):
+        """Stop accepting work and let the threads exit."""
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+
+        for _ in self._workers:
+            self._ready.put(None)
+
+    def _dispatch(self):
+        """Release delayed requests to the workers when they are due (dispatcher thread)."""
+        with self._lock:
+            while not self._stopped:
+                if not self._delayed:
+                    self._lock.wait()
+                    continue
+
+                due, _, request = self._delayed[0]
+                if request.released or due != request.due:
+                    # Superseded by an earlier entry for the same request
+                    heapq.heappop(self._delayed)
+                    continue
+
+                remaining = due - time.monotonic()
+                if remaining > 0:
+                    self._lock.wait(remaining)
+                    continue
+
+                heapq.heappop(self._delayed)
+                self._release(request)
+
+    def _work(self):
+        """Run queued captures (worker thread)."""
+        while True:
+            request = self._ready.get()
+            if request is None:
+                break
+
+            with self._lock:
+                # From here on, new presses start a new capture
+                self._pending.pop(request.game_id, None)
+                self._running += 1
+
+            start = time.monotonic()
+            try:
+                failed = self.capture_func(request.game_id) is False
+            except Exception as e:
+                print(f"Error in capture for game {request.game_id}: {e}")
+                failed = True
+            finished = time.monotonic()
+
+            with self._lock:
+                self._running -= 1
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                self._durations.append(finished - start)
+                self._latencies.append(finished - request.due)
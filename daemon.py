@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Ntropy Headless Capture Daemon
+
+Runs captures without the GUI, either on demand or on the schedule defined
+in config.json:
+
+    "daemon": {
+        "schedule": [{"game_id": 1, "interval_minutes": 60}],
+        "require_active": true
+    }
+
+Only Storage, ScreenCapture, OCRProcessor and GameDetector are loaded (no
+Tk, no NumPy), so the process stays small.
+
+Usage:
+    python daemon.py                 # run the schedule until interrupted
+    python daemon.py --once          # run every scheduled game once and exit
+    python daemon.py --capture 1 2   # capture games 1 and 2 now and exit
+    python daemon.py --api           # also serve the local HTTP API (api_server.py)
+    python daemon.py --no-events     # don't publish capture events (event_feed.py)
+    python daemon.py --trace FILE    # write a Chrome trace of the captures on exit
+    python daemon.py --record DIR    # save every captured frame for later replay
+    python daemon.py --source replay:DIR --data scratch.json --replay 1
+                                     # replay recorded frames through the pipeline
+                                     # as fast as possible (frame_source.py)
+    python main.py --headless ...    # same options
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from storage import Storage
+from pipeline import CapturePipeline, CaptureError
+from tracing import tracer
+
+
+# Captures made by --replay from sources that never run out (live, synthetic)
+DEFAULT_REPLAY_COUNT = 1000
+
+
+class CaptureDaemon:
+    """Runs scheduled captures through the capture pipeline."""
+
+    def __init__(
+        self,
+        storage: Storage,
+        pipeline: CapturePipeline,
+        game_detector=None,
+        schedule: Optional[List[dict]] = None,
+        require_active: bool = True
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            storage: Storage instance
+            pipeline: Pipeline performing the captures
+            game_detector: GameDetector used to skip games that are not on screen
+                           (None: always capture)
+            schedule: List of {game_id, interval_minutes}
+            require_active: Only capture a game while its window is focused
+                            (otherwise it only has to be running)
+        """
+        self.storage = storage
+        self.pipeline = pipeline
+        self.game_detector = game_detector
+        self.schedule = schedule or []
+        self.require_active = require_active
+
+        self._stop = threading.Event()
+
+        # Scheduled and API-triggered captures must not interleave their Storage writes
+        self._capture_lock = threading.Lock()
+
+    def capture(self, game_id: int, check_running: bool = True) -> Optional[dict]:
+        """
+        Capture one game now.
+
+        Args:
+            game_id: Game identifier (1-4)
+            check_running: Skip the capture if the game is not on screen
+
+        Returns:
+            Pipeline result, or None if skipped or failed
+        """
+        if check_running and not self._is_capturable(game_id):
+            print(f"[{self._now()}] Jogo {game_id} não está {'ativo' if self.require_active else 'rodando'}; captura ignorada")
+            return None
+
+        try:
+            with self._capture_lock:
+                result = self.pipeline.capture(game_id)
+        except CaptureError as e:
+            print(f"[{self._now()}] Jogo {game_id}: {e}")
+            return None
+        except Exception as e:
+            print(f"[{self._now()}] Jogo {game_id}: erro na captura: {e}")
+            return None
+
+        print(f"[{self._now()}] Jogo {game_id}: capturado {result['value']:,.2f} (#{result['capture_id']})")
+        return result
+
+    def run_once(self):
+        """Capture every scheduled game once."""
+        for entry in self.schedule:
+            self.capture(int(entry["game_id"]))
+
+    def run(self):
+        """Run the schedule until stop() is called."""
+        if not self.schedule:
+            print("Nenhuma captura agendada (defina \"daemon.schedule\" no config.json)")
+            return
+
+        now = time.monotonic()
+        next_due = {index: now for index in range(len(self.schedule))}
+
+        while not self._stop.is_set():
+            index, due = min(next_due.items(), key=lambda item: item[1])
+
+            if self._stop.wait(max(due - time.monotonic(), 0)):
+                break
+
+            entry = self.schedule[index]
+            self.capture(int(entry["game_id"]))
+            next_due[index] = time.monotonic() + float(entry.get("interval_minutes", 60)) * 60
+
+    def stop(self):
+        """Stop run() after the current capture."""
+        self._stop.set()
+
+    def wait(self):
+        """Block until stop() is called."""
+        self._stop.wait()
+
+    def close(self):
+        """Finish writing archived capture images."""
+        if self.pipeline.archive is not None:
+            self.pipeline.archive.stop()
+
+    def api_capture(self, game_id: Optional[int]) -> tuple:
+        """Handle POST /capture from the HTTP API (synchronous capture)."""
+        if game_id is None and self.game_detector is not None:
+            game_id = self.game_detector.get_active_game()
+
+        if not game_id:
+            return 409, {"error": "nenhum jogo ativo"}
+
+        result = self.capture(game_id)
+        if result is None:
+            return 409, {"error": "captura falhou ou jogo não está ativo", "game_id": game_id}
+
+        return 201, result
+
+    def replay(self, game_id: int, count: Optional[int] = None) -> bool:
+        """
+        Capture a game back to back until the frame source runs out.
+
+        Meant for replayed or synthetic frames; nothing is printed per capture.
+
+        Args:
+            game_id: Game whose regions are captured
+            count: Stop after this many captures (None: until the frames run out)
+
+        Returns:
+            True if the replay ended normally (frames exhausted, count reached
+            or stopped), False if a capture failed
+        """
+        completed = 0
+        succeeded = True
+        start = time.perf_counter()
+
+        while count is None or completed < count:
+            if self._stop.is_set():
+                break
+            try:
+                self.pipeline.capture(game_id)
+            except CaptureError as e:
+                if not getattr(self.pipeline.screen_capture, "exhausted", False):
+                    print(f"[{self._now()}] Jogo {game_id}: {e}")
+                    succeeded = False
+                break
+            completed += 1
+
+        elapsed = time.perf_counter() - start
+        rate = completed / elapsed if elapsed > 0 else 0
+        print(f"[{self._now()}] {completed} capturas em {elapsed:.2f}s ({rate:.1f} capturas/s)")
+        return succeeded
+
+    def _is_capturable(self, game_id: int) -> bool:
+        """Check if a game is on screen (active or running, per require_active)."""
+        if self.game_detector is None:
+            return True
+
+        if self.require_active:
+            return self.game_detector.get_active_game() == game_id
+
+        return game_id in self.game_detector.get_running_games()
+
+    @staticmethod
+    def _now() -> str:
+        """Timestamp for log lines."""
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def build_daemon(storage: Storage, source: str = "live", record_dir: Optional[str] = None) -> CaptureDaemon:
+    """
+    Create the daemon and its components from the stored configuration.
+
+    Args:
+        storage: Storage instance receiving the captures
+        source: Frame source spec ("live", "replay:DIR" or "synthetic[:SEED]")
+        record_dir: Also save every frame to this directory
+
+    Raises:
+        ImportError: If Pillow, pytesseract or psutil is missing
+        ValueError: If the frame source spec is invalid
+        FileNotFoundError: If a replay directory has no frames
+    """
+    from frame_source import create_frame_source
+    from ocr_processor import OCRProcessor
+
+    settings = storage.get_daemon_config()
+
+    archive = None
+    archive_settings = storage.get_image_archive_config()
+    if archive_settings["enabled"]:
+        from image_archive import ImageArchive
+        archive = ImageArchive(
+            archive_settings["directory"],
+            archive_settings["max_mb"] * 1024 * 1024,
+            archive_settings["format"]
+        )
+
+    pipeline = CapturePipeline(
+        storage,
+        create_frame_source(source, record_dir),
+        OCRProcessor(),
+        archive=archive
+    )
+
+    # Replayed and synthetic frames don't need the game on screen
+    game_detector = None
+    if source == "live":
+        from game_detector import GameDetector
+        game_detector = GameDetector(storage.get_all_games())
+
+    return CaptureDaemon(
+        storage,
+        pipeline,
+        game_detector=game_detector,
+        schedule=settings["schedule"],
+        require_active=settings["require_active"]
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Ntropy - captura sem interface gráfica")
+    parser.add_argument("--capture", type=int, nargs="+", metavar="GAME_ID", help="capturar estes jogos agora e sair")
+    parser.add_argument("--once", action="store_true", help="capturar cada jogo agendado uma vez e sair")
+    parser.add_argument("--force", action="store_true", help="capturar mesmo se o jogo não estiver ativo")
+    parser.add_argument("--api", action="store_true", help="servir a API HTTP local (mesmo se desativada no config.json)")
+    parser.add_argument("--no-events", action="store_true", help="não publicar eventos de captura no socket Unix")
+    parser.add_argument("--trace", metavar="ARQUIVO", help="salvar um trace (formato Chrome) das capturas ao sair")
+    parser.add_argument("--source", default="live", help="origem dos quadros: live, replay:PASTA ou synthetic[:SEMENTE] (padrão: live)")
+    parser.add_argument("--record", metavar="PASTA", help="salvar cada quadro capturado nesta pasta (para replay)")
+    parser.add_argument("--replay", type=int, metavar="GAME_ID", help="capturar este jogo sem pausa até os quadros acabarem e sair")
+    parser.add_argument("--count", type=int, help=f"com --replay: parar após N capturas (padrão: até os quadros acabarem, ou {DEFAULT_REPLAY_COUNT} para live/synthetic)")
+    parser.add_argument("--data", metavar="ARQUIVO", help="salvar as capturas neste arquivo em vez do data.json")
+    args = parser.parse_args(argv)
+
+    try:
+        return _run(args)
+    finally:
+        if args.trace:
+            count = tracer.export_chrome_trace(args.trace)
+            print(f"Trace com {count} spans salvo em {args.trace}")
+
+
+def _run(args: argparse.Namespace) -> int:
+    """Run the daemon in the mode selected on the command line."""
+    storage = Storage(data_file=args.data) if args.data else Storage()
+
+    try:
+        daemon = build_daemon(storage, args.source, args.record)
+    except ImportError as e:
+        print(f"❌ Dependência faltando: {e}")
+        print("Execute: pip install -r requirements.txt")
+        return 1
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ Origem de quadros inválida: {e}")
+        return 1
+
+    try:
+        return _run_mode(daemon, storage, args)
+    finally:
+        daemon.close()
+
+
+def _run_mode(daemon: CaptureDaemon, storage: Storage, args: argparse.Namespace) -> int:
+    """Run the mode selected on the command line with a built daemon."""
+    if args.replay:
+        # Ctrl+C ends the replay early but still prints the summary
+        signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+
+        count = args.count
+        if count is None and not args.source.startswith("replay:"):
+            # Live and synthetic frames never run out
+            count = DEFAULT_REPLAY_COUNT
+            print(f"Origem {args.source} não tem fim; capturando {count} vezes (use --count para mudar)")
+
+        return 0 if daemon.replay(args.replay, count) else 1
+
+    if args.capture:
+        results = [daemon.capture(game_id, check_running=not args.force) for game_id in args.capture]
+        return 0 if all(results) else 1
+
+    if args.once:
+        daemon.run_once()
+        return 0
+
+    # Stop cleanly on Ctrl+C / service stop
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+
+    api_server = None
+    api_settings = storage.get_api_config()
+    if args.api or api_settings["enabled"]:
+        from api_server import ApiServer
+
+        api_server = ApiServer(storage, api_settings["port"], capture_func=daemon.api_capture)
+        if api_server.start():
+            print(f"API local em http://127.0.0.1:{api_settings['port']}")
+        else:
+            api_server = None
+
+    # Subscribers can only connect to a long-running process, so the
+    # one-shot modes above don't publish
+    event_feed = None
+    feed_settings = storage.get_event_feed_config()
+    if feed_settings["enabled"] and not args.no_events:
+        from event_feed import EventFeed
+
+        if EventFeed.is_supported():
+            event_feed = EventFeed(storage, feed_settings["socket_path"])
+            if event_feed.start():
+                print(f"Feed de eventos em {feed_settings['socket_path']}")
+            else:
+                event_feed = None
+
+    print(f"Ntropy daemon iniciado ({len(daemon.schedule)} capturas agendadas)")
+    daemon.run()
+
+    # Without a schedule, keep serving the API until interrupted
+    if api_server is not None:
+        daemon.wait()
+        api_server.stop()
+
+    if event_feed is not None:
+        event_feed.stop()
+
+    print("Ntropy daemon encerrado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from storage import Storage
+
+# Default socket file, next to data.json
+DEFAULT_SOCKET_PATH = "ntropy-events.sock"
+
+
+class _Subscriber:
+    """A connected client and the lines waiting to be sent to it."""
+
+    def __init__(self, connection: socket.socket):
+        self.connection = connection
+        self.pending = deque()
+        self.offset = 0
+
+
+class EventFeed:
+    """
+    Push feed of Storage changes on a Unix domain socket.
+
+    Every connected client receives each Storage event (capture_saved,
+    capture_deleted, history_cleared) as one line of JSON. publish() runs
+    in the thread that changed Storage, so it only appends to per-subscriber
+    buffers and wakes the I/O thread; the capture path never waits on
+    clients, and a subscriber whose buffer fills up is disconnected.
+    """
+
+    # Lines buffered per subscriber before it is considered too slow
+    MAX_PENDING = 1000
+
+    def __init__(self, storage: Storage, socket_path: str = DEFAULT_SOCKET_PATH):
+        """
+        Initialize the feed (call start() to listen).
+
+        Args:
+            storage: Storage instance whose changes are published
+            socket_path: Path of the Unix socket file
+        """
+        self.storage = storage
+        self.socket_path = socket_path
+
+        self._subscribers: Dict[int, _Subscriber] = {}
+        self._lock = threading.Lock()
+        self._selector = None
+        self._server = None
+        self._wake_reader = None
+        self._wake_writer = None
+        self._thread = None
+        self._running = False
+
+        # Measurements
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if the platform has Unix domain sockets."""
+        return hasattr(socket, "AF_UNIX")
+
+    def start(self) -> bool:
+        """
+        Start listening in a background thread.
+
+        Returns:
+            True if the socket is listening (False if Unix sockets are not
+            supported or another instance owns the socket)
+        """
+        if not self.is_supported():
+            print("Warning: Unix sockets not supported on this platform; event feed disabled")
+            return False
+
+        if os.path.exists(self.socket_path):
+            if self._is_socket_alive():
+                print(f"Warning: event feed socket already in use: {self.socket_path}")
+                return False
+            os.unlink(self.socket_path)
+
+        try:
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._server.bind(self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            self._server.listen()
+            self._server.setblocking(False)
+        except OSError as e:
+            print(f"Warning: could not start event feed: {e}")
+            return False
+
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ, "accept")
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, "wake")
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="event-feed", daemon=True)
+        self._thread.start()
+
+        self.storage.add_listener(self.publish)
+        return True
+
+    def stop(self):
+        """Disconnect all subscribers and remove the socket file."""
+        if not self._running:
+            return
+
+        self.storage.remove_listener(self.publish)
+        self._running = False
+        self._wake()
+        self._thread.join(timeout=2.0)
+
+    def publish(self, event: str, payload: dict):
+        """
+        Queue an event for every subscriber (Storage listener).
+
+        Args:
+            event: Event name (e.g. "capture_saved")
+            payload: JSON-serializable event data
+        """
+        if not self._running:
+            return
+
+        line = json.dumps(
+            {"event": event, "time": time.time(), **payload},
+            ensure_ascii=False,
+            default=str
+        ).encode("utf-8") + b"\n"
+
+        with self._lock:
+            self.published += 1
+            for subscriber in self._subscribers.values():
+                # Full buffers are dropped by the I/O thread
+                if len(subscriber.pending) <= self.MAX_PENDING:
+                    subscriber.pending.append(line)
+
+        self._wake()
+
+    def get_subscriber_count(self) -> int:
+        """Get the number of connected subscribers."""
+        with self._lock:
+            return len(self._subscribers)
+
+    def _wake(self):
+        """Interrupt the I/O thread's select()."""
+        try:
+            self._wake_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            # Already has a pending wake-up (or shutting down)
+            pass
+
+    def _is_socket_alive(self) -> bool:
+        """Check if another process is serving on the socket file."""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def _run(self):
+        """Accept subscribers and flush their buffers (I/O thread)."""
+        while self._running:
+            for key, _ in self._selector.select():
+                if key.data == "accept":
+                    self._accept()
+                elif key.data == "wake":
+                    try:
+                        while self._wake_reader.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    self._service(key.data)
+
+            self._update_interest()
+
+        self._shutdown()
+
+    def _accept(self):
+        """Register new subscribers."""
+        try:
+            connection, _ = self._server.accept()
+        except BlockingIOError:
+            return
+
+        connection.setblocking(False)
+        subscriber = _Subscriber(connection)
+
+        with self._lock:
+            self._subscribers[connection.fileno()] = subscriber
+
+        self._selector.register(connection, selectors.EVENT_READ, subscriber)
+
+    def _service(self, subscriber: _Subscriber):
+        """Handle a readable (closed) or writable subscriber socket."""
+        try:
+            # Subscribers don't send anything; readable means closed
+            if not subscriber.connection.recv(4096):
+                self._drop(subscriber)
+                return
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._drop(subscriber)
+            return
+
+        self._flush(subscriber)
+
+    def _flush(self, subscriber: _Subscriber):
+        """Send as much of a subscriber's buffer as the socket accepts."""
+        while True:
+            with self._lock:
+                if not subscriber.pending:
+                    return
+                line = subscriber.pending[0]
+
+            try:
+                sent = subscriber.connection.send(line[subscriber.offset:])
+            except BlockingIOError:
+                return
+            except OSError:
+                self._drop(subscriber)
+                return
+
+            subscriber.offset += sent
+            if subscriber.offset < len(line):
+                return
+
+            with self._lock:
+                subscriber.pending.popleft()
+            subscriber.offset = 0
+
+    def _update_interest(self):
+        """Watch for writability only where data is waiting; drop slow subscribers."""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+
+        for subscriber in subscribers:
+            with self._lock:
+                pending = len(subscriber.pending)
+
+            if pending > self.MAX_PENDING:
+                self.dropped_subscribers += 1
+                self._drop(subscriber)
+                continue
+
+            if pending:
+                self._flush(subscriber)
+
+            with self._lock:
+                pending = len(subscriber.pending)
+
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if pending else 0)
+            try:
+                self._selector.modify(subscriber.connection, events, subscriber)
+            except (KeyError, ValueError, OSError):
+                pass
+
+    def _drop(self, subscriber: _Subscriber):
+        """Disconnect a subscriber."""
+        with self._lock:
+            self._subscribers.pop(subscriber.connection.fileno(), None)
+
+        try:
+            self._selector.unregister(subscriber.connection)
+        except (KeyError, ValueError):
+            pass
+        subscriber.connection.close()
+
+    def _shutdown(self):
+        """Close every socket and remove the socket file (I/O thread)."""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+
+        for subscriber in subscribers:
+            self._drop(subscriber)
+
+        self._selector.close()
+        self._server.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
@@ -0,0 +1,243 @@
+"""
+Pull Income Forecasting
+
+Fits per-game pull income rates from the capture history and projects the
+date each objective crosses each probability milestone.
+"""
+
+import bisect
+import math
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from gacha_probability import GachaProbabilityCalculator, get_calculator
+
+
+# Probability milestones projected for each objective
+MILESTONES = (0.5, 0.75, 0.9, 0.99)
+
+
+class GameIncomeModel:
+    """
+    Incremental income-rate estimate for a single game.
+
+    Captures are grouped by calendar day (the last balance of the day wins).
+    Each pair of consecutive days gives a daily income rate; drops in the
+    balance are spending and are ignored. The rate is the day-weighted median
+    of the recent intervals, which is robust to outliers such as OCR misreads
+    and event rewards, and is updated in O(log n) per new day.
+    """
+
+    # Only intervals ending in the last N days contribute to the rate
+    WINDOW_DAYS = 90
+
+    def __init__(self):
+        # Closing balance of the last finished day and of the current day
+        self._closed_day: Optional[date] = None
+        self._closed_value: Optional[float] = None
+        self._current_day: Optional[date] = None
+        self._current_value: Optional[float] = None
+
+        # Intervals in arrival order (end_day, rate, days) and sorted (rate, days)
+        self._intervals = deque()
+        self._sorted_rates: List[tuple] = []
+        self._total_days = 0
+
+    def observe(self, timestamp: datetime, value: float):
+        """
+        Add a capture to the model.
+
+        Args:
+            timestamp: Capture time (captures must arrive in chronological order)
+            value: Pull balance captured
+        """
+        day = timestamp.date()
+
+        if self._current_day is None or day == self._current_day:
+            self._current_day = day
+            self._current_value = value
+            return
+
+        if day < self._current_day:
+            # Out of order capture; the closing balance of that day is already known
+            return
+
+        # A new day started: close the previous one
+        if self._closed_day is not None:
+            self._add_interval(self._closed_day, self._closed_value, self._current_day, self._current_value)
+
+        self._closed_day = self._current_day
+        self._closed_value = self._current_value
+        self._current_day = day
+        self._current_value = value
+
+    def _add_interval(self, start_day: date, start_value: float, end_day: date, end_value: float):
+        """Record the income rate between two closing balances."""
+        days = (end_day - start_day).days
+        delta = end_value - start_value
+
+        # Spending (or a misread) – not income
+        if days <= 0 or delta < 0:
+            return
+
+        rate = delta / days
+        self._intervals.append((end_day, rate, days))
+        bisect.insort(self._sorted_rates, (rate, days))
+        self._total_days += days
+
+        # Drop intervals that left the window
+        cutoff = end_day - timedelta(days=self.WINDOW_DAYS)
+        while self._intervals and self._intervals[0][0] <= cutoff:
+            _, old_rate, old_days = self._intervals.popleft()
+            index = bisect.bisect_left(self._sorted_rates, (old_rate, old_days))
+            del self._sorted_rates[index]
+            self._total_days -= old_days
+
+    def get_daily_rate(self) -> Optional[float]:
+        """
+        Get the estimated pull income per day.
+
+        Returns:
+            Pulls per day, or None if there is not enough history yet
+        """
+        if not self._sorted_rates:
+            return None
+
+        # Day-weighted median
+        half = self._total_days / 2
+        accumulated = 0
+        for rate, days in self._sorted_rates:
+            accumulated += days
+            if accumulated >= half:
+                return rate
+
+        return self._sorted_rates[-1][0]
+
+    def get_last_value(self) -> Optional[float]:
+        """Get the most recent pull balance observed."""
+        return self._current_value
+
+
+class IncomeForecaster:
+    """Per-game income models fed incrementally from the capture history."""
+
+    def __init__(self, calculator: Optional[GachaProbabilityCalculator] = None):
+        """
+        Initialize the forecaster.
+
+        Args:
+            calculator: Calculator providing the probability table (singleton by default)
+        """
+        self.calculator = calculator or get_calculator()
+        self.models: Dict[int, GameIncomeModel] = {}
+
+        # Highest capture ID already consumed, so sync() only processes new captures
+        self._last_capture_id = 0
+        self._lock = threading.Lock()
+
+    def sync(self, captures: Iterable[dict]):
+        """
+        Feed captures not seen yet (e.g. Storage.load_history()).
+
+        Args:
+            captures: Capture records in any order
+        """
+        new_captures = [c for c in captures if c.get("id", 0) > self._last_capture_id]
+        new_captures.sort(key=lambda c: (c.get("timestamp", ""), c.get("id", 0)))
+
+        for capture in new_captures:
+            self.observe_capture(capture)
+
+    def observe_capture(self, capture: dict):
+        """Add a single capture record to its game's model."""
+        try:
+            timestamp = datetime.strptime(capture["timestamp"], "%Y-%m-%d %H:%M:%S")
+        except (KeyError, ValueError):
+            return
+
+        self.observe(capture.get("game_id", 1), capture.get("value", 0), timestamp, capture.get("id", 0))
+
+    def observe(self, game_id: int, value: float, timestamp: Optional[datetime] = None, capture_id: int = 0):
+        """
+        Add a new capture as it arrives.
+
+        Args:
+            game_id: Game identifier (1-4)
+            value: Pull balance captured
+            timestamp: Capture time (defaults to now)
+            capture_id: Storage ID of the capture, if known
+        """
+        with self._lock:
+            if game_id not in self.models:
+                self.models[game_id] = GameIncomeModel()
+
+            self.models[game_id].observe(timestamp or datetime.now(), value)
+            self._last_capture_id = max(self._last_capture_id, capture_id)
+
+    def reset(self):
+        """Forget all history (e.g. after captures were deleted)."""
+        with self._lock:
+            self.models.clear()
+            self._last_capture_id = 0
+
+    def get_daily_rate(self, game_id: int) -> Optional[float]:
+        """Get the estimated pull income per day for a game."""
+        with self._lock:
+            model = self.models.get(game_id)
+            return model.get_daily_rate() if model else None
+
+    def project_objective(
+        self,
+        game_id: int,
+        objective: dict,
+        current_pulls: Optional[float] = None,
+        today: Optional[date] = None
+    ) -> Dict[str, dict]:
+        """
+        Project when an objective crosses each probability milestone.
+
+        Args:
+            game_id: Game identifier (1-4)
+            objective: Objective as returned by Storage.get_objectives
+            current_pulls: Pull balance to start from (defaults to the last capture)
+            today: Reference date (defaults to today)
+
+        Returns:
+            Dictionary mapping "50%", "75%", ... to
+            {pulls_needed, reached, days, date} (days/date are None when the
+            income rate is unknown)
+        """
+        today = today or date.today()
+
+        with self._lock:
+            model = self.models.get(game_id)
+            rate = model.get_daily_rate() if model else None
+            if current_pulls is None:
+                current_pulls = (model.get_last_value() if model else None) or 0
+
+        pity = min(max(int(objective.get("current_pity", 0)), 0), self.calculator.HARD_PITY - 1)
+        guaranteed = bool(objective.get("guaranteed", False))
+        curve = self.calculator.get_probability_table()[int(guaranteed), pity]
+
+        projection = {}
+        for target in MILESTONES:
+            reached_at = (curve >= target).nonzero()[0]
+            pulls_needed = int(reached_at[0]) if len(reached_at) else None
+
+            reached = pulls_needed is not None and current_pulls >= pulls_needed
+            days = None
+            if reached:
+                days = 0
+            elif pulls_needed is not None and rate:
+                days = math.ceil((pulls_needed - current_pulls) / rate)
+
+            projection[f"{int(target*100)}%"] = {
+                "pulls_needed": pulls_needed,
+                "reached": reached,
+                "days": days,
+                "date": today + timedelta(days=days) if days is not None else None
+            }
+
+        return projection
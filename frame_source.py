@@ -0,0 +1,327 @@
+"""
+Frame sources for the capture pipeline
+
+A frame source stands in for ScreenCapture in CapturePipeline: it answers
+capture_region() with an image, and inherits preprocess_for_ocr(), so the
+rest of the pipeline (OCR, Storage) runs unchanged.
+
+    live            the screen (ScreenCapture)
+    replay:DIR      frames previously saved by FrameRecorder (or any *.png)
+    synthetic[:N]   generated counter images, seeded with N (default 0)
+
+FrameRecorder wraps any source and saves every frame it returns, with its
+timestamp and region, to a directory that ReplayFrameSource can play back.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from capture import ScreenCapture
+from tracing import traced
+
+
+# Frame list written by FrameRecorder, one JSON object per line
+INDEX_FILE = "frames.jsonl"
+
+
+class FrameSource(ScreenCapture):
+    """Base class: provides the images returned by capture_region()."""
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        """
+        Get the frame for a screen region.
+
+        Returns:
+            PIL Image object or None if no frame is available
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources held by the source."""
+
+
+class LiveFrameSource(FrameSource):
+    """Frames grabbed from the screen."""
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        return ScreenCapture.capture_region(x, y, width, height)
+
+
+class ReplayFrameSource(FrameSource):
+    """
+    Plays back a directory of frames.
+
+    With a FrameRecorder index, each region gets the frames recorded for it,
+    in order, so captures reproduce the original converted/integer pairs
+    even if they were recorded from several games. Without an index (or for
+    regions that were never recorded) frames are returned in file name order.
+    """
+
+    def __init__(self, directory: str, loop: bool = False, realtime: bool = False, preload: bool = False):
+        """
+        Initialize the replay.
+
+        Args:
+            directory: Directory with the frames (and optionally frames.jsonl)
+            loop: Start over when the frames run out (otherwise capture_region
+                  returns None, which the pipeline reports as a failed capture)
+            realtime: Wait between frames as long as during the recording
+                      (default: return them as fast as possible)
+            preload: Decode every frame up front, so replay measures the
+                     pipeline and not disk reads
+
+        Raises:
+            FileNotFoundError: If the directory has no frames
+        """
+        self.directory = directory
+        self.loop = loop
+        self.realtime = realtime
+
+        self.frames = self._read_index()
+        if not self.frames:
+            raise FileNotFoundError(f"No frames found in {directory}")
+
+        self._images: Dict[str, Image.Image] = {}
+        if preload:
+            for frame in self.frames:
+                self._images[frame["file"]] = self._read_image(frame["file"])
+
+        self._lock = threading.Lock()
+        self.rewind()
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def _read_index(self) -> List[dict]:
+        """Read the recorder index, or list the images by name."""
+        index_path = os.path.join(self.directory, INDEX_FILE)
+
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.lower().endswith((".png", ".webp"))
+        )
+        return [{"file": name} for name in names]
+
+    def rewind(self):
+        """Restart the replay from the first frame."""
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        """Queue every frame again (lock held)."""
+        # Frame positions per recorded region, and all positions in order
+        self._queues: Dict[Tuple[int, ...], deque] = {}
+        for position, frame in enumerate(self.frames):
+            if frame.get("region"):
+                self._queues.setdefault(tuple(frame["region"]), deque()).append(position)
+
+        self._unkeyed = deque(range(len(self.frames)))
+        self._consumed = set()
+        self._started = None
+        self.replayed = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """True once every frame has been returned (never when looping)."""
+        return not self.loop and self.replayed >= len(self.frames)
+
+    @traced("capture.grab")
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        with self._lock:
+            frame = self._next_frame((x, y, width, height))
+            if frame is None:
+                return None
+
+            self.replayed += 1
+            if self._started is None:
+                self._started = (time.monotonic(), frame.get("time", 0))
+            started = self._started
+
+        if self.realtime and "time" in frame:
+            wait = (frame["time"] - started[1]) - (time.monotonic() - started[0])
+            if wait > 0:
+                time.sleep(wait)
+
+        return self._load(frame["file"])
+
+    def _next_frame(self, region: Tuple[int, ...]) -> Optional[dict]:
+        """Take the next frame recorded for a region, else the next in order (lock held)."""
+        for queue in (self._queues.get(region), self._unkeyed):
+            while queue:
+                position = queue.popleft()
+                if position not in self._consumed:
+                    self._consumed.add(position)
+                    return self.frames[position]
+
+        if self.loop:
+            self._reset()
+            return self._next_frame(region)
+
+        return None
+
+    def _load(self, name: str) -> Image.Image:
+        """Get a frame (a copy, so the pipeline can't alter preloaded images)."""
+        image = self._images.get(name)
+        if image is not None:
+            return image.copy()
+        return self._read_image(name)
+
+    def _read_image(self, name: str) -> Image.Image:
+        """Decode a frame file."""
+        with Image.open(os.path.join(self.directory, name)) as image:
+            image.load()
+            return image.copy()
+
+
+class SyntheticFrameSource(FrameSource):
+    """
+    Generates counter-like images (dark digits on a light background).
+
+    The sequence of values is fully determined by the seed; values returns
+    every value drawn so far, so OCR results can be checked against it.
+    """
+
+    def __init__(self, seed: int = 0, max_value: int = 99999):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed of the value sequence
+            max_value: Largest value drawn
+        """
+        self.max_value = max_value
+        self.values: List[int] = []
+
+        self._random = random.Random(seed)
+        self._fonts: Dict[int, ImageFont.ImageFont] = {}
+        self._lock = threading.Lock()
+
+    @traced("capture.grab")
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        with self._lock:
+            value = self._random.randint(0, self.max_value)
+            self.values.append(value)
+
+        image = Image.new("RGB", (max(width, 20), max(height, 10)), "white")
+        ImageDraw.Draw(image).text(
+            (4, max(height, 10) // 4),
+            f"{value:,}",
+            fill="black",
+            font=self._get_font(int(max(height, 10) * 0.6))
+        )
+        return image
+
+    def _get_font(self, size: int) -> ImageFont.ImageFont:
+        """Get the default font scaled to the region height (fixed size on old Pillow)."""
+        font = self._fonts.get(size)
+        if font is None:
+            try:
+                font = ImageFont.load_default(size=size)
+            except TypeError:
+                # Pillow < 10.1: bitmap font only
+                font = ImageFont.load_default()
+            self._fonts[size] = font
+        return font
+
+
+class FrameRecorder(FrameSource):
+    """Saves every frame of another source for later replay."""
+
+    def __init__(self, source: ScreenCapture, directory: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            source: Source whose frames are recorded (e.g. ScreenCapture())
+            directory: Output directory (created if needed; existing
+                       recordings are appended to)
+        """
+        self.source = source
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(directory, INDEX_FILE)
+        self._sequence = self._count_recorded()
+        self.recorded = 0
+
+    def _count_recorded(self) -> int:
+        """Number of frames already in the index (to continue numbering)."""
+        if not os.path.exists(self._index_path):
+            return 0
+        with open(self._index_path, 'r', encoding='utf-8') as f:
+            return sum(1 for line in f if line.strip())
+
+    def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[Image.Image]:
+        image = self.source.capture_region(x, y, width, height)
+        if image is None:
+            return None
+
+        with self._lock:
+            self._sequence += 1
+            name = f"{self._sequence:06d}.png"
+
+            try:
+                image.save(os.path.join(self.directory, name))
+                with open(self._index_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({"file": name, "time": time.time(), "region": [x, y, width, height]}) + "\n")
+                self.recorded += 1
+            except OSError as e:
+                print(f"Error recording frame: {e}")
+
+        return image
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the recorded source has run out of frames."""
+        return getattr(self.source, "exhausted", False)
+
+    def preprocess_for_ocr(self, image: Image.Image) -> Image.Image:
+        return self.source.preprocess_for_ocr(image)
+
+    def close(self):
+        if hasattr(self.source, "close"):
+            self.source.close()
+
+
+def create_frame_source(spec: str = "live", record_dir: Optional[str] = None) -> ScreenCapture:
+    """
+    Create a frame source from a command-line style spec.
+
+    Args:
+        spec: "live", "replay:DIR" or "synthetic[:SEED]"
+        record_dir: Also record every frame to this directory
+
+    Returns:
+        Object usable as CapturePipeline's screen_capture
+
+    Raises:
+        ValueError: If the spec is not recognized
+        FileNotFoundError: If a replay directory has no frames
+    """
+    kind, _, argument = spec.partition(":")
+
+    if kind == "live":
+        source = LiveFrameSource()
+    elif kind == "replay" and argument:
+        source = ReplayFrameSource(argument)
+    elif kind == "synthetic":
+        source = SyntheticFrameSource(seed=int(argument) if argument else 0)
+    else:
+        raise ValueError(f"Unknown frame source: {spec!r} (use live, replay:DIR or synthetic[:SEED])")
+
+    if record_dir:
+        source = FrameRecorder(source, record_dir)
+
+    return source
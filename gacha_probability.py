@@ -5,8 +5,17 @@ Calculates realistic probabilities for obtaining desired characters
 considering pity system and 50/50 mechanics.
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
+import hashlib
+import json
 import math
+import os
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class GachaProbabilityCalculator:
@@ -19,10 +28,52 @@ class GachaProbabilityCalculator:
 
     # Soft pity cumulative probability (pulls 76-89)
     SOFT_PITY_TOTAL = 0.324  # ~32.4%
+    SOFT_PITY_STEP = 0.06  # Rate increase per pull inside soft pity
+
+    # Chance that a non-guaranteed 5-star is the featured character
+    FEATURED_RATE = 0.5
+
+    # Bump whenever the table layout or formula changes to invalidate old caches
+    TABLE_FORMAT_VERSION = 1
+
+    # Smallest table written to disk, so common lookups never need a rebuild
+    DEFAULT_TABLE_PULLS = 360
+
+    def __init__(self, cache_dir: Optional[str] = os.path.join("cache", "probability_tables")):
+        """
+        Initialize the calculator.
+
+        Args:
+            cache_dir: Directory for persisted probability tables (None disables the disk cache)
+        """
+        self.cache_dir = cache_dir
+
+        # Precomputed desired character probability table (see get_probability_table)
+        self._table = None
+
+    def get_pull_rate(self, pull_number: int) -> float:
+        """
+        Get the 5-star rate of a single pull.
+
+        Args:
+            pull_number: Position of the pull since the last 5-star (1-90)
 
-    def __init__(self):
-        """Initialize the calculator."""
-        pass
+        Returns:
+            Probability as decimal (0.0 to 1.0)
+        """
+        # Hard pity - guaranteed
+        if pull_number >= self.HARD_PITY:
+            return 1.0
+
+        if pull_number < self.SOFT_PITY_START:
+            # Base rate (0.6%)
+            return self.BASE_RATE
+
+        # Soft pity (pulls 76-89)
+        # Distribute the 32.4% across 14 pulls with increasing probability
+        pulls_into_soft_pity = pull_number - self.SOFT_PITY_START
+        # Linear increase in soft pity range
+        return self.BASE_RATE + (pulls_into_soft_pity * self.SOFT_PITY_STEP)
 
     def calculate_single_5star_probability(self, pulls: int, current_pity: int = 0) -> float:
         """
@@ -54,15 +105,7 @@ class GachaProbabilityCalculator:
                 break
 
             # Calculate probability for this single pull
-            if current_pull_number < self.SOFT_PITY_START:
-                # Base rate (0.6%)
-                prob_5star_this_pull = self.BASE_RATE
-            else:
-                # Soft pity (pulls 76-89)
-                # Distribute the 32.4% across 14 pulls with increasing probability
-                pulls_into_soft_pity = current_pull_number - self.SOFT_PITY_START
-                # Linear increase in soft pity range
-                prob_5star_this_pull = self.BASE_RATE + (pulls_into_soft_pity * 0.06)
+            prob_5star_this_pull = self.get_pull_rate(current_pull_number)
 
             # Compound probability of NOT getting 5-star
             prob_no_5star *= (1.0 - prob_5star_this_pull)
@@ -112,14 +155,14 @@ class GachaProbabilityCalculator:
 
         # Scenario 1: Win the 50/50 on first 5-star
         prob_first_5star = self.calculate_single_5star_probability(pulls, current_pity)
-        prob_win_5050 = prob_first_5star * 0.5
+        prob_win_5050 = prob_first_5star * self.FEATURED_RATE
         total_probability += prob_win_5050
         explanation_parts.append(f"Ganhar 50/50: {prob_win_5050*100:.1f}%")
 
         # Scenario 2: Lose 50/50, then get guaranteed
         if pulls > (self.HARD_PITY - current_pity):
             # We have enough pulls to potentially get 2 five-stars
-            prob_lose_5050 = prob_first_5star * 0.5
+            prob_lose_5050 = prob_first_5star * (1.0 - self.FEATURED_RATE)
 
             # After losing 50/50, calculate remaining pulls
             remaining_pulls = pulls - (self.HARD_PITY - current_pity)
@@ -198,6 +241,131 @@ class GachaProbabilityCalculator:
             "guaranteed_pulls": self.HARD_PITY * (1 if guaranteed else 2) - current_pity
         }
 
+    def get_probability_table(self, max_pulls: int = 360):
+        """
+        Get the desired character probability for every state and pull count.
+
+        The whole table is computed in one vectorized pass from the survival
+        function of the pity system and cached, so lookups are O(1).
+
+        Args:
+            max_pulls: Largest number of pulls the table must cover
+
+        Returns:
+            Read-only NumPy array indexed as [guaranteed, current_pity, pulls]
+            with the same values as calculate_desired_character_probability
+        """
+        if np is None:
+            raise ImportError(
+                "numpy is not installed. "
+                "Please install it with: pip install numpy"
+            )
+
+        max_pulls = max(int(max_pulls), 0)
+
+        if self._table is None or self._table.shape[2] <= max_pulls:
+            self._table = self._load_cached_table(max_pulls)
+
+        if self._table is None:
+            self._table = self._build_probability_table(max(max_pulls, self.DEFAULT_TABLE_PULLS))
+            self._save_cached_table(self._table)
+
+        return self._table[:, :, :max_pulls + 1]
+
+    def get_rule_profile(self) -> dict:
+        """Get the rules that determine the probability table."""
+        return {
+            "version": self.TABLE_FORMAT_VERSION,
+            "base_rate": self.BASE_RATE,
+            "soft_pity_start": self.SOFT_PITY_START,
+            "soft_pity_step": self.SOFT_PITY_STEP,
+            "hard_pity": self.HARD_PITY,
+            "featured_rate": self.FEATURED_RATE
+        }
+
+    def _get_table_cache_path(self) -> Optional[str]:
+        """Get the .npy cache file for the current rule profile."""
+        if not self.cache_dir:
+            return None
+
+        profile = json.dumps(self.get_rule_profile(), sort_keys=True)
+        profile_hash = hashlib.sha256(profile.encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(
+            self.cache_dir,
+            f"desired_v{self.TABLE_FORMAT_VERSION}_{profile_hash}.npy"
+        )
+
+    def _load_cached_table(self, max_pulls: int):
+        """
+        Memory-map a persisted table if it covers max_pulls.
+
+        The table is opened read-only, so warm starts skip the computation
+        and the pages are shared between processes by the OS.
+        """
+        path = self._get_table_cache_path()
+        if not path or not os.path.exists(path):
+            return None
+
+        try:
+            table = np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"Error loading probability table cache: {e}")
+            return None
+
+        if table.ndim != 3 or table.shape[:2] != (2, self.HARD_PITY) or table.shape[2] <= max_pulls:
+            return None
+
+        return table
+
+    def _save_cached_table(self, table):
+        """Persist a table atomically so concurrent readers never see a partial file."""
+        path = self._get_table_cache_path()
+        if not path:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, table)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+        except OSError as e:
+            # The cache is an optimization only; keep the in-memory table
+            print(f"Error saving probability table cache: {e}")
+
+    def _build_probability_table(self, max_pulls: int):
+        """Build the [guaranteed, current_pity, pulls] probability table."""
+        # survival[n] = probability of no 5-star in the first n pulls after a reset
+        rates = np.array([self.get_pull_rate(n) for n in range(1, self.HARD_PITY + 1)])
+        survival = np.concatenate(([1.0], np.cumprod(1.0 - rates)))
+        survival[self.HARD_PITY] = 0.0
+
+        pity = np.arange(self.HARD_PITY)[:, None]
+        pulls = np.arange(max_pulls + 1)[None, :]
+
+        # At least one 5-star within `pulls` starting from `pity`
+        reached = np.minimum(pity + pulls, self.HARD_PITY)
+        single = 1.0 - survival[reached] / survival[pity]
+
+        # Lose the 50/50, then get the guaranteed one after the hard pity
+        remaining = pulls - (self.HARD_PITY - pity)
+        second = 1.0 - survival[np.clip(remaining, 0, self.HARD_PITY)]
+        lose_then_win = np.where(remaining > 0, single * (1.0 - self.FEATURED_RATE) * second, 0.0)
+
+        table = np.empty((2, self.HARD_PITY, max_pulls + 1))
+        table[0] = np.minimum(single * self.FEATURED_RATE + lose_then_win, 1.0)
+        table[1] = single
+        table.setflags(write=False)
+
+        return table
+
 
 # Singleton instance
 _calculator = GachaProbabilityCalculator()
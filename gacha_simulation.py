@@ -0,0 +1,316 @@
+"""
+Gacha Monte Carlo Simulator
+
+Simulates millions of banner runs with vectorized NumPy RNG to validate
+the analytic model in gacha_probability against ground truth.
+
+Uso:
+    python gacha_simulation.py --pulls 180 --runs 200000
+    python gacha_simulation.py --pulls 120 --pity 40 --guaranteed
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from gacha_probability import GachaProbabilityCalculator, get_calculator
+
+
+# Maximum number of simulated runs held in memory at once by a single shard
+CHUNK_SIZE = 1_000_000
+
+# z-score for 95% confidence intervals
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes: int, runs: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Wilson score confidence interval for a binomial proportion.
+
+    Args:
+        successes: Number of successful runs
+        runs: Total number of runs
+        z: z-score of the desired confidence level
+
+    Returns:
+        Tuple of (low, high) as decimals
+    """
+    if runs <= 0:
+        return 0.0, 1.0
+
+    p = successes / runs
+    denominator = 1.0 + z * z / runs
+    center = (p + z * z / (2 * runs)) / denominator
+    margin = z * math.sqrt(p * (1.0 - p) / runs + z * z / (4 * runs * runs)) / denominator
+
+    low = 0.0 if successes == 0 else max(center - margin, 0.0)
+    high = 1.0 if successes == runs else min(center + margin, 1.0)
+
+    return low, high
+
+
+def _simulate_shard(
+    rates,
+    featured_rate: float,
+    pulls: int,
+    pities,
+    guaranteed,
+    runs: int,
+    seed_sequence
+):
+    """
+    Simulate `runs` banner runs for every starting state (runs in a worker process).
+
+    Args:
+        rates: Array with the 5-star rate indexed by pull number (index 0 unused)
+        featured_rate: Chance that a non-guaranteed 5-star is the featured character
+        pulls: Pulls available in each run
+        pities: Starting pity of each state
+        guaranteed: Starting guaranteed flag of each state
+        runs: Runs per state simulated by this shard
+        seed_sequence: Independent SeedSequence for this shard
+
+    Returns:
+        Array with the number of successful runs per state
+    """
+    rng = np.random.default_rng(seed_sequence)
+    n_states = len(pities)
+    successes = np.zeros(n_states, dtype=np.int64)
+
+    # Split the runs so a shard never holds more than CHUNK_SIZE runs at once
+    runs_per_chunk = max(CHUNK_SIZE // n_states, 1)
+    done = 0
+
+    while done < runs:
+        chunk = min(runs_per_chunk, runs - done)
+
+        state_index = np.repeat(np.arange(n_states), chunk)
+        pity = np.repeat(np.asarray(pities, dtype=np.int64), chunk)
+        is_guaranteed = np.repeat(np.asarray(guaranteed, dtype=bool), chunk)
+        success = np.zeros(pity.shape, dtype=bool)
+
+        for _ in range(pulls):
+            pity += 1
+            rate = rates[pity]
+            roll = rng.random(pity.shape)
+
+            # A single uniform draw decides both the 5-star and the 50/50:
+            # conditioned on roll < rate, roll / rate is uniform as well.
+            hit = roll < rate
+            featured = hit & (is_guaranteed | (roll < rate * featured_rate))
+
+            success |= featured
+            np.putmask(is_guaranteed, hit, ~featured)
+            np.putmask(pity, hit, 0)
+
+        successes += np.bincount(state_index[success], minlength=n_states)
+        done += chunk
+
+    return successes
+
+
+class MonteCarloSimulator:
+    """Monte Carlo simulator for the pity and 50/50 system, sharded across processes."""
+
+    def __init__(
+        self,
+        calculator: Optional[GachaProbabilityCalculator] = None,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the simulator.
+
+        Args:
+            calculator: Calculator providing the banner rules (singleton by default)
+            workers: Number of worker processes (defaults to CPU count)
+            seed: Root seed for reproducible runs (random if None)
+        """
+        if np is None:
+            raise ImportError(
+                "numpy is not installed. "
+                "Please install it with: pip install numpy"
+            )
+
+        self.calculator = calculator or get_calculator()
+        self.workers = max(workers or os.cpu_count() or 1, 1)
+        self.seed = seed
+
+        # Rates indexed by pull number (index 0 is never used)
+        self.rates = np.array(
+            [0.0] + [self.calculator.get_pull_rate(n) for n in range(1, self.calculator.HARD_PITY + 1)]
+        )
+
+    def simulate_states(
+        self,
+        pulls: int,
+        states: Sequence[Tuple[int, bool]],
+        runs: int = 1_000_000
+    ) -> Dict[Tuple[int, bool], dict]:
+        """
+        Simulate the desired character probability for several starting states at once.
+
+        Args:
+            pulls: Number of pulls available
+            states: List of (current_pity, guaranteed) starting states
+            runs: Number of simulated runs per state
+
+        Returns:
+            Dictionary mapping each state to its result
+            {probability, ci_low, ci_high, successes, runs}
+        """
+        states = list(states)
+        pities = [pity for pity, _ in states]
+        guaranteed = [bool(g) for _, g in states]
+
+        if pulls <= 0 or not states:
+            successes = np.zeros(len(states), dtype=np.int64)
+        else:
+            shards = min(self.workers, runs)
+            runs_per_shard = [runs // shards + (1 if i < runs % shards else 0) for i in range(shards)]
+            seed_sequences = np.random.SeedSequence(self.seed).spawn(shards)
+
+            args = [
+                (self.rates, self.calculator.FEATURED_RATE, pulls, pities, guaranteed, shard_runs, seed_seq)
+                for shard_runs, seed_seq in zip(runs_per_shard, seed_sequences)
+            ]
+
+            if shards == 1:
+                results = [_simulate_shard(*args[0])]
+            else:
+                with ProcessPoolExecutor(max_workers=shards) as executor:
+                    results = list(executor.map(_simulate_shard, *zip(*args)))
+
+            successes = np.sum(results, axis=0)
+
+        output = {}
+        for state, state_successes in zip(states, successes):
+            state_successes = int(state_successes)
+            ci_low, ci_high = wilson_interval(state_successes, runs)
+            output[(state[0], bool(state[1]))] = {
+                "probability": state_successes / runs if runs > 0 else 0.0,
+                "ci_low": ci_low,
+                "ci_high": ci_high,
+                "successes": state_successes,
+                "runs": runs
+            }
+
+        return output
+
+    def simulate(
+        self,
+        pulls: int,
+        current_pity: int = 0,
+        guaranteed: bool = False,
+        runs: int = 1_000_000
+    ) -> dict:
+        """
+        Simulate the probability of getting the desired character.
+
+        Args:
+            pulls: Number of pulls available
+            current_pity: Current pity counter (0-89)
+            guaranteed: Whether next 5-star is guaranteed to be featured character
+            runs: Number of simulated runs
+
+        Returns:
+            Dictionary with {probability, ci_low, ci_high, successes, runs}
+        """
+        state = (current_pity, bool(guaranteed))
+        return self.simulate_states(pulls, [state], runs)[state]
+
+    def compare_with_analytic(self, pulls: int, runs: int = 200_000) -> List[dict]:
+        """
+        Compare simulated and analytic probabilities for every pity/guaranteed state.
+
+        Args:
+            pulls: Number of pulls available
+            runs: Number of simulated runs per state
+
+        Returns:
+            List of dictionaries (one per state) with the analytic probability,
+            the simulated result and whether the analytic value is inside the CI
+        """
+        states = [
+            (pity, guaranteed)
+            for guaranteed in (False, True)
+            for pity in range(self.calculator.HARD_PITY)
+        ]
+        simulated = self.simulate_states(pulls, states, runs)
+
+        rows = []
+        for pity, guaranteed in states:
+            analytic, _ = self.calculator.calculate_desired_character_probability(pulls, pity, guaranteed)
+            result = simulated[(pity, guaranteed)]
+            rows.append({
+                "current_pity": pity,
+                "guaranteed": guaranteed,
+                "analytic": analytic,
+                "simulated": result["probability"],
+                "ci_low": result["ci_low"],
+                "ci_high": result["ci_high"],
+                "difference": analytic - result["probability"],
+                "within_ci": result["ci_low"] <= analytic <= result["ci_high"]
+            })
+
+        return rows
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point: compare the analytic model against simulation."""
+    parser = argparse.ArgumentParser(
+        description="Valida o cálculo analítico de probabilidade com simulação Monte Carlo."
+    )
+    parser.add_argument("--pulls", type=int, default=180, help="Pulls disponíveis (padrão: 180)")
+    parser.add_argument("--runs", type=int, default=200_000, help="Simulações por estado (padrão: 200000)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos (padrão: CPUs)")
+    parser.add_argument("--seed", type=int, default=None, help="Semente para resultados reproduzíveis")
+    parser.add_argument("--pity", type=int, default=None, help="Simular apenas este pity (0-89)")
+    parser.add_argument("--guaranteed", action="store_true", help="Com --pity: próximo 5★ é garantido")
+    args = parser.parse_args(argv)
+
+    simulator = MonteCarloSimulator(workers=args.workers, seed=args.seed)
+    start = time.perf_counter()
+
+    if args.pity is not None:
+        result = simulator.simulate(args.pulls, args.pity, args.guaranteed, args.runs)
+        analytic, _ = simulator.calculator.calculate_desired_character_probability(
+            args.pulls, args.pity, args.guaranteed
+        )
+        print(f"Pulls: {args.pulls}  Pity: {args.pity}  Garantido: {'sim' if args.guaranteed else 'não'}")
+        print(f"Analítico: {analytic*100:.3f}%")
+        print(
+            f"Simulado:  {result['probability']*100:.3f}% "
+            f"(IC 95%: {result['ci_low']*100:.3f}% - {result['ci_high']*100:.3f}%, "
+            f"{result['runs']:,} simulações)"
+        )
+    else:
+        rows = simulator.compare_with_analytic(args.pulls, args.runs)
+
+        print(f"{'Pity':>4} {'Estado':>9} {'Analítico':>10} {'Simulado':>9} {'IC 95%':>19} {'Dif':>8}")
+        for row in rows:
+            state = "garantido" if row["guaranteed"] else "50/50"
+            flag = "" if row["within_ci"] else "  ← fora do IC"
+            print(
+                f"{row['current_pity']:>4} {state:>9} "
+                f"{row['analytic']*100:>9.2f}% {row['simulated']*100:>8.2f}% "
+                f"{row['ci_low']*100:>8.2f}-{row['ci_high']*100:>6.2f}% "
+                f"{row['difference']*100:>+7.2f}{flag}"
+            )
+
+        outside = sum(1 for row in rows if not row["within_ci"])
+        print(f"\n{outside} de {len(rows)} estados com o valor analítico fora do IC 95%")
+
+    print(f"Tempo: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,123 @@
+import os
 import sys
 import platform
-from typing import Optional, Dict, List
+import select
+import threading
+from collections import deque
+from typing import Callable, FrozenSet, Optional, Dict, List, Tuple
 import psutil
 
 
+def _base_name(name: str) -> str:
+    """Strip the extension from a lowercase process name ("game.exe" -> "game")."""
+    return name.rsplit('.', 1)[0] if '.' in name else name
+
+
+class _SubstringAutomaton:
+    """Aho-Corasick automaton reporting which patterns occur inside a text."""
+
+    def __init__(self, patterns: List[Tuple[str, int]]):
+        """
+        Build the automaton.
+
+        Args:
+            patterns: List of (pattern, payload); payloads of every pattern
+                      found in a text are returned by search()
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[int]] = [frozenset()]
+
+        outputs = [set()]
+        for pattern, payload in patterns:
+            node = 0
+            for char in pattern:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            outputs[node].add(payload)
+
+        # Breadth-first failure links; outputs inherit their failure node's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                outputs[child] |= outputs[self._fail[child]]
+                queue.append(child)
+
+        self._output = [frozenset(out) for out in outputs]
+
+    def search(self, text: str) -> FrozenSet[int]:
+        """Get the payloads of all patterns contained in text."""
+        found = set(self._output[0])
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            found |= self._output[node]
+        return frozenset(found)
+
+
+class _ProcessMatcher:
+    """
+    Matches process names to configured games.
+
+    Never modified after construction (apart from its memo cache), so the
+    detector can swap in a new one with a single assignment while other
+    threads keep using the one they already hold.
+    """
+
+    def __init__(self, targets: Tuple[Tuple[int, str], ...]):
+        """
+        Build the matcher.
+
+        Args:
+            targets: (game_id, lowercase process name) in configured order
+        """
+        self.targets = targets
+        self.game_order = {game_id: index for index, (game_id, _) in enumerate(targets)}
+
+        # Forward direction: target base contained in the process base
+        self._automaton = _SubstringAutomaton([(_base_name(name), game_id) for game_id, name in targets])
+
+        # Reverse direction: process base contained in a target base
+        self._target_substrings: Dict[str, set] = {}
+        for game_id, name in targets:
+            base = _base_name(name)
+            for start in range(len(base) + 1):
+                for end in range(start, len(base) + 1):
+                    self._target_substrings.setdefault(base[start:end], set()).add(game_id)
+
+        # Normalized process name -> matching games (memoized lookups)
+        self._match_cache: Dict[str, FrozenSet[int]] = {}
+
+    def matching_games(self, process_name: str) -> FrozenSet[int]:
+        """Get every configured game matching a process name (see GameDetector._process_matches)."""
+        name = process_name.lower()
+        matches = self._match_cache.get(name)
+
+        if matches is None:
+            base = _base_name(name)
+            matches = frozenset(self._automaton.search(base) | self._target_substrings.get(base, frozenset()))
+            self._match_cache[name] = matches
+
+        return matches
+
+
 class GameDetector:
     """Detects which game is currently active based on process names."""
 
+    # Bound for the PID -> process name cache
+    MAX_CACHED_PIDS = 32768
+
     def __init__(self, game_configs: Dict[int, dict]):
         """
         Initialize game detector with game configurations.
@@ -15,9 +126,50 @@ class GameDetector:
             game_configs: Dictionary mapping game_id to game config
                          {1: {"name": "Game 1", "process_name": "game1.exe"}, ...}
         """
-        self.game_configs = game_configs
         self.system = platform.system()
 
+        # pid -> (create_time, name); create_time guards against PID reuse
+        self._pid_names: Dict[int, Tuple[float, str]] = {}
+
+        # Incremental running-game scan state: pid -> (identity, matching games),
+        # game -> live PIDs; see _get_process_identity
+        self._scanned_pids: Dict[int, Tuple[object, FrozenSet[int]]] = {}
+        self._game_pid_counts: Dict[int, int] = {}
+
+        self.game_configs = {}
+        self._matcher: Optional[_ProcessMatcher] = None
+        self.update_configs(game_configs)
+
+    def update_configs(self, game_configs: Dict[int, dict]) -> bool:
+        """
+        Replace the game configurations, rebuilding the matcher only if they changed.
+
+        Args:
+            game_configs: Dictionary mapping game_id to game config
+
+        Returns:
+            True if the matcher was rebuilt
+        """
+        # Config files use string keys ("1"); games are identified by int everywhere else
+        targets = tuple(
+            (int(game_id), config.get("process_name", "").lower())
+            for game_id, config in game_configs.items()
+            if config and config.get("process_name", "")
+        )
+
+        self.game_configs = game_configs
+        if self._matcher is not None and targets == self._matcher.targets:
+            return False
+
+        # Published with one assignment: the X11 watcher thread matches concurrently
+        self._matcher = _ProcessMatcher(targets)
+
+        # Re-match known processes against the new targets on the next scan
+        self._scanned_pids = {}
+        self._game_pid_counts = {}
+
+        return True
+
     def get_active_game(self) -> Optional[int]:
         """
         Detect which configured game is currently the active window.
@@ -30,17 +182,55 @@ class GameDetector:
         if not active_process:
             return None
 
-        # Check if active process matches any configured game
-        for game_id, config in self.game_configs.items():
-            process_name = config.get("process_name", "")
-            if not process_name:
-                continue
+        return self.match_process(active_process)
 
-            # Case-insensitive comparison
-            if self._process_matches(active_process, process_name):
-                return game_id
+    def match_process(self, process_name: str) -> Optional[int]:
+        """
+        Find the configured game a process belongs to.
 
-        return None
+        Args:
+            process_name: Process name to look up
+
+        Returns:
+            Game ID (1-4) if the process matches a configured game, None otherwise
+        """
+        # One matcher for the whole lookup, even if update_configs() swaps it meanwhile
+        matcher = self._matcher
+        matches = matcher.matching_games(process_name)
+        if not matches:
+            return None
+
+        # Earliest configured game wins, as with a linear scan
+        return min(matches, key=matcher.game_order.__getitem__)
+
+    def get_process_name(self, pid: int) -> Optional[str]:
+        """
+        Get a process name, resolving it only once per process lifetime.
+
+        Args:
+            pid: Process ID
+
+        Returns:
+            Process name or None if the process no longer exists
+        """
+        try:
+            process = psutil.Process(pid)
+            create_time = process.create_time()
+
+            cached = self._pid_names.get(pid)
+            if cached and cached[0] == create_time:
+                return cached[1]
+
+            name = process.name()
+        except psutil.Error:
+            self._pid_names.pop(pid, None)
+            return None
+
+        if len(self._pid_names) >= self.MAX_CACHED_PIDS:
+            self._pid_names.clear()
+        self._pid_names[pid] = (create_time, name)
+
+        return name
 
     def get_running_games(self) -> List[int]:
         """
@@ -49,28 +239,107 @@ class GameDetector:
         Returns:
             List of game IDs that are running
         """
-        running = []
+        running, _, _ = self.scan_running_games()
+        return running
+
+    def scan_running_games(self) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Incrementally update the set of running games.
+
+        Names are only resolved for PIDs that appeared since the last scan or
+        whose identity changed (PID reused, or on Linux a wrapper script that
+        exec'd the game); other PIDs cost one /proc read (one psutil call
+        elsewhere). Exited PIDs are dropped. Name resolution and matching
+        follow process churn rather than the number of processes.
+
+        Returns:
+            Tuple of (running, started, stopped) game ID lists, where started
+            and stopped are the changes since the previous scan
+        """
+        previous = {game_id for game_id, count in self._game_pid_counts.items() if count > 0}
+        matcher = self._matcher
 
         try:
-            # Get all running processes
-            running_processes = {p.name() for p in psutil.process_iter(['name'])}
+            pids = self._list_pids()
+
+            for pid in self._scanned_pids.keys() - pids:
+                self._forget_pid(pid)
 
-            # Check each configured game
-            for game_id, config in self.game_configs.items():
-                process_name = config.get("process_name", "")
-                if not process_name:
+            for pid in pids:
+                identity = self._get_process_identity(pid)
+                known = self._scanned_pids.get(pid)
+                if known is not None and known[0] == identity:
                     continue
 
-                # Check if process is running
-                for running_proc in running_processes:
-                    if self._process_matches(running_proc, process_name):
-                        running.append(game_id)
-                        break
+                if known is not None:
+                    self._forget_pid(pid)
+                if identity is None:
+                    # Exited since the PID list was read
+                    continue
+
+                name = self.get_process_name(pid)
+                matches = matcher.matching_games(name) if name is not None else frozenset()
+                self._scanned_pids[pid] = (identity, matches)
+                for game_id in matches:
+                    self._game_pid_counts[game_id] = self._game_pid_counts.get(game_id, 0) + 1
 
         except Exception as e:
             print(f"Error getting running games: {e}")
 
-        return running
+        current = {game_id for game_id, count in self._game_pid_counts.items() if count > 0}
+
+        # Keep the configured game order
+        order = [game_id for game_id, _ in matcher.targets]
+        running = [game_id for game_id in order if game_id in current]
+        started = [game_id for game_id in order if game_id in current - previous]
+        stopped = [game_id for game_id in order if game_id in previous - current]
+
+        return running, started, stopped
+
+    def _forget_pid(self, pid: int):
+        """Drop a scanned PID and its cached name (exited, reused or exec'd)."""
+        _, matches = self._scanned_pids.pop(pid)
+        for game_id in matches:
+            self._game_pid_counts[game_id] -= 1
+
+        # exec keeps the create time, so the cached name can't be trusted either
+        self._pid_names.pop(pid, None)
+
+    def _get_process_identity(self, pid: int) -> Optional[tuple]:
+        """
+        Get a cheap fingerprint of a process.
+
+        On Linux this is (comm, start time) from one read of /proc/<pid>/stat,
+        which changes when the PID is reused and when the process execs
+        another binary; elsewhere it is the psutil create time.
+
+        Returns:
+            Identity tuple, or None if the process no longer exists
+        """
+        if self.system == "Linux":
+            try:
+                with open(f"/proc/{pid}/stat", "rb") as f:
+                    stat = f.read()
+                # comm is parenthesized and may itself contain spaces or ")"
+                head, _, tail = stat.rpartition(b")")
+                return head.partition(b"(")[2], tail.split()[19]
+            except (OSError, IndexError):
+                return None
+
+        try:
+            return (psutil.Process(pid).create_time(),)
+        except psutil.Error:
+            return None
+
+    def _list_pids(self) -> set:
+        """Get the set of live PIDs (read straight from /proc on Linux)."""
+        if self.system == "Linux":
+            try:
+                return {int(entry) for entry in os.listdir('/proc') if entry.isdigit()}
+            except OSError:
+                pass
+
+        return set(psutil.pids())
 
     def _process_matches(self, proc_name: str, target_name: str) -> bool:
         """
@@ -138,8 +407,7 @@ class GameDetector:
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
 
             # Get process info
-            process = psutil.Process(pid)
-            return process.name()
+            return self.get_process_name(pid)
 
         except ImportError:
             # Fallback if win32 modules not available
@@ -161,8 +429,7 @@ class GameDetector:
                     stderr=subprocess.DEVNULL
                 )
                 pid = int(pid_output.strip())
-                process = psutil.Process(pid)
-                return process.name()
+                return self.get_process_name(pid)
 
             except (FileNotFoundError, subprocess.CalledProcessError):
                 pass
@@ -189,8 +456,7 @@ class GameDetector:
                         parts = line.split()
                         if len(parts) >= 3:
                             pid = int(parts[2])
-                            process = psutil.Process(pid)
-                            return process.name()
+                            return self.get_process_name(pid)
 
             except (FileNotFoundError, subprocess.CalledProcessError):
                 pass
@@ -225,6 +491,140 @@ class GameDetector:
             return None
 
 
+class X11ActiveWindowWatcher:
+    """
+    Event-driven active game detection for X11.
+
+    Keeps one X connection open and listens for _NET_ACTIVE_WINDOW
+    PropertyNotify events on the root window, so focus changes are reported
+    within milliseconds without forking xdotool/wmctrl on every poll.
+    """
+
+    def __init__(self, detector: GameDetector, callback: Callable[[Optional[int]], None]):
+        """
+        Initialize the watcher.
+
+        Args:
+            detector: GameDetector used to match the focused process to a game
+            callback: Called from the watcher thread with the new game ID (or None)
+                      whenever the active game changes
+        """
+        self.detector = detector
+        self.callback = callback
+
+        self._display = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._last_game_id = None
+
+    def start(self) -> bool:
+        """
+        Connect to the X server and start listening in a background thread.
+
+        Returns:
+            True if the watcher is running, False if X11/python-xlib is unavailable
+        """
+        try:
+            from Xlib import X, display
+
+            self._display = display.Display()
+            root = self._display.screen().root
+            self._atom_active = self._display.intern_atom('_NET_ACTIVE_WINDOW')
+            self._atom_pid = self._display.intern_atom('_NET_WM_PID')
+            root.change_attributes(event_mask=X.PropertyChangeMask)
+            self._root = root
+
+        except ImportError:
+            print("python-xlib not installed. Install with: pip install python-xlib")
+            return False
+        except Exception as e:
+            print(f"X11 watcher unavailable: {e}")
+            self._display = None
+            return False
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop listening and close the X connection."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """Check if the watcher thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """Event loop (runs in background thread)."""
+        from Xlib import X
+
+        try:
+            # Report the window focused at startup
+            self._emit_active_game_safely()
+
+            while not self._stop_event.is_set():
+                if not self._display.pending_events():
+                    # Wake up periodically to honour stop()
+                    select.select([self._display], [], [], 0.5)
+                    continue
+
+                event = self._display.next_event()
+                if event.type == X.PropertyNotify and event.atom == self._atom_active:
+                    self._emit_active_game_safely()
+
+        except Exception as e:
+            print(f"X11 watcher error: {e}")
+        finally:
+            try:
+                self._display.close()
+            except Exception:
+                pass
+            self._display = None
+
+    def _emit_active_game_safely(self):
+        """Emit the active game; one failed lookup must not end event-driven detection."""
+        try:
+            self._emit_active_game()
+        except Exception as e:
+            print(f"X11 watcher lookup error: {e}")
+
+    def _emit_active_game(self):
+        """Resolve the focused window's game and notify if it changed."""
+        game_id = None
+        process_name = self._get_active_process_name()
+        if process_name:
+            game_id = self.detector.match_process(process_name)
+
+        if game_id != self._last_game_id:
+            self._last_game_id = game_id
+            self.callback(game_id)
+
+    def _get_active_process_name(self) -> Optional[str]:
+        """Read the focused window's _NET_WM_PID and resolve its process name."""
+        from Xlib import X
+        from Xlib.error import XError
+
+        try:
+            active = self._root.get_full_property(self._atom_active, X.AnyPropertyType)
+            if not active or not active.value or not active.value[0]:
+                return None
+
+            window = self._display.create_resource_object('window', active.value[0])
+            pid_property = window.get_full_property(self._atom_pid, X.AnyPropertyType)
+            if not pid_property or not pid_property.value:
+                return None
+
+            return self.detector.get_process_name(int(pid_property.value[0]))
+
+        except XError:
+            # Window closed or process exited before we could inspect it
+            return None
+
+
 # Test function
 if __name__ == '__main__':
     # Example game configs
@@ -241,3 +641,7 @@ if __name__ == '__main__':
     print("\nProcesso ativo:", detector._get_active_window_process())
     print("\nJogo ativo:", detector.get_active_game())
     print("\nJogos rodando:", detector.get_running_games())
+
+    # Second scan only resolves processes started in between
+    running, started, stopped = detector.scan_running_games()
+    print("Iniciados:", started, "Encerrados:", stopped)
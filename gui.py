@@ -1,33 +1,77 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional
 import threading
 
 from storage import Storage
-from capture import ScreenCapture
-from ocr_processor import OCRProcessor
+from storage_worker import StorageWorker
 from region_selector import select_region_simple
-from game_detector import GameDetector
+from scheduler import PollingScheduler
+from capture_scheduler import CaptureScheduler
+from pipeline import CapturePipeline, CaptureError
+from startup_profiler import StartupProfiler
+from history_view import VirtualHistoryView
+from history_chart import HistoryChart
+from tracing import span, tracer
+
+# PIL, pytesseract, psutil and the gacha/NumPy modules are imported by
+# _load_components() after the window is shown
+if TYPE_CHECKING:
+    from forecast import IncomeForecaster
 
 
 class NtropyGUI:
     """Main GUI for the Ntropy application."""
 
-    def __init__(self, root: tk.Tk):
+    def __init__(
+        self,
+        root: tk.Tk,
+        profiler: Optional[StartupProfiler] = None,
+        record_frames: Optional[str] = None
+    ):
         self.root = root
         self.root.title("Ntropy")
         self.root.geometry("600x700")
 
+        self.profiler = profiler or StartupProfiler()
+
+        # Directory receiving every captured frame for later replay (None: off)
+        self.record_frames = record_frames
+
         # Initialize components
         self.storage = Storage()
-        self.screen_capture = ScreenCapture()
-        self.ocr = OCRProcessor()
 
-        # Initialize game detector
-        games_config = self.storage.get_all_games()
-        self.game_detector = GameDetector(games_config)
+        # Startup reads; afterwards all Storage I/O goes through the worker thread
+        self.games_config = self.storage.get_all_games()
+        self.always_on_top = self.storage.get_always_on_top()
+        self.ocr_warm_up = self.storage.get_ocr_warm_up()
+        api_settings = self.storage.get_api_config()
+        feed_settings = self.storage.get_event_feed_config()
+        self.archive_settings = self.storage.get_image_archive_config()
+        self.storage_worker = StorageWorker(self.storage, self.root)
+
+        # Capture, OCR, game detection and forecasting are created in the
+        # background by _load_components(); None until then
+        self.screen_capture = None
+        self.ocr = None
+        self.game_detector = None
+        self.forecaster = None
+        self.pipeline = None
+        self.capture_scheduler = None
+        self.image_archive = None
         self.current_game_id = None
+        self._games_config_changed = False
+
+        # Opt-in local HTTP API for overlays and stream tools
+        self.api_server = None
+        if api_settings["enabled"]:
+            self._start_api_server(api_settings["port"])
+
+        # Push feed of capture events on a Unix socket
+        self.event_feed = None
+        if feed_settings["enabled"]:
+            self._start_event_feed(feed_settings["socket_path"])
 
         # Game colors for UI
         self.game_colors = {
@@ -41,16 +85,142 @@ class NtropyGUI:
         self._setup_ui()
         self._load_history()
 
-        # Setup hotkey (will be implemented with pynput)
-        self._setup_hotkey()
+        # Apply history changes as diffs (listeners may fire from worker threads)
+        self.storage.add_listener(
+            lambda event, payload: self.root.after(0, lambda: self._on_storage_event(event, payload))
+        )
 
-        # Start periodic game detection
-        self._update_game_status()
+        # Periodic background tasks (adaptive rate, paused while iconified)
+        self.scheduler = PollingScheduler(self.root)
+        self.window_watcher = None
 
         # Apply settings
-        if self.storage.get_always_on_top():
+        if self.always_on_top:
             self.root.attributes('-topmost', True)
 
+        # Heavy imports, the Tesseract probe and the hotkey listener start once
+        # the window is on screen
+        self.capture_btn.config(state=tk.DISABLED)
+        self._set_status("Carregando componentes...")
+        self.root.after_idle(self._start_background_init)
+
+    def _start_background_init(self):
+        """Start loading the capture components off the Tk thread."""
+        self.profiler.mark("window_shown")
+
+        thread = threading.Thread(target=self._load_components, name="startup", daemon=True)
+        thread.start()
+
+    def _load_components(self):
+        """Import and create the heavy components (runs in background thread)."""
+        components = {}
+        errors = []
+
+        with self.profiler.phase("import_capture_ocr"):
+            try:
+                from capture import ScreenCapture
+                from ocr_processor import OCRProcessor
+                screen_capture = ScreenCapture()
+                if self.record_frames:
+                    from frame_source import FrameRecorder
+                    screen_capture = FrameRecorder(screen_capture, self.record_frames)
+                components["screen_capture"] = screen_capture
+                components["ocr"] = OCRProcessor()
+            except ImportError as e:
+                errors.append(f"Captura/OCR indisponível: {e}")
+
+            # Raw crops kept for checking misread values (opt-in)
+            if "screen_capture" in components and self.archive_settings["enabled"]:
+                from image_archive import ImageArchive
+                components["image_archive"] = ImageArchive(
+                    self.archive_settings["directory"],
+                    self.archive_settings["max_mb"] * 1024 * 1024,
+                    self.archive_settings["format"]
+                )
+
+        with self.profiler.phase("tesseract_probe"):
+            if "ocr" in components:
+                success, message = components["ocr"].test_ocr()
+                components["tesseract_ok"] = success
+                if not success:
+                    errors.append(
+                        f"Tesseract OCR não encontrado:\n{message}\n\n"
+                        "Instalação no Ubuntu/Debian:\n"
+                        "  sudo apt-get install tesseract-ocr tesseract-ocr-por"
+                    )
+
+        with self.profiler.phase("import_game_detector"):
+            try:
+                from game_detector import GameDetector
+                components["game_detector"] = GameDetector(self.games_config)
+            except ImportError as e:
+                errors.append(f"Detecção de jogos indisponível: {e}")
+
+        with self.profiler.phase("import_forecast"):
+            try:
+                from forecast import IncomeForecaster
+                components["forecaster"] = IncomeForecaster()
+            except ImportError as e:
+                print(f"Warning: income forecast disabled: {e}")
+
+        with self.profiler.phase("hotkey_listener"):
+            self._setup_hotkey()
+
+        try:
+            self.root.after(0, lambda: self._on_components_loaded(components, errors))
+        except (RuntimeError, tk.TclError):
+            # Main loop already gone
+            pass
+
+    def _on_components_loaded(self, components: dict, errors: list):
+        """Install the loaded components and start the tasks that need them (main thread)."""
+        self.screen_capture = components.get("screen_capture")
+        self.ocr = components.get("ocr")
+        self.game_detector = components.get("game_detector")
+        self.forecaster = components.get("forecaster")
+        self.image_archive = components.get("image_archive")
+
+        # Pull income forecasting, fed incrementally as captures arrive
+        if self.forecaster:
+            self.storage_worker.submit(self.storage.load_history, callback=self.forecaster.sync)
+
+        if self.game_detector:
+            # Event-driven detection on X11; polling remains the fallback
+            if self.game_detector.system == "Linux":
+                self._start_window_watcher()
+
+            # Start periodic game detection (backs off while nothing changes)
+            self.scheduler.add_task("game_status", self._update_game_status, 2000, 30000)
+
+        if self.screen_capture and self.ocr:
+            self.pipeline = CapturePipeline(
+                self.storage,
+                self.screen_capture,
+                self.ocr,
+                storage_call=self.storage_worker.call,
+                debug=True,
+                archive=self.image_archive
+            )
+
+            # Hotkey and button requests are coalesced per game and run on a fixed pool
+            self.capture_scheduler = CaptureScheduler(self._do_capture)
+            self.capture_btn.config(state=tk.NORMAL)
+            self._set_status("")
+
+        # Load Tesseract's traineddata before the first real capture
+        warming_up = bool(self.screen_capture and self.ocr and self.ocr_warm_up and components.get("tesseract_ok"))
+        if warming_up:
+            thread = threading.Thread(target=self._warm_up_ocr, name="ocr-warm-up", daemon=True)
+            thread.start()
+
+        self.profiler.mark("components_ready")
+        if not warming_up:
+            self.profiler.report()
+
+        if errors:
+            self._set_status("Alguns componentes estão indisponíveis")
+            messagebox.showerror("Dependências Faltando", "\n\n".join(errors))
+
     def _setup_ui(self):
         """Setup the user interface."""
         # Menu bar
@@ -68,6 +238,8 @@ class NtropyGUI:
         )
         settings_menu.add_separator()
         settings_menu.add_command(label="Testar OCR", command=self._test_ocr)
+        settings_menu.add_command(label="Tarefas em Segundo Plano", command=self._show_task_stats)
+        settings_menu.add_command(label="Performance", command=self._show_performance)
 
         # Data menu
         data_menu = tk.Menu(menubar, tearoff=0)
@@ -111,7 +283,7 @@ class NtropyGUI:
             comparison_frame.columnconfigure(game_id-1, weight=1)
 
             # Game name
-            game_config = self.storage.get_game_config(game_id)
+            game_config = self._get_game_config(game_id)
             game_name = game_config.get("name", f"Jogo {game_id}") if game_config else f"Jogo {game_id}"
 
             name_label = tk.Label(
@@ -188,36 +360,25 @@ class NtropyGUI:
         history_frame = ttk.LabelFrame(main_frame, text="Histórico de Capturas", padding="10")
         history_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(history_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # Treeview
-        columns = ("ID", "Jogo", "Valor", "Data/Hora")
-        self.history_tree = ttk.Treeview(
-            history_frame,
-            columns=columns,
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            height=10
-        )
+        history_tabs = ttk.Notebook(history_frame)
+        history_tabs.pack(fill=tk.BOTH, expand=True)
 
-        # Configure columns
-        self.history_tree.heading("ID", text="ID")
-        self.history_tree.heading("Jogo", text="Jogo")
-        self.history_tree.heading("Valor", text="Valor")
-        self.history_tree.heading("Data/Hora", text="Data/Hora")
+        # Virtualized table: only the visible rows are materialized
+        table_tab = ttk.Frame(history_tabs, padding="5")
+        history_tabs.add(table_tab, text="Tabela")
+        self.history_view = VirtualHistoryView(table_tab, self.storage, self.storage_worker, self.game_colors)
+        self.history_view.pack(fill=tk.BOTH, expand=True)
+        self.history_tree = self.history_view.tree
 
-        self.history_tree.column("ID", width=50, anchor=tk.CENTER)
-        self.history_tree.column("Jogo", width=120, anchor=tk.W)
-        self.history_tree.column("Valor", width=120, anchor=tk.E)
-        self.history_tree.column("Data/Hora", width=150, anchor=tk.CENTER)
-
-        self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.history_tree.yview)
+        # Pull balance over time (downsampled to the chart width)
+        chart_tab = ttk.Frame(history_tabs, padding="5")
+        history_tabs.add(chart_tab, text="Gráfico")
+        self.history_chart = HistoryChart(chart_tab, self.storage, self.storage_worker, self.game_colors)
+        self.history_chart.pack(fill=tk.BOTH, expand=True)
 
         # Context menu for history
         self.context_menu = tk.Menu(self.root, tearoff=0)
+        self.context_menu.add_command(label="Ver Imagens", command=self._show_capture_images)
         self.context_menu.add_command(label="Deletar", command=self._delete_selected)
         self.history_tree.bind("<Button-3>", self._show_context_menu)
 
@@ -227,24 +388,18 @@ class NtropyGUI:
             from pynput import keyboard
 
             def on_press(key):
+                # Hotkey activity: poll at full rate again
+                self.root.after(0, self.scheduler.wake)
+
                 try:
                     # F9 = Manual capture (immediate)
                     if key == keyboard.Key.f9:
-                        self.root.after(0, self._capture_value)
+                        self.root.after(0, self._on_manual_capture_key)
 
                     # F3/F4 = Auto-capture with delay (for game screens)
                     elif key == keyboard.Key.f3 or key == keyboard.Key.f4:
-                        # Check if current game uses this key
-                        if self.current_game_id:
-                            game_config = self.storage.get_game_config(self.current_game_id)
-                            if game_config:
-                                auto_key = game_config.get("auto_capture_key", "").lower()
-                                key_name = key.name.lower()
-
-                                if auto_key == key_name:
-                                    delay = game_config.get("auto_capture_delay", 3) * 1000  # Convert to ms
-                                    self.root.after(0, lambda: self._set_status(f"Auto-captura em {delay//1000}s..."))
-                                    self.root.after(delay, self._capture_value)
+                        key_name = key.name.lower()
+                        self.root.after(0, lambda: self._on_auto_capture_key(key_name))
 
                 except AttributeError:
                     pass
@@ -259,35 +414,166 @@ class NtropyGUI:
         except Exception as e:
             print(f"Warning: Could not setup hotkey: {e}")
 
-    def _update_game_status(self):
-        """Update game status indicator periodically."""
-        try:
-            # Refresh game configs in case they changed
-            games_config = self.storage.get_all_games()
-            self.game_detector = GameDetector(games_config)
+    def _with_active_game(self, action: Callable[[], None]):
+        """
+        Run a hotkey action once the active game is known (main thread).
+
+        Detection is paused while minimized (and polls slowly when idle), so
+        without the X11 watcher the game is probed again first, off the Tk
+        thread, and action runs in its callback.
+        """
+        # The watcher pushes every focus change: current_game_id is up to date
+        if not self.game_detector or (self.window_watcher and self.window_watcher.is_running()):
+            action()
+            return
 
-            # Detect active game
-            active_game_id = self.game_detector.get_active_game()
+        def detect():
+            try:
+                game_id = self.game_detector.get_active_game()
+            except Exception as e:
+                print(f"Error detecting active game: {e}")
+                game_id = None
+            self.root.after(0, lambda: self._on_hotkey_game_detected(game_id, action))
 
-            if active_game_id:
-                self.current_game_id = active_game_id
-                game_config = self.storage.get_game_config(active_game_id)
-                game_name = game_config.get("name", f"Jogo {active_game_id}") if game_config else f"Jogo {active_game_id}"
-                process_name = game_config.get("process_name", "?") if game_config else "?"
+        threading.Thread(target=detect, name="hotkey-detect", daemon=True).start()
 
-                self.game_status_label.config(
-                    text=f"{game_name} ({process_name})",
-                    fg=self.game_colors.get(active_game_id, "black")
-                )
-            else:
-                self.current_game_id = None
-                self.game_status_label.config(text="Nenhum jogo detectado", fg="gray")
+    def _on_hotkey_game_detected(self, game_id: Optional[int], action: Callable[[], None]):
+        """Apply a hotkey's game probe and run its action (main thread)."""
+        # A failed one-off probe must not forget the game detected earlier
+        if game_id:
+            self._set_active_game(game_id)
+        action()
+
+    def _on_manual_capture_key(self):
+        """Capture the active game immediately (F9, main thread)."""
+        self._with_active_game(self._capture_value)
+
+    def _on_auto_capture_key(self, key_name: str):
+        """Start a delayed capture if the active game uses this auto-capture key (main thread)."""
+        self._with_active_game(lambda: self._start_auto_capture(key_name))
+
+    def _start_auto_capture(self, key_name: str):
+        """Schedule the auto-capture of the current game for a key, if it uses it."""
+        if not self.current_game_id:
+            return
+
+        game_config = self._get_game_config(self.current_game_id)
+        if game_config and game_config.get("auto_capture_key", "").lower() == key_name:
+            self._capture_value(game_config.get("auto_capture_delay", 3))
+
+    def _start_api_server(self, port: int):
+        """Serve the local HTTP API (reads go through the storage worker)."""
+        from api_server import ApiServer
+
+        server = ApiServer(
+            self.storage,
+            port,
+            storage_call=self.storage_worker.call,
+            capture_func=self._api_capture
+        )
+
+        if server.start():
+            self.api_server = server
+            print(f"✓ API local em http://127.0.0.1:{port}")
+
+    def _start_event_feed(self, socket_path: str):
+        """Publish capture events on a Unix socket (where supported)."""
+        from event_feed import EventFeed
+
+        if not EventFeed.is_supported():
+            return
+
+        feed = EventFeed(self.storage, socket_path)
+        if feed.start():
+            self.event_feed = feed
+            print(f"✓ Feed de eventos em {socket_path}")
+
+    def _api_capture(self, game_id: Optional[int]) -> tuple:
+        """Handle POST /capture from the HTTP API (runs in a request thread)."""
+        if not self.capture_scheduler:
+            return 503, {"error": "captura indisponível"}
+
+        game_id = game_id or self.current_game_id
+        if not game_id:
+            return 409, {"error": "nenhum jogo detectado"}
+
+        result = self.capture_scheduler.request(game_id)
+        if result is None:
+            return 429, {"error": "muitas capturas na fila"}
+
+        return 202, {"status": result, "game_id": game_id}
+
+    def _warm_up_ocr(self):
+        """Run the capture pipeline on a synthetic image (runs in background thread)."""
+        with self.profiler.phase("ocr_warm_up"):
+            elapsed = self.ocr.warm_up(self.screen_capture.preprocess_for_ocr)
+
+        if elapsed is not None:
+            print(f"✓ OCR aquecido em {elapsed*1000:.0f} ms")
+
+        self.profiler.report()
+
+    def _start_window_watcher(self):
+        """Start pushing active game changes from X11 focus events."""
+        from game_detector import X11ActiveWindowWatcher
+
+        watcher = X11ActiveWindowWatcher(
+            self.game_detector,
+            lambda game_id: self.root.after(0, lambda: self._set_active_game(game_id))
+        )
+
+        if watcher.start():
+            self.window_watcher = watcher
+            print("✓ Detecção de jogo por eventos X11 ativa")
+
+    def _get_game_config(self, game_id) -> Optional[dict]:
+        """Get a game's configuration from the in-memory copy (no file I/O)."""
+        return self.games_config.get(str(game_id))
+
+    def _apply_games_config(self, games_config: dict):
+        """Store refreshed game configs read by the storage worker (main thread)."""
+        self.games_config = games_config
+
+        # Matcher rebuilt only when the process names changed
+        if self.game_detector and self.game_detector.update_configs(games_config):
+            self._games_config_changed = True
+
+    def _update_game_status(self) -> bool:
+        """Update game status indicator (periodic task). Returns True if anything changed."""
+        # Changes found by the previous asynchronous config refresh
+        changed = self._games_config_changed
+        self._games_config_changed = False
+
+        try:
+            # Refresh game configs in case they changed
+            self.storage_worker.submit(self.storage.get_all_games, callback=self._apply_games_config)
+
+            # Focus changes are pushed by the X11 watcher when it is running
+            if not (self.window_watcher and self.window_watcher.is_running()):
+                previous_game_id = self.current_game_id
+                self._set_active_game(self.game_detector.get_active_game())
+                changed = changed or self.current_game_id != previous_game_id
 
         except Exception as e:
             print(f"Error updating game status: {e}")
 
-        # Schedule next update (every 2 seconds)
-        self.root.after(2000, self._update_game_status)
+        return changed
+
+    def _set_active_game(self, active_game_id: Optional[int]):
+        """Update the current game and its status indicator."""
+        if active_game_id:
+            self.current_game_id = active_game_id
+            game_config = self._get_game_config(active_game_id)
+            game_name = game_config.get("name", f"Jogo {active_game_id}") if game_config else f"Jogo {active_game_id}"
+            process_name = game_config.get("process_name", "?") if game_config else "?"
+
+            self.game_status_label.config(
+                text=f"{game_name} ({process_name})",
+                fg=self.game_colors.get(active_game_id, "black")
+            )
+        else:
+            self.current_game_id = None
+            self.game_status_label.config(text="Nenhum jogo detectado", fg="gray")
 
     def _configure_games(self):
         """Open game configuration dialog."""
@@ -303,8 +589,17 @@ class NtropyGUI:
             "Configure as regiões de captura através do menu quando cada jogo estiver aberto."
         )
 
-    def _capture_value(self):
-        """Capture value from configured region."""
+    def _capture_value(self, delay: float = 0):
+        """
+        Request a capture of the current game from its configured regions.
+
+        Args:
+            delay: Seconds to wait before capturing (auto-capture hotkeys)
+        """
+        if not self.capture_scheduler:
+            self._set_status("Captura indisponível (componentes carregando ou faltando)")
+            return
+
         # Detect active game
         if not self.current_game_id:
             messagebox.showerror(
@@ -319,7 +614,7 @@ class NtropyGUI:
             return
 
         # Check if both regions are configured for this game
-        game_config = self.storage.get_game_config(self.current_game_id)
+        game_config = self._get_game_config(self.current_game_id)
         region_conv = game_config.get("region_converted") if game_config else None
         region_int = game_config.get("region_integer") if game_config else None
 
@@ -341,137 +636,88 @@ class NtropyGUI:
                 messagebox.showinfo("Em desenvolvimento", "Configuração de regiões por jogo em breve!")
             return
 
-        self._set_status("Capturando...")
-        self.capture_btn.config(state=tk.DISABLED)
-
-        # Perform capture in background thread
-        thread = threading.Thread(target=self._do_capture, daemon=True)
-        thread.start()
+        # Perform capture on the capture worker pool
+        result = self.capture_scheduler.request(self.current_game_id, delay)
 
-    def _do_capture(self):
-        """Perform the actual capture (runs in background thread)."""
-        try:
-            # Get region coordinates for current game
-            game_config = self.storage.get_game_config(self.current_game_id)
-            region_converted = game_config.get("region_converted")
-            region_integer = game_config.get("region_integer")
-
-            if not region_converted or not region_integer:
-                self.root.after(0, lambda: self._capture_failed("Regiões não configuradas. Configure ambas as regiões."))
-                return
-
-            # Get conversion ratio
-            ratio = self.storage.get_conversion_ratio()
-
-            # === CAPTURE CONVERTED VALUES ===
-            image_conv = self.screen_capture.capture_region(
-                region_converted["x"],
-                region_converted["y"],
-                region_converted["width"],
-                region_converted["height"]
-            )
-
-            if image_conv is None:
-                self.root.after(0, lambda: self._capture_failed("Falha ao capturar valores convertidos"))
-                return
-
-            image_conv = self.screen_capture.preprocess_for_ocr(image_conv)
-            value_converted = self.ocr.extract_number(image_conv, debug=True)
-
-            if value_converted is None:
-                value_converted = 0  # Se não conseguir ler, assume 0
-
-            # === CAPTURE INTEGER VALUES ===
-            image_int = self.screen_capture.capture_region(
-                region_integer["x"],
-                region_integer["y"],
-                region_integer["width"],
-                region_integer["height"]
-            )
-
-            if image_int is None:
-                self.root.after(0, lambda: self._capture_failed("Falha ao capturar valores inteiros"))
-                return
-
-            image_int = self.screen_capture.preprocess_for_ocr(image_int)
-            value_integer = self.ocr.extract_number(image_int, debug=True)
-
-            if value_integer is None:
-                value_integer = 0  # Se não conseguir ler, assume 0
-
-            # === CALCULATE TOTAL ===
-            # Formula: Total = Converted + (Integer / 160)
-            total_value = value_converted + (value_integer / ratio)
-
-            print(f"Convertidos: {value_converted}")
-            print(f"Inteiros: {value_integer}")
-            print(f"Cálculo: {value_converted} + ({value_integer} / {ratio}) = {total_value}")
+        if result is None:
+            self._set_status("Muitas capturas na fila - aguarde")
+        elif result == "coalesced":
+            self._set_status("Captura já agendada para este jogo")
+        elif delay:
+            self._set_status(f"Auto-captura em {delay}s...")
+        else:
+            self._set_status("Capturando...")
 
-            # Save to storage with game_id
-            capture_id = self.storage.save_capture(total_value, game_id=self.current_game_id)
+    def _do_capture(self, game_id: int) -> bool:
+        """
+        Perform the actual capture (runs in a capture worker thread).
 
-            # Update UI in main thread
-            self.root.after(0, lambda: self._capture_success(total_value))
+        Args:
+            game_id: Game whose regions are captured
 
+        Returns:
+            True if a value was captured and saved
+        """
+        try:
+            with span("gui.do_capture", game_id=game_id):
+                result = self.pipeline.capture(game_id)
+        except CaptureError as e:
+            message = str(e)
+            self.root.after(0, lambda: self._capture_failed(message))
+            return False
         except Exception as e:
-            self.root.after(0, lambda: self._capture_failed(f"Erro: {str(e)}"))
+            message = f"Erro: {str(e)}"
+            self.root.after(0, lambda: self._capture_failed(message))
+            return False
+
+        # Update UI in main thread
+        self.root.after(0, lambda: self._capture_success(result["value"]))
+        return True
 
     def _capture_success(self, value: float):
         """Handle successful capture."""
         self._set_status(f"Capturado: {value:,.2f}")
-        self.capture_btn.config(state=tk.NORMAL)
-        self._load_history()
 
     def _capture_failed(self, message: str):
         """Handle failed capture."""
         self._set_status(message)
-        self.capture_btn.config(state=tk.NORMAL)
         messagebox.showerror("Erro na Captura", message)
 
     def _load_history(self):
-        """Load and display capture history."""
-        # Clear existing items
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
-
-        # Load history
-        history = self.storage.load_history(limit=100)
-
-        # Populate tree
-        for capture in history:
-            game_id = capture.get("game_id", 1)
-            game_config = self.storage.get_game_config(game_id)
-            game_name = game_config.get("name", f"Jogo {game_id}") if game_config else f"Jogo {game_id}"
+        """Load and display capture history (full refresh, used at startup)."""
+        self.history_view.refresh()
+        self.history_chart.refresh()
 
-            self.history_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    capture["id"],
-                    game_name,
-                    f"{capture['value']:,.2f}",
-                    capture["timestamp"]
-                ),
-                tags=(f"game_{game_id}",)
-            )
+        # One read model per refresh (no file reads at all when nothing changed)
+        self.storage_worker.submit(self.storage.snapshot, limit=0, callback=self._update_comparison_view)
 
-        # Color rows by game
-        for game_id in range(1, 5):
-            self.history_tree.tag_configure(
-                f"game_{game_id}",
-                foreground=self.game_colors.get(game_id, "black")
-            )
+    def _on_storage_event(self, event: str, payload: dict):
+        """Apply a Storage change to the history view and dependents (main thread)."""
+        self.history_view.on_storage_event(event, payload)
+        self.history_chart.on_storage_event(event, payload)
+
+        # Until the forecaster is loaded it has nothing to update (it syncs the whole history on load)
+        if self.forecaster:
+            if event == "capture_saved":
+                self.forecaster.observe_capture(payload["capture"])
 
-        # Update comparison view for all games
-        self._update_comparison_view()
+            elif event == "capture_deleted":
+                # Deletions invalidate the incremental income fit
+                self.forecaster.reset()
+                self.storage_worker.submit(self.storage.load_history, callback=self.forecaster.sync)
 
-    def _update_comparison_view(self):
+            elif event == "history_cleared":
+                self.forecaster.reset()
+
+        self.storage_worker.submit(self.storage.snapshot, limit=0, callback=self._update_comparison_view)
+
+    def _update_comparison_view(self, snapshot: dict):
         """Update the 4-game comparison view."""
-        all_stats = self.storage.get_stats_all_games()
+        all_stats = snapshot["stats"]
 
         for game_id in range(1, 5):
             stats = all_stats.get(game_id, {})
-            last_capture = self.storage.get_last_capture(game_id=game_id)
+            last_capture = snapshot["last_captures"].get(game_id)
 
             widgets = self.game_widgets.get(game_id)
             if not widgets:
@@ -518,25 +764,103 @@ class NtropyGUI:
         )
 
         if response:
-            self.storage.delete_capture(capture_id)
-            self._load_history()
+            self.storage_worker.submit(
+                self.storage.delete_capture,
+                capture_id,
+                callback=lambda deleted: self._on_capture_deleted(capture_id, deleted),
+                error_callback=lambda e: messagebox.showerror("Erro", f"Erro ao deletar captura #{capture_id}:\n{str(e)}")
+            )
+
+    def _on_capture_deleted(self, capture_id: int, deleted: bool):
+        """Report the result of a history deletion (main thread)."""
+        if deleted:
             self._set_status(f"Captura #{capture_id} deletada")
+        else:
+            messagebox.showerror("Erro", f"Captura #{capture_id} não encontrada")
+
+    def _show_capture_images(self):
+        """Show the archived raw crops of the selected capture."""
+        selection = self.history_tree.selection()
+        if not selection:
+            return
+
+        if not self.image_archive:
+            messagebox.showinfo(
+                "Imagens da Captura",
+                "O arquivo de imagens está desativado.\n\n"
+                "Ative com \"image_archive\": {\"enabled\": true} no config.json."
+            )
+            return
+
+        capture_id = int(self.history_tree.item(selection[0], "values")[0])
+        self.storage_worker.submit(
+            self.storage.get_capture,
+            capture_id,
+            callback=self._on_capture_images_loaded
+        )
+
+    def _on_capture_images_loaded(self, capture: Optional[dict]):
+        """Open the image window once the capture record is read."""
+        hashes = (capture or {}).get("images") or {}
+        paths = {name: self.image_archive.get_path(digest) for name, digest in hashes.items()}
+        paths = {name: path for name, path in paths.items() if path}
+
+        if not paths:
+            messagebox.showinfo(
+                "Imagens da Captura",
+                "Nenhuma imagem arquivada para esta captura\n"
+                "(capturada antes de ativar o arquivo, ou já removida pelo limite de tamanho)."
+            )
+            return
+
+        CaptureImagesWindow(self.root, capture, paths)
 
     def _toggle_always_on_top(self):
         """Toggle always-on-top setting."""
-        current = self.storage.get_always_on_top()
-        new_value = not current
-        self.storage.update_config(always_on_top=new_value)
-        self.root.attributes('-topmost', new_value)
+        self.always_on_top = not self.always_on_top
+        self.root.attributes('-topmost', self.always_on_top)
+        self.storage_worker.submit(self.storage.update_config, always_on_top=self.always_on_top)
 
     def _test_ocr(self):
         """Test OCR installation."""
+        if not self.ocr:
+            messagebox.showerror("Erro OCR", "OCR ainda não carregado ou indisponível")
+            return
+
         success, message = self.ocr.test_ocr()
         if success:
             messagebox.showinfo("Teste OCR", message)
         else:
             messagebox.showerror("Erro OCR", message)
 
+    def _show_task_stats(self):
+        """Show run counts and time spent by the periodic background tasks."""
+        lines = []
+        for name, stats in self.scheduler.get_stats().items():
+            lines.append(
+                f"{name}: {stats['runs']} execuções, {stats['time_spent']*1000:.0f} ms no total "
+                f"({stats['average_ms']:.1f} ms/exec), intervalo atual {stats['interval']/1000:.0f}s"
+            )
+
+        if self.scheduler.is_paused():
+            lines.append("\n(pausado: janela minimizada)")
+
+        if self.capture_scheduler:
+            stats = self.capture_scheduler.get_stats()
+            lines.append(
+                f"\ncapturas: {stats['completed']} concluídas, {stats['failed']} com erro, "
+                f"{stats['coalesced']} agrupadas, {stats['rejected']} recusadas (fila cheia)"
+            )
+            lines.append(f"fila: {stats['waiting']} aguardando, {stats['running']} em execução")
+            if stats["latency_ms"]:
+                latency = stats["latency_ms"]
+                lines.append(
+                    f"latência por captura: p50 {latency['p50']:.0f} ms, "
+                    f"p95 {latency['p95']:.0f} ms, máx {latency['max']:.0f} ms"
+                )
+
+        messagebox.showinfo("Tarefas em Segundo Plano", "\n".join(lines) or "Nenhuma tarefa registrada")
+
     def _export_csv(self):
         """Export history to CSV file."""
         filename = filedialog.asksaveasfilename(
@@ -546,11 +870,12 @@ class NtropyGUI:
         )
 
         if filename:
-            try:
-                self.storage.export_to_csv(filename)
-                messagebox.showinfo("Sucesso", f"Dados exportados para:\n{filename}")
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao exportar:\n{str(e)}")
+            self.storage_worker.submit(
+                self.storage.export_to_csv,
+                filename,
+                callback=lambda _: messagebox.showinfo("Sucesso", f"Dados exportados para:\n{filename}"),
+                error_callback=lambda e: messagebox.showerror("Erro", f"Erro ao exportar:\n{str(e)}")
+            )
 
     def _clear_history(self):
         """Clear all capture history."""
@@ -561,9 +886,10 @@ class NtropyGUI:
         )
 
         if response:
-            self.storage.clear_history()
-            self._load_history()
-            self._set_status("Histórico limpo")
+            self.storage_worker.submit(
+                self.storage.clear_history,
+                callback=lambda _: self._set_status("Histórico limpo")
+            )
 
     def _show_about(self):
         """Show about dialog."""
@@ -584,7 +910,11 @@ class NtropyGUI:
 
     def _show_objectives(self):
         """Show objectives window."""
-        ObjectivesWindow(self.root, self.storage)
+        ObjectivesWindow(self.root, self.storage, self.storage_worker, self.forecaster)
+
+    def _show_performance(self):
+        """Show per-stage capture timings."""
+        PerformanceWindow(self.root)
 
     def _set_status(self, message: str):
         """Set status message."""
@@ -593,7 +923,7 @@ class NtropyGUI:
     def run(self):
         """Start the application."""
         # Welcome message on first run
-        games = self.storage.get_all_games()
+        games = self.games_config
         any_configured = any(g.get("region") for g in games.values() if g)
 
         if not any_configured:
@@ -614,12 +944,32 @@ class NtropyGUI:
 
         self.root.mainloop()
 
+        # Flush writes still queued on the storage worker
+        self.storage_worker.stop()
+
+        if self.event_feed:
+            self.event_feed.stop()
+
+        if self.image_archive:
+            self.image_archive.stop()
+
 
 class ObjectivesWindow:
     """Window to view and manage objectives across all games."""
 
-    def __init__(self, parent, storage: Storage):
+    # Delay before re-evaluating after the last simulation input (ms)
+    SIMULATION_DEBOUNCE_MS = 300
+
+    def __init__(
+        self,
+        parent,
+        storage: Storage,
+        storage_worker: StorageWorker,
+        forecaster: Optional["IncomeForecaster"] = None
+    ):
         self.storage = storage
+        self.storage_worker = storage_worker
+        self.forecaster = forecaster
         self.window = tk.Toplevel(parent)
         self.window.title("Objetivos - Gacha Tracker")
         self.window.geometry("950x650")
@@ -636,6 +986,21 @@ class ObjectivesWindow:
         # Temporary injected values (game_id -> pulls)
         self.injected_values = {}
 
+        # Data of the last load, read on the storage worker
+        self.games = {}
+        self.all_objectives = {}
+        self.last_captures = {}
+
+        # Rendered widgets, updated in place: game_id -> section, (game_id, objective_id) -> row
+        self._game_widgets = {}
+        self._objective_widgets = {}
+        self._game_order = []
+        self._empty_label = None
+
+        # Id of the latest evaluation batch and pending debounced simulation
+        self._request_id = 0
+        self._pending_simulation = None
+
         self._setup_ui()
         self._load_objectives()
 
@@ -666,19 +1031,15 @@ class ObjectivesWindow:
         ).pack(side=tk.LEFT, padx=(0, 5))
 
         self.sim_game_var = tk.StringVar()
-        sim_game_combo = ttk.Combobox(
+        self.sim_game_combo = ttk.Combobox(
             sim_info,
             textvariable=self.sim_game_var,
             state="readonly",
             width=20,
             font=("Arial", 9)
         )
-        games = self.storage.get_all_games()
-        game_options = [f"{game_id}: {config['name']}" for game_id, config in games.items()]
-        sim_game_combo['values'] = game_options
-        if game_options:
-            sim_game_combo.current(0)
-        sim_game_combo.pack(side=tk.LEFT, padx=(0, 10))
+        # Options are filled when the first load arrives
+        self.sim_game_combo.pack(side=tk.LEFT, padx=(0, 10))
 
         ttk.Label(
             sim_info,
@@ -689,6 +1050,7 @@ class ObjectivesWindow:
         self.sim_pulls_entry = ttk.Entry(sim_info, width=10, font=("Arial", 9))
         self.sim_pulls_entry.pack(side=tk.LEFT, padx=(0, 10))
         self.sim_pulls_entry.insert(0, "0")
+        self.sim_pulls_entry.bind("<KeyRelease>", lambda event: self._schedule_simulation())
 
         apply_btn = tk.Button(
             sim_info,
@@ -761,11 +1123,100 @@ class ObjectivesWindow:
         )
         refresh_btn.pack(side=tk.LEFT, padx=5)
 
-    def _apply_simulation(self):
-        """Apply simulated pulls value for a game."""
+        optimize_btn = tk.Button(
+            button_frame,
+            text="📐 Otimizar Distribuição",
+            command=self._optimize_allocation,
+            font=("Arial", 12),
+            cursor="hand2"
+        )
+        optimize_btn.pack(side=tk.LEFT, padx=5)
+
+        whatif_btn = tk.Button(
+            button_frame,
+            text="🗺️ What-if",
+            command=self._show_what_if,
+            font=("Arial", 12),
+            cursor="hand2"
+        )
+        whatif_btn.pack(side=tk.LEFT, padx=5)
+
+    def _show_what_if(self):
+        """Open the what-if heatmap for the game selected in the simulation panel."""
+        game_str = self.sim_game_var.get()
+        pulls = 0
+        pity = 0
+
+        if game_str:
+            game_id = int(game_str.split(":")[0])
+            pulls = self._get_current_pulls(game_id)
+            objectives = self.all_objectives.get(game_id, [])
+            if objectives:
+                pity = objectives[0].get("current_pity", 0)
+
+        WhatIfWindow(self.window, pulls, pity)
+
+    def _optimize_allocation(self):
+        """Suggest how to split each game's pulls between its objectives."""
+        try:
+            from pull_optimizer import PullAllocationOptimizer
+            optimizer = PullAllocationOptimizer()
+        except ImportError as e:
+            messagebox.showerror("Erro", f"Otimizador indisponível:\n{e}")
+            return
+
+        lines = []
+        for game_id, objectives in self.all_objectives.items():
+            pending = [obj for obj in objectives if not obj.get("completed", False)]
+            if not pending:
+                continue
+
+            current_pulls = self._get_current_pulls(game_id)
+            result = optimizer.optimize(pending, current_pulls)
+
+            game_name = self._get_game_name(game_id)
+
+            lines.append(f"⭐ {game_name} ({int(current_pulls)} pulls)")
+            for allocation in result["allocations"]:
+                lines.append(
+                    f"   • {allocation['objective']['name']}: {allocation['pulls']} pulls "
+                    f"→ {allocation['probability']*100:.1f}%"
+                )
+            lines.append(f"   Objetivos esperados: {result['expected_met']:.2f} de {len(pending)}")
+            if result["unallocated"]:
+                lines.append(f"   Pulls sobrando: {result['unallocated']}")
+            lines.append("")
+
+        if not lines:
+            messagebox.showinfo("Distribuição de Pulls", "Nenhum objetivo pendente para otimizar.")
+            return
+
+        messagebox.showinfo("Distribuição de Pulls", "\n".join(lines).strip(), parent=self.window)
+
+    def _schedule_simulation(self):
+        """Debounce live simulation while the user types or picks a game."""
+        if self._pending_simulation is not None:
+            self.window.after_cancel(self._pending_simulation)
+        self._pending_simulation = self.window.after(
+            self.SIMULATION_DEBOUNCE_MS,
+            lambda: self._apply_simulation(quiet=True)
+        )
+
+    def _apply_simulation(self, quiet: bool = False):
+        """
+        Apply simulated pulls value for a game.
+
+        Args:
+            quiet: Ignore incomplete input instead of showing errors (live typing)
+        """
+        if self._pending_simulation is not None:
+            self.window.after_cancel(self._pending_simulation)
+            self._pending_simulation = None
+
         game_str = self.sim_game_var.get()
         if not game_str:
-            messagebox.showerror("Erro", "Selecione um jogo")
+            if not quiet:
+                messagebox.showerror("Erro", "Selecione um jogo")
             return
 
         game_id = int(game_str.split(":")[0])
@@ -773,24 +1224,29 @@ class ObjectivesWindow:
         try:
             pulls = float(self.sim_pulls_entry.get().strip())
             if pulls < 0:
-                messagebox.showerror("Erro", "Digite um valor positivo")
+                if not quiet:
+                    messagebox.showerror("Erro", "Digite um valor positivo")
                 return
         except ValueError:
-            messagebox.showerror("Erro", "Digite um número válido")
+            if not quiet:
+                messagebox.showerror("Erro", "Digite um número válido")
+            return
+
+        if quiet and self.injected_values.get(game_id) == pulls:
             return
 
         # Store injected value
         self.injected_values[game_id] = pulls
 
         # Update status
-        game_name = self.storage.get_game_config(game_id)["name"]
+        game_name = self._get_game_name(game_id)
         self.sim_status_label.config(
             text=f"✓ Simulando {pulls:.1f} pulls para {game_name}",
             fg="green"
         )
 
-        # Reload objectives to show updated probabilities
-        self._load_objectives()
+        # Re-evaluate objectives to show updated probabilities (no Storage reads needed)
+        self._evaluate_objectives()
 
     def _clear_simulation(self):
         """Clear all simulated values and return to real captured values."""
@@ -798,6 +1254,10 @@ class ObjectivesWindow:
             messagebox.showinfo("Info", "Nenhuma simulação ativa")
             return
 
+        if self._pending_simulation is not None:
+            self.window.after_cancel(self._pending_simulation)
+            self._pending_simulation = None
+
         self.injected_values.clear()
         self.sim_pulls_entry.delete(0, tk.END)
         self.sim_pulls_entry.insert(0, "0")
@@ -807,8 +1267,8 @@ class ObjectivesWindow:
             fg="blue"
         )
 
-        # Reload objectives
-        self._load_objectives()
+        # Re-evaluate objectives
+        self._evaluate_objectives()
 
     def _get_current_pulls(self, game_id: int) -> float:
         """Get current pulls for a game, considering injected values."""
@@ -817,9 +1277,14 @@ class ObjectivesWindow:
             return self.injected_values[game_id]
 
         # Otherwise, use real captured value
-        last_capture = self.storage.get_last_capture(game_id=game_id)
+        last_capture = self.last_captures.get(game_id)
         return last_capture.get("value", 0) if last_capture else 0
 
+    def _get_game_name(self, game_id: int) -> str:
+        """Get a game's display name from the last load."""
+        game_config = self.games.get(str(game_id))
+        return game_config.get("name", f"Jogo {game_id}") if game_config else f"Jogo {game_id}"
+
     def _calculate_objective_progress(self, objective: dict, current_pulls: float) -> dict:
         """Calculate progress for an objective with given pulls amount."""
         pulls_needed = objective.get("pulls_needed", 180)
@@ -832,18 +1297,17 @@ class ObjectivesWindow:
 
         remaining = max(pulls_needed - current_pulls, 0)
 
-        # Calculate real probability using gacha calculator
+        # Calculate real probability using gacha calculator (milestones are not shown here)
         try:
             from gacha_probability import get_calculator
             calc = get_calculator()
-            prob_info = calc.get_probability_explanation(
+            probability, probability_explanation = calc.calculate_desired_character_probability(
                 int(current_pulls),
                 current_pity,
                 guaranteed
             )
 
-            real_probability = prob_info["percentage"]
-            probability_explanation = prob_info["explanation"]
+            real_probability = probability * 100
         except Exception:
             real_probability = progress_percent
             probability_explanation = "Cálculo simples (pulls / total)"
@@ -859,172 +1323,315 @@ class ObjectivesWindow:
         }
 
     def _load_objectives(self):
-        """Load and display all objectives with progress."""
-        # Clear existing widgets
-        for widget in self.objectives_container.winfo_children():
-            widget.destroy()
-
-        # Get all objectives
-        all_objectives = self.storage.get_all_objectives()
-
-        if not all_objectives:
-            # No objectives yet
-            no_obj_label = tk.Label(
-                self.objectives_container,
-                text="Nenhum objetivo cadastrado ainda.\n\nClique em 'Adicionar Objetivo' para criar um!",
-                font=("Arial", 12),
-                fg="gray"
-            )
-            no_obj_label.pack(pady=50)
+        """Reload objectives, games and balances on the storage worker, then redraw."""
+        self.storage_worker.submit(self._read_objectives_data, callback=self._on_objectives_loaded)
+
+    def _read_objectives_data(self) -> dict:
+        """Read everything the window shows in one worker request (runs in worker thread)."""
+        return {
+            "games": self.storage.get_all_games(),
+            "objectives": self.storage.get_all_objectives(),
+            "last_captures": self.storage.snapshot(limit=0)["last_captures"]
+        }
+
+    def _on_objectives_loaded(self, data: dict):
+        """Store a finished load and re-evaluate (Tk thread)."""
+        if not self.window.winfo_exists():
             return
 
-        # Display objectives grouped by game
+        self.games = data["games"]
+        self.all_objectives = data["objectives"]
+        self.last_captures = data["last_captures"]
+
+        game_options = [f"{game_id}: {config['name']}" for game_id, config in self.games.items()]
+        self.sim_game_combo['values'] = game_options
+        if game_options and not self.sim_game_var.get():
+            self.sim_game_combo.current(0)
+
+        self._evaluate_objectives()
+
+    def _evaluate_objectives(self):
+        """Compute the progress of every objective in one background batch."""
+        self._request_id += 1
+
+        # Inputs are captured on the Tk thread; the worker never touches widgets
+        batch = []
         for game_id in range(1, 5):
-            if game_id not in all_objectives:
+            if game_id not in self.all_objectives:
                 continue
+            current_pulls = self._get_current_pulls(game_id)
+            batch.append((game_id, current_pulls, list(self.all_objectives[game_id])))
 
-            game_config = self.storage.get_game_config(game_id)
-            game_name = game_config.get("name", f"Jogo {game_id}")
-            game_color = self.game_colors[game_id]
+        thread = threading.Thread(
+            target=self._compute_progress,
+            args=(self._request_id, batch),
+            daemon=True
+        )
+        thread.start()
 
-            # Game section
-            game_frame = ttk.LabelFrame(
-                self.objectives_container,
-                text=f"⭐ {game_name}",
-                padding="10"
-            )
-            game_frame.pack(fill=tk.X, pady=(0, 10))
+    def _compute_progress(self, request_id: int, batch: list):
+        """Evaluate probabilities and forecasts for a batch (runs in background thread)."""
+        results = []
+        for game_id, current_pulls, objectives in batch:
+            rows = []
+            for obj in objectives:
+                progress_data = self._calculate_objective_progress(obj, current_pulls)
+                try:
+                    progress_data["forecast"] = self._format_forecast(game_id, obj, current_pulls)
+                except Exception as e:
+                    print(f"Error projecting objective: {e}")
+                    progress_data["forecast"] = ""
+                rows.append(progress_data)
+            results.append((game_id, current_pulls, rows))
 
-            # Get current pulls for this game (real or injected)
-            current_pulls = self._get_current_pulls(game_id)
+        try:
+            self.window.after(0, lambda: self._render_objectives(request_id, results))
+        except tk.TclError:
+            # Window closed while computing
+            pass
+
+    def _render_objectives(self, request_id: int, results: list):
+        """Diff the evaluated objectives into the existing widgets (Tk thread)."""
+        # Drop results superseded by a newer evaluation
+        if request_id != self._request_id or not self.window.winfo_exists():
+            return
+
+        if not results:
+            for game_id in list(self._game_widgets):
+                self._game_widgets.pop(game_id)["frame"].destroy()
+            self._objective_widgets.clear()
+
+            if self._empty_label is None:
+                # No objectives yet
+                self._empty_label = tk.Label(
+                    self.objectives_container,
+                    text="Nenhum objetivo cadastrado ainda.\n\nClique em 'Adicionar Objetivo' para criar um!",
+                    font=("Arial", 12),
+                    fg="gray"
+                )
+                self._empty_label.pack(pady=50)
+            return
+
+        if self._empty_label is not None:
+            self._empty_label.destroy()
+            self._empty_label = None
+
+        # Remove games and objectives that no longer exist
+        game_ids = [game_id for game_id, _, _ in results]
+        objective_keys = {(game_id, row["objective"]["id"]) for game_id, _, rows in results for row in rows}
+
+        for key in [key for key in self._objective_widgets if key not in objective_keys]:
+            self._objective_widgets.pop(key)["frame"].destroy()
+        for game_id in [game_id for game_id in self._game_widgets if game_id not in game_ids]:
+            self._game_widgets.pop(game_id)["frame"].destroy()
+
+        # Keep game sections in game order (repacked only when the set changes)
+        if game_ids != self._game_order:
+            for game_id in game_ids:
+                if game_id not in self._game_widgets:
+                    self._game_widgets[game_id] = self._create_game_section(game_id)
+                self._game_widgets[game_id]["frame"].pack_forget()
+            for game_id in game_ids:
+                self._game_widgets[game_id]["frame"].pack(fill=tk.X, pady=(0, 10))
+            self._game_order = game_ids
+
+        for game_id, current_pulls, rows in results:
+            section = self._game_widgets[game_id]
+            section["frame"].config(text=f"⭐ {self._get_game_name(game_id)}")
 
             # Show if using simulated value
             if game_id in self.injected_values:
-                sim_indicator = tk.Label(
-                    game_frame,
-                    text=f"🧪 SIMULAÇÃO: {current_pulls:.1f} pulls (valor temporário)",
-                    font=("Arial", 9, "bold"),
-                    fg="orange",
-                    bg="#fff3cd",
-                    padx=5,
-                    pady=3
+                section["sim_indicator"].config(
+                    text=f"🧪 SIMULAÇÃO: {current_pulls:.1f} pulls (valor temporário)"
                 )
-                sim_indicator.pack(fill=tk.X, pady=(0, 5))
+                section["sim_indicator"].pack(fill=tk.X, pady=(0, 5), before=section["objectives"])
+            else:
+                section["sim_indicator"].pack_forget()
+
+            # Objectives for this game, in storage order
+            order = [row["objective"]["id"] for row in rows]
+            if order != section["order"]:
+                for objective_id in order:
+                    key = (game_id, objective_id)
+                    if key not in self._objective_widgets:
+                        self._objective_widgets[key] = self._create_objective_row(section["objectives"], game_id, objective_id)
+                    self._objective_widgets[key]["frame"].pack_forget()
+                for objective_id in order:
+                    self._objective_widgets[(game_id, objective_id)]["frame"].pack(fill=tk.X, pady=5)
+                section["order"] = order
+
+            for row in rows:
+                self._update_objective_row(self._objective_widgets[(game_id, row["objective"]["id"])], game_id, row)
+
+    def _create_game_section(self, game_id: int) -> dict:
+        """Create the (empty) section of a game."""
+        frame = ttk.LabelFrame(self.objectives_container, text="", padding="10")
+
+        sim_indicator = tk.Label(
+            frame,
+            text="",
+            font=("Arial", 9, "bold"),
+            fg="orange",
+            bg="#fff3cd",
+            padx=5,
+            pady=3
+        )
 
-            # Objectives for this game
-            for obj in all_objectives[game_id]:
-                # Calculate progress with current pulls (real or injected)
-                progress_data = self._calculate_objective_progress(obj, current_pulls)
-                obj = progress_data["objective"]
-                current = progress_data["current_pulls"]
-                percent = progress_data["progress_percent"]
-                real_prob = progress_data.get("real_probability", percent)
-                prob_explanation = progress_data.get("probability_explanation", "")
-                remaining = progress_data["remaining"]
-                is_complete = progress_data["is_complete"]
-
-                # Objective row
-                obj_frame = ttk.Frame(game_frame)
-                obj_frame.pack(fill=tk.X, pady=5)
-
-                # Left side: Name and progress bar
-                left_frame = ttk.Frame(obj_frame)
-                left_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-                # Objective name with state
-                pity = obj.get("current_pity", 0)
-                guaranteed = obj.get("guaranteed", False)
-                state_text = " 🎯" if guaranteed else " 🎲"
-                state_tooltip = "GARANTIDO" if guaranteed else "50/50"
-
-                name_label = tk.Label(
-                    left_frame,
-                    text=f"{obj['name']}{state_text}",
-                    font=("Arial", 12, "bold"),
-                    fg=game_color,
-                    anchor="w"
-                )
-                name_label.pack(anchor="w")
-
-                # State and pity info
-                state_info_label = tk.Label(
-                    left_frame,
-                    text=f"Estado: {state_tooltip}  •  Pity: {pity}/90",
-                    font=("Arial", 9),
-                    fg="#666",
-                    anchor="w"
-                )
-                state_info_label.pack(anchor="w")
-
-                # Progress info with REAL PROBABILITY
-                progress_text = f"{current:.1f} pulls guardados  •  Probabilidade Real: {real_prob:.1f}%"
-                if is_complete:
-                    progress_text += "  ✓ PRATICAMENTE GARANTIDO"
-
-                progress_label = tk.Label(
-                    left_frame,
-                    text=progress_text,
-                    font=("Arial", 10, "bold"),
-                    fg="green" if is_complete else game_color,
-                    anchor="w"
-                )
-                progress_label.pack(anchor="w")
-
-                # Progress bar (usando probabilidade real)
-                progress_bar_frame = ttk.Frame(left_frame)
-                progress_bar_frame.pack(fill=tk.X, pady=(2, 0))
-
-                canvas_progress = tk.Canvas(
-                    progress_bar_frame,
-                    height=20,
-                    bg="white",
-                    highlightthickness=1,
-                    highlightbackground="gray"
-                )
-                canvas_progress.pack(fill=tk.X)
+        objectives_frame = ttk.Frame(frame)
+        objectives_frame.pack(fill=tk.X)
 
-                # Draw progress bar using REAL PROBABILITY
-                bar_width = int((real_prob / 100) * canvas_progress.winfo_reqwidth() or 200)
-                bar_color = "green" if is_complete else game_color
+        return {"frame": frame, "sim_indicator": sim_indicator, "objectives": objectives_frame, "order": []}
 
-                canvas_progress.create_rectangle(
-                    0, 0, bar_width, 20,
-                    fill=bar_color,
-                    outline=""
-                )
+    def _create_objective_row(self, parent, game_id: int, objective_id: str) -> dict:
+        """Create the widgets of an objective row; values are set by _update_objective_row."""
+        game_color = self.game_colors[game_id]
 
-                # Explanation text
-                if not is_complete:
-                    explanation_parts = prob_explanation.split("\n")
-                    main_explanation = explanation_parts[0] if explanation_parts else prob_explanation
+        # Objective row
+        obj_frame = ttk.Frame(parent)
 
-                    explanation_label = tk.Label(
-                        left_frame,
-                        text=f"📊 {main_explanation}",
-                        font=("Arial", 9),
-                        fg="#666"
-                    )
-                    explanation_label.pack(anchor="w")
-
-                # Right side: Delete button
-                delete_btn = tk.Button(
-                    obj_frame,
-                    text="🗑️",
-                    command=lambda gid=game_id, oid=obj["id"]: self._delete_objective(gid, oid),
-                    fg="red",
-                    cursor="hand2",
-                    width=3
-                )
-                delete_btn.pack(side=tk.RIGHT, padx=(10, 0))
+        # Left side: Name and progress bar
+        left_frame = ttk.Frame(obj_frame)
+        left_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        # Objective name with state
+        name_label = tk.Label(
+            left_frame,
+            font=("Arial", 12, "bold"),
+            fg=game_color,
+            anchor="w"
+        )
+        name_label.pack(anchor="w")
+
+        # State and pity info
+        state_info_label = tk.Label(
+            left_frame,
+            font=("Arial", 9),
+            fg="#666",
+            anchor="w"
+        )
+        state_info_label.pack(anchor="w")
+
+        # Progress info with REAL PROBABILITY
+        progress_label = tk.Label(
+            left_frame,
+            font=("Arial", 10, "bold"),
+            anchor="w"
+        )
+        progress_label.pack(anchor="w")
+
+        # Progress bar (usando probabilidade real)
+        progress_bar_frame = ttk.Frame(left_frame)
+        progress_bar_frame.pack(fill=tk.X, pady=(2, 0))
+
+        canvas_progress = tk.Canvas(
+            progress_bar_frame,
+            height=20,
+            bg="white",
+            highlightthickness=1,
+            highlightbackground="gray"
+        )
+        canvas_progress.pack(fill=tk.X)
+        bar = canvas_progress.create_rectangle(0, 0, 0, 20, fill=game_color, outline="")
+
+        # Explanation and forecast (hidden once the objective is practically guaranteed)
+        explanation_label = tk.Label(left_frame, font=("Arial", 9), fg="#666")
+        forecast_label = tk.Label(left_frame, font=("Arial", 9), fg="#666")
+
+        # Right side: Delete button
+        delete_btn = tk.Button(
+            obj_frame,
+            text="🗑️",
+            command=lambda: self._delete_objective(game_id, objective_id),
+            fg="red",
+            cursor="hand2",
+            width=3
+        )
+        delete_btn.pack(side=tk.RIGHT, padx=(10, 0))
+
+        return {
+            "frame": obj_frame,
+            "name": name_label,
+            "state": state_info_label,
+            "progress": progress_label,
+            "canvas": canvas_progress,
+            "bar": bar,
+            "explanation": explanation_label,
+            "forecast": forecast_label
+        }
+
+    def _update_objective_row(self, widgets: dict, game_id: int, progress_data: dict):
+        """Write evaluated values into an objective row's existing widgets."""
+        game_color = self.game_colors[game_id]
+
+        obj = progress_data["objective"]
+        current = progress_data["current_pulls"]
+        real_prob = progress_data["real_probability"]
+        prob_explanation = progress_data["probability_explanation"]
+        is_complete = progress_data["is_complete"]
+        forecast_text = progress_data["forecast"]
+
+        pity = obj.get("current_pity", 0)
+        guaranteed = obj.get("guaranteed", False)
+        state_text = " 🎯" if guaranteed else " 🎲"
+        state_tooltip = "GARANTIDO" if guaranteed else "50/50"
+
+        widgets["name"].config(text=f"{obj['name']}{state_text}")
+        widgets["state"].config(text=f"Estado: {state_tooltip}  •  Pity: {pity}/90")
+
+        progress_text = f"{current:.1f} pulls guardados  •  Probabilidade Real: {real_prob:.1f}%"
+        if is_complete:
+            progress_text += "  ✓ PRATICAMENTE GARANTIDO"
+        widgets["progress"].config(text=progress_text, fg="green" if is_complete else game_color)
+
+        # Progress bar using REAL PROBABILITY
+        canvas = widgets["canvas"]
+        bar_width = int((real_prob / 100) * (canvas.winfo_reqwidth() or 200))
+        canvas.coords(widgets["bar"], 0, 0, bar_width, 20)
+        canvas.itemconfig(widgets["bar"], fill="green" if is_complete else game_color)
+
+        # Explanation text and forecast of when each milestone is reached
+        widgets["explanation"].pack_forget()
+        widgets["forecast"].pack_forget()
+        if not is_complete:
+            explanation_parts = prob_explanation.split("\n")
+            main_explanation = explanation_parts[0] if explanation_parts else prob_explanation
+            widgets["explanation"].config(text=f"📊 {main_explanation}")
+            widgets["explanation"].pack(anchor="w")
+
+            if forecast_text:
+                widgets["forecast"].config(text=f"📅 {forecast_text}")
+                widgets["forecast"].pack(anchor="w")
+
+    def _format_forecast(self, game_id: int, objective: dict, current_pulls: float) -> str:
+        """Format the projected milestone dates for an objective."""
+        if not self.forecaster:
+            return ""
+
+        rate = self.forecaster.get_daily_rate(game_id)
+        if not rate:
+            return ""
+
+        projection = self.forecaster.project_objective(game_id, objective, current_pulls)
+
+        parts = []
+        for milestone, info in projection.items():
+            if info["reached"]:
+                parts.append(f"{milestone}: atingido")
+            elif info["date"]:
+                parts.append(f"{milestone}: {info['date'].strftime('%d/%m/%Y')}")
+            else:
+                parts.append(f"{milestone}: —")
+
+        return f"Previsão ({rate:.1f} pulls/dia): " + "  •  ".join(parts)
 
     def _add_objective(self):
         """Show dialog to add a new objective."""
-        AddObjectiveDialog(self.window, self.storage, self._load_objectives)
+        AddObjectiveDialog(self.window, self.storage, self.storage_worker, self.games, self._load_objectives)
 
     def _delete_objective(self, game_id: int, objective_id: str):
         """Delete an objective."""
         obj = None
-        for o in self.storage.get_objectives(game_id):
+        for o in self.all_objectives.get(game_id, []):
             if o["id"] == objective_id:
                 obj = o
                 break
@@ -1038,15 +1645,392 @@ class ObjectivesWindow:
         )
 
         if response:
-            self.storage.remove_objective(game_id, objective_id)
-            self._load_objectives()
+            self.storage_worker.submit(
+                self.storage.remove_objective,
+                game_id,
+                objective_id,
+                callback=lambda removed: self._load_objectives()
+            )
+
+
+class WhatIfWindow:
+    """What-if heatmap of the success probability over pulls × pity × guaranteed."""
+
+    # Heatmap size in pixels (x = available pulls, y = current pity)
+    PLOT_WIDTH = 360
+    PLOT_HEIGHT = 180
+
+    # Delay before recomputing after the last slider movement (ms)
+    DEBOUNCE_MS = 150
+
+    # Probability thresholds drawn as contour lines
+    CONTOURS = (0.5, 0.9)
+
+    def __init__(self, parent, pulls: float = 0, pity: int = 0):
+        self.window = tk.Toplevel(parent)
+        self.window.title("What-if - Probabilidade por Pulls × Pity")
+        self.window.transient(parent)
+
+        from gacha_probability import get_calculator
+        self.calculator = get_calculator()
+
+        # Pending debounce callback and id of the latest requested grid
+        self._pending_after = None
+        self._request_id = 0
+
+        # Last rendered grid: (max_pulls, table slice) and PhotoImages (kept alive)
+        self._grid = None
+        self._images = {}
+
+        self._setup_ui(pulls, pity)
+        self._schedule_recompute()
+
+    def _setup_ui(self, pulls: float, pity: int):
+        """Setup the what-if window UI."""
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        controls = ttk.Frame(main_frame)
+        controls.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(controls, text="Pulls máximos:", font=("Arial", 9, "bold")).grid(row=0, column=0, sticky=tk.W)
+        self.max_pulls_var = tk.IntVar(value=max(180, int(pulls)))
+        tk.Scale(
+            controls, from_=10, to=360, orient=tk.HORIZONTAL, length=300,
+            variable=self.max_pulls_var, command=lambda _: self._schedule_recompute()
+        ).grid(row=0, column=1, sticky=tk.W)
+
+        ttk.Label(controls, text="Pulls disponíveis:", font=("Arial", 9, "bold")).grid(row=1, column=0, sticky=tk.W)
+        self.pulls_var = tk.IntVar(value=int(pulls))
+        tk.Scale(
+            controls, from_=0, to=360, orient=tk.HORIZONTAL, length=300,
+            variable=self.pulls_var, command=lambda _: self._update_marker()
+        ).grid(row=1, column=1, sticky=tk.W)
+
+        ttk.Label(controls, text="Pity atual:", font=("Arial", 9, "bold")).grid(row=2, column=0, sticky=tk.W)
+        self.pity_var = tk.IntVar(value=pity)
+        tk.Scale(
+            controls, from_=0, to=self.calculator.HARD_PITY - 1, orient=tk.HORIZONTAL, length=300,
+            variable=self.pity_var, command=lambda _: self._update_marker()
+        ).grid(row=2, column=1, sticky=tk.W)
+
+        plots = ttk.Frame(main_frame)
+        plots.pack()
+
+        self.canvases = {}
+        for column, guaranteed in enumerate((False, True)):
+            ttk.Label(
+                plots,
+                text="Estado: GARANTIDO" if guaranteed else "Estado: 50/50",
+                font=("Arial", 10, "bold")
+            ).grid(row=0, column=column)
+
+            canvas = tk.Canvas(
+                plots,
+                width=self.PLOT_WIDTH,
+                height=self.PLOT_HEIGHT,
+                bg="white",
+                highlightthickness=1,
+                highlightbackground="gray"
+            )
+            canvas.grid(row=1, column=column, padx=5)
+            self.canvases[guaranteed] = canvas
+
+        self.axis_label = tk.Label(main_frame, text="", font=("Arial", 8), fg="gray")
+        self.axis_label.pack(pady=(5, 0))
+
+        self.readout_label = tk.Label(main_frame, text="Calculando...", font=("Arial", 10, "bold"))
+        self.readout_label.pack(pady=(5, 0))
+
+    def _schedule_recompute(self):
+        """Debounce grid recomputation while sliders move."""
+        if self._pending_after is not None:
+            self.window.after_cancel(self._pending_after)
+        self._pending_after = self.window.after(self.DEBOUNCE_MS, self._start_recompute)
+
+    def _start_recompute(self):
+        """Compute the heatmap off the Tk thread."""
+        self._pending_after = None
+        self._request_id += 1
+
+        thread = threading.Thread(
+            target=self._compute_grid,
+            args=(self._request_id, self.max_pulls_var.get()),
+            daemon=True
+        )
+        thread.start()
+
+    def _compute_grid(self, request_id: int, max_pulls: int):
+        """Build heatmap pixel rows and contours for every state (runs in background thread)."""
+        try:
+            import numpy as np
+
+            # One vectorized lookup covers pulls × pity × guaranteed
+            table = self.calculator.get_probability_table(max_pulls)
+
+            pulls_index = np.rint(np.linspace(0, max_pulls, self.PLOT_WIDTH)).astype(int)
+            pity_index = np.arange(self.PLOT_HEIGHT) * self.calculator.HARD_PITY // self.PLOT_HEIGHT
+            pixels = table[:, pity_index[:, None], pulls_index[None, :]]
+
+            # Red (0%) → yellow (50%) → green (100%) palette
+            palette = []
+            for level in range(101):
+                red = 255 if level <= 50 else int(255 * (100 - level) / 50)
+                green = int(255 * level / 50) if level <= 50 else 200
+                palette.append(f"#{red:02x}{green:02x}40")
+
+            levels = np.rint(pixels * 100).astype(int)
+            rows = {
+                guaranteed: " ".join(
+                    "{" + " ".join(palette[level] for level in row) + "}"
+                    for row in levels[int(guaranteed)]
+                )
+                for guaranteed in (False, True)
+            }
+
+            # First pull count reaching each threshold, per pity (None if never reached)
+            contours = {}
+            for guaranteed in (False, True):
+                state = table[int(guaranteed)]
+                contours[guaranteed] = {}
+                for threshold in self.CONTOURS:
+                    reached = state >= threshold
+                    first = np.where(reached.any(axis=1), reached.argmax(axis=1), -1)
+                    contours[guaranteed][threshold] = [int(pulls) if pulls >= 0 else None for pulls in first]
+
+            result = (max_pulls, table, rows, contours)
+        except Exception as e:
+            print(f"Error computing what-if grid: {e}")
+            result = None
+
+        try:
+            self.window.after(0, lambda: self._render_grid(request_id, result))
+        except tk.TclError:
+            # Window closed while computing
+            pass
+
+    def _render_grid(self, request_id: int, result):
+        """Draw the computed heatmaps (main thread)."""
+        # Drop results superseded by a newer request
+        if request_id != self._request_id or result is None:
+            return
+
+        max_pulls, table, rows, contours = result
+        self._grid = (max_pulls, table)
+
+        for guaranteed, canvas in self.canvases.items():
+            canvas.delete("all")
+
+            image = tk.PhotoImage(width=self.PLOT_WIDTH, height=self.PLOT_HEIGHT)
+            image.put(rows[guaranteed])
+            self._images[guaranteed] = image
+            canvas.create_image(0, 0, image=image, anchor=tk.NW)
+
+            for threshold, first_pulls in contours[guaranteed].items():
+                points = []
+                for pity, pulls in enumerate(first_pulls):
+                    if pulls is None:
+                        continue
+                    points.extend(self._to_canvas(pulls, pity, max_pulls))
+
+                if len(points) >= 4:
+                    canvas.create_line(*points, fill="black", dash=(3, 2))
+                    canvas.create_text(
+                        points[0] + 4, points[1] + 2,
+                        text=f"{int(threshold*100)}%",
+                        anchor=tk.NW,
+                        font=("Arial", 8, "bold")
+                    )
+
+        self.axis_label.config(
+            text=f"Eixo X: pulls disponíveis (0-{max_pulls})  •  "
+                 f"Eixo Y: pity atual (0-{self.calculator.HARD_PITY - 1})  •  "
+                 "Linhas: contornos de 50% e 90%"
+        )
+        self._update_marker()
+
+    def _to_canvas(self, pulls: float, pity: float, max_pulls: int):
+        """Convert (pulls, pity) to canvas coordinates."""
+        x = pulls / max(max_pulls, 1) * (self.PLOT_WIDTH - 1)
+        y = pity / self.calculator.HARD_PITY * self.PLOT_HEIGHT
+        return x, y
+
+    def _update_marker(self):
+        """Move the crosshair and show the probability at the selected point."""
+        if self._grid is None:
+            return
+
+        max_pulls, table = self._grid
+        pulls = self.pulls_var.get()
+        pity = self.pity_var.get()
+
+        for guaranteed, canvas in self.canvases.items():
+            canvas.delete("marker")
+            if pulls <= max_pulls:
+                x, y = self._to_canvas(pulls, pity, max_pulls)
+                canvas.create_line(x, 0, x, self.PLOT_HEIGHT, fill="blue", tags="marker")
+                canvas.create_line(0, y, self.PLOT_WIDTH, y, fill="blue", tags="marker")
+
+        if pulls <= max_pulls:
+            prob_5050 = table[0, pity, pulls]
+            prob_guaranteed = table[1, pity, pulls]
+        else:
+            prob_5050, _ = self.calculator.calculate_desired_character_probability(pulls, pity, False)
+            prob_guaranteed, _ = self.calculator.calculate_desired_character_probability(pulls, pity, True)
+
+        self.readout_label.config(
+            text=f"{pulls} pulls, pity {pity}:  50/50 = {prob_5050*100:.1f}%  •  "
+                 f"Garantido = {prob_guaranteed*100:.1f}%"
+        )
+
+
+class PerformanceWindow:
+    """Percentiles of the traced capture stages, with Chrome trace export."""
+
+    # Interval between table refreshes while the window is open (ms)
+    REFRESH_MS = 1000
+
+    COLUMNS = (
+        ("count", "Chamadas", 70),
+        ("p50", "p50 (ms)", 80),
+        ("p95", "p95 (ms)", 80),
+        ("p99", "p99 (ms)", 80),
+        ("max", "Máx (ms)", 80),
+        ("total_ms", "Total (ms)", 90)
+    )
+
+    def __init__(self, parent):
+        self.window = tk.Toplevel(parent)
+        self.window.title("Performance - Etapas da Captura")
+        self.window.geometry("720x400")
+        self.window.transient(parent)
+
+        self._setup_ui()
+        self._refresh()
+
+    def _setup_ui(self):
+        """Setup the performance window UI."""
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.tree = ttk.Treeview(
+            main_frame,
+            columns=[key for key, _, _ in self.COLUMNS],
+            height=12
+        )
+        self.tree.heading("#0", text="Etapa")
+        self.tree.column("#0", width=180)
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor=tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.summary_label = tk.Label(main_frame, text="", font=("Arial", 8), fg="gray")
+        self.summary_label.pack(anchor=tk.W, pady=(5, 0))
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+
+        ttk.Button(button_frame, text="Exportar Trace...", command=self._export_trace).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Limpar", command=self._clear).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Fechar", command=self.window.destroy).pack(side=tk.RIGHT)
+
+    def _refresh(self):
+        """Redraw the table from the tracer and schedule the next refresh."""
+        try:
+            stats = tracer.get_stats()
+
+            # Keep the rows (and the selection) when only the numbers change
+            existing = set(self.tree.get_children())
+            for name, row in stats.items():
+                values = [row["count"]] + [f"{row[key]:.1f}" for key, _, _ in self.COLUMNS[1:]]
+                if name in existing:
+                    self.tree.item(name, values=values)
+                else:
+                    self.tree.insert("", tk.END, iid=name, text=name, values=values)
+            for name in existing - set(stats):
+                self.tree.delete(name)
+
+            self.summary_label.config(
+                text=f"{sum(row['count'] for row in stats.values())} spans no buffer "
+                     f"(últimos {tracer.CAPACITY})"
+            )
+            self.window.after(self.REFRESH_MS, self._refresh)
+        except tk.TclError:
+            # Window closed
+            pass
+
+    def _clear(self):
+        """Discard the recorded spans."""
+        tracer.clear()
+        self.tree.delete(*self.tree.get_children())
+
+    def _export_trace(self):
+        """Save the recorded spans as Chrome trace-event JSON."""
+        filename = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")],
+            initialfile=f"ntropy_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+
+        if filename:
+            try:
+                count = tracer.export_chrome_trace(filename)
+                messagebox.showinfo(
+                    "Sucesso",
+                    f"{count} spans exportados para:\n{filename}\n\n"
+                    "Abra em chrome://tracing ou ui.perfetto.dev",
+                    parent=self.window
+                )
+            except OSError as e:
+                messagebox.showerror("Erro", f"Erro ao exportar:\n{str(e)}", parent=self.window)
+
+
+class CaptureImagesWindow:
+    """Raw screen crops a capture was read from."""
+
+    LABELS = {"converted": "Convertidos", "integer": "Inteiros"}
+
+    def __init__(self, parent, capture: dict, paths: dict):
+        from PIL import Image, ImageTk
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Captura #{capture['id']} - Imagens")
+        self.window.transient(parent)
+
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(
+            main_frame,
+            text=f"{capture['timestamp']}  •  Valor lido: {capture['value']:,.2f}",
+            font=("Arial", 10, "bold")
+        ).pack(anchor=tk.W, pady=(0, 10))
+
+        # PhotoImages must stay referenced while shown
+        self._photos = []
+        for name, path in paths.items():
+            ttk.Label(main_frame, text=self.LABELS.get(name, name)).pack(anchor=tk.W)
+            try:
+                with Image.open(path) as image:
+                    photo = ImageTk.PhotoImage(image)
+            except OSError as e:
+                ttk.Label(main_frame, text=f"Erro ao abrir {path}: {e}", foreground="red").pack(anchor=tk.W)
+                continue
+            self._photos.append(photo)
+            tk.Label(main_frame, image=photo, relief=tk.SUNKEN).pack(anchor=tk.W, pady=(0, 10))
+
+        ttk.Button(main_frame, text="Fechar", command=self.window.destroy).pack(side=tk.RIGHT)
 
 
 class AddObjectiveDialog:
     """Dialog to add a new objective."""
 
-    def __init__(self, parent, storage: Storage, callback):
+    def __init__(self, parent, storage: Storage, storage_worker: StorageWorker, games: dict, callback):
         self.storage = storage
+        self.storage_worker = storage_worker
+        self.games = games
         self.callback = callback
 
         self.dialog = tk.Toplevel(parent)
@@ -1080,8 +2064,7 @@ class AddObjectiveDialog:
             font=("Arial", 10)
         )
 
-        games = self.storage.get_all_games()
-        game_options = [f"{game_id}: {config['name']}" for game_id, config in games.items()]
+        game_options = [f"{game_id}: {config['name']}" for game_id, config in self.games.items()]
         game_combo['values'] = game_options
         if game_options:
             game_combo.current(0)
@@ -1201,10 +2184,16 @@ class AddObjectiveDialog:
         guaranteed = self.guaranteed_var.get()
 
         # Save objective with all parameters
-        self.storage.add_objective(game_id, name, pulls_needed, current_pity, guaranteed)
+        self.storage_worker.submit(
+            self.storage.add_objective,
+            game_id, name, pulls_needed, current_pity, guaranteed,
+            callback=lambda objective_id: self._on_saved(name)
+        )
 
-        # Close dialog and refresh parent
         self.dialog.destroy()
+
+    def _on_saved(self, name: str):
+        """Refresh the parent once the objective is written."""
         if self.callback:
             self.callback()
 
@@ -0,0 +1,336 @@
+import tkinter as tk
+from tkinter import ttk
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from storage import Storage
+from storage_worker import StorageWorker
+
+
+def _triangle_area(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    """Twice the area of the triangle abc (only used for comparisons)."""
+    return abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+
+
+class LTTBSeries:
+    """
+    Time series downsampled with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the points between them are
+    split into buckets of a fixed size and each bucket keeps the point forming
+    the largest triangle with the previously kept point and the average of the
+    next bucket. Bucket sizes are powers of two (zoom levels), so a level stays
+    valid as the series grows: the choice made for a bucket only depends on
+    the following bucket, so once that bucket is full it is final and new
+    points only cost the buckets at the end of the series.
+    """
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.values: List[float] = []
+
+        # bucket size -> indices kept for the finalized buckets (starting with 0)
+        self._levels: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, timestamp: float, value: float) -> bool:
+        """
+        Add a point at the end of the series.
+
+        Returns:
+            False if the point is older than the last one (the series must be rebuilt)
+        """
+        if self.times and timestamp < self.times[-1]:
+            return False
+
+        self.times.append(timestamp)
+        self.values.append(value)
+        return True
+
+    def clear(self):
+        """Remove all points and cached levels."""
+        self.times.clear()
+        self.values.clear()
+        self._levels.clear()
+
+    def downsample(self, max_points: int) -> Tuple[List[float], List[float]]:
+        """
+        Get at most max_points points representing the series.
+
+        Args:
+            max_points: Point budget (usually the plot width in pixels, at least 3)
+
+        Returns:
+            Tuple of (times, values)
+        """
+        count = len(self.times)
+        max_points = max(int(max_points), 3)
+
+        if count <= max_points:
+            return list(self.times), list(self.values)
+
+        # Smallest power of two that fits the inner points in the budget
+        bucket_size = 1
+        while (count - 2 + bucket_size - 1) // bucket_size > max_points - 2:
+            bucket_size *= 2
+
+        indices = self._get_indices(bucket_size)
+        return [self.times[i] for i in indices], [self.values[i] for i in indices]
+
+    def _get_indices(self, bucket_size: int) -> List[int]:
+        """Get the kept point indices for a zoom level, extending its cache."""
+        count = len(self.times)
+        finalized = self._levels.setdefault(bucket_size, [0])
+
+        # Bucket k covers inner points [1 + k*size, 1 + (k+1)*size); its choice is
+        # final once bucket k+1 is complete, i.e. lies entirely before the last point
+        bucket = len(finalized) - 1
+        while 1 + (bucket + 2) * bucket_size <= count - 1:
+            finalized.append(self._select(finalized[-1], bucket, bucket_size, count))
+            bucket += 1
+
+        # Remaining buckets depend on the current last point; not cached
+        indices = list(finalized)
+        while 1 + bucket * bucket_size < count - 1:
+            indices.append(self._select(indices[-1], bucket, bucket_size, count))
+            bucket += 1
+
+        indices.append(count - 1)
+        return indices
+
+    def _select(self, previous: int, bucket: int, bucket_size: int, count: int) -> int:
+        """Pick the point of a bucket forming the largest triangle."""
+        start = 1 + bucket * bucket_size
+        end = min(start + bucket_size, count - 1)
+
+        # Average of the next bucket (the last point alone after the final bucket)
+        next_start = end
+        next_end = min(next_start + bucket_size, count - 1)
+        if next_start < next_end:
+            span = next_end - next_start
+            cx = sum(self.times[next_start:next_end]) / span
+            cy = sum(self.values[next_start:next_end]) / span
+        else:
+            cx = self.times[count - 1]
+            cy = self.values[count - 1]
+
+        ax = self.times[previous]
+        ay = self.values[previous]
+
+        best_index = start
+        best_area = -1.0
+        for index in range(start, end):
+            area = _triangle_area(ax, ay, self.times[index], self.values[index], cx, cy)
+            if area > best_area:
+                best_area = area
+                best_index = index
+
+        return best_index
+
+
+class HistoryChart:
+    """
+    Per-game pull balance chart drawn on a Tk Canvas.
+
+    The full capture history is loaded once (on the storage worker) and kept
+    as one LTTBSeries per game; new captures are appended as Storage
+    notifications arrive, and each redraw plots at most one point per pixel.
+    """
+
+    # Space around the plot for the axis labels (pixels)
+    MARGIN_LEFT = 60
+    MARGIN_RIGHT = 10
+    MARGIN_TOP = 10
+    MARGIN_BOTTOM = 25
+
+    def __init__(self, parent, storage: Storage, storage_worker: StorageWorker, game_colors: Dict[int, str]):
+        """
+        Create the widget.
+
+        Args:
+            parent: Container widget
+            storage: Storage instance providing the history
+            storage_worker: Worker that runs the Storage reads
+            game_colors: Line colour per game ID
+        """
+        self.storage = storage
+        self.storage_worker = storage_worker
+        self.game_colors = game_colors
+
+        self.series: Dict[int, LTTBSeries] = {}
+        self._game_names: Dict[int, str] = {}
+        self._redraw_pending = False
+
+        self.frame = ttk.Frame(parent)
+
+        # Game filter
+        filter_frame = ttk.Frame(self.frame)
+        filter_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+
+        ttk.Label(filter_frame, text="Jogo:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 5))
+        self.game_var = tk.StringVar(value="Todos")
+        self.game_combo = ttk.Combobox(
+            filter_frame,
+            textvariable=self.game_var,
+            state="readonly",
+            width=20,
+            font=("Arial", 9)
+        )
+        self.game_combo['values'] = ["Todos"]
+        self.game_combo.pack(side=tk.LEFT)
+        self.game_combo.bind("<<ComboboxSelected>>", lambda event: self.redraw())
+
+        self.info_label = tk.Label(filter_frame, text="", font=("Arial", 8), fg="gray")
+        self.info_label.pack(side=tk.RIGHT)
+
+        self.canvas = tk.Canvas(self.frame, bg="white", highlightthickness=1, highlightbackground="gray")
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+
+    def pack(self, **kwargs):
+        """Pack the widget container."""
+        self.frame.pack(**kwargs)
+
+    def refresh(self):
+        """Reload game names and the whole history, then redraw."""
+        self.storage_worker.submit(self._read_history, callback=self._on_history_loaded)
+
+    def _read_history(self) -> tuple:
+        """Read games and captures in one worker request (runs in worker thread)."""
+        return self.storage.get_all_games(), self.storage.load_history()
+
+    def _on_history_loaded(self, result: tuple):
+        """Rebuild every series from the loaded history."""
+        games, captures = result
+
+        self._game_names = {
+            int(game_id): config.get("name", f"Jogo {game_id}")
+            for game_id, config in games.items()
+            if config
+        }
+        self.game_combo['values'] = ["Todos"] + [
+            f"{game_id}: {name}" for game_id, name in sorted(self._game_names.items())
+        ]
+
+        self.series.clear()
+        for capture in sorted(captures, key=lambda c: (c.get("timestamp", ""), c.get("id", 0))):
+            self._add_capture(capture)
+
+        self.redraw()
+
+    def on_storage_event(self, event: str, payload: dict):
+        """Update the chart after a Storage change notification."""
+        if event == "capture_saved":
+            if not self._add_capture(payload["capture"]):
+                self.refresh()
+                return
+            self.redraw()
+        else:
+            # Deletions can hit any point of a series: rebuild
+            self.refresh()
+
+    def _add_capture(self, capture: dict) -> bool:
+        """Append a capture to its game's series (False if it arrived out of order)."""
+        try:
+            timestamp = datetime.strptime(capture["timestamp"], "%Y-%m-%d %H:%M:%S").timestamp()
+        except (KeyError, ValueError):
+            return True
+
+        game_id = capture.get("game_id", 1)
+        if game_id not in self.series:
+            self.series[game_id] = LTTBSeries()
+
+        return self.series[game_id].append(timestamp, float(capture.get("value", 0)))
+
+    def redraw(self):
+        """Schedule a redraw (coalesces bursts of events and resizes)."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.canvas.after_idle(self._draw)
+
+    def _get_selected_games(self) -> List[int]:
+        """Get the game IDs selected in the filter."""
+        selection = self.game_var.get()
+        if selection == "Todos" or not selection:
+            return sorted(self.series)
+
+        game_id = int(selection.split(":")[0])
+        return [game_id] if game_id in self.series else []
+
+    def _draw(self):
+        """Draw the selected series, one point per pixel at most."""
+        self._redraw_pending = False
+        self.canvas.delete("all")
+
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        plot_width = width - self.MARGIN_LEFT - self.MARGIN_RIGHT
+        plot_height = height - self.MARGIN_TOP - self.MARGIN_BOTTOM
+
+        games = [game_id for game_id in self._get_selected_games() if len(self.series[game_id])]
+        if not games or plot_width < 10 or plot_height < 10:
+            self.canvas.create_text(
+                width // 2, height // 2,
+                text="Nenhuma captura para exibir",
+                fill="gray",
+                font=("Arial", 10)
+            )
+            self.info_label.config(text="")
+            return
+
+        downsampled = {game_id: self.series[game_id].downsample(plot_width) for game_id in games}
+
+        # Shared axes
+        t_min = min(times[0] for times, _ in downsampled.values())
+        t_max = max(times[-1] for times, _ in downsampled.values())
+        v_min = min(min(values) for _, values in downsampled.values())
+        v_max = max(max(values) for _, values in downsampled.values())
+        if t_max == t_min:
+            t_max = t_min + 1
+        if v_max == v_min:
+            v_max = v_min + 1
+
+        def to_x(t: float) -> float:
+            return self.MARGIN_LEFT + (t - t_min) / (t_max - t_min) * plot_width
+
+        def to_y(v: float) -> float:
+            return self.MARGIN_TOP + (1 - (v - v_min) / (v_max - v_min)) * plot_height
+
+        # Axes and labels
+        left, right = self.MARGIN_LEFT, self.MARGIN_LEFT + plot_width
+        top, bottom = self.MARGIN_TOP, self.MARGIN_TOP + plot_height
+        self.canvas.create_line(left, top, left, bottom, right, bottom, fill="gray")
+
+        for value in (v_min, (v_min + v_max) / 2, v_max):
+            y = to_y(value)
+            self.canvas.create_line(left, y, right, y, fill="#eeeeee")
+            self.canvas.create_text(left - 5, y, text=f"{value:,.0f}", anchor=tk.E, font=("Arial", 8), fill="gray")
+
+        for t, anchor in ((t_min, tk.NW), (t_max, tk.NE)):
+            self.canvas.create_text(
+                to_x(t), bottom + 5,
+                text=datetime.fromtimestamp(t).strftime("%d/%m/%Y"),
+                anchor=anchor,
+                font=("Arial", 8),
+                fill="gray"
+            )
+
+        # One polyline per game
+        plotted = 0
+        for game_id, (times, values) in downsampled.items():
+            color = self.game_colors.get(game_id, "black")
+            coords = []
+            for t, v in zip(times, values):
+                coords.extend((to_x(t), to_y(v)))
+
+            if len(coords) >= 4:
+                self.canvas.create_line(*coords, fill=color, width=2)
+            else:
+                x, y = coords
+                self.canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill=color, outline=color)
+            plotted += len(times)
+
+        total = sum(len(self.series[game_id]) for game_id in games)
+        self.info_label.config(text=f"{plotted:,} de {total:,} pontos")
@@ -0,0 +1,289 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from storage import Storage
+from storage_worker import StorageWorker
+
+
+class VirtualHistoryView:
+    """
+    Virtualized capture history table.
+
+    Only the rows currently visible are materialized in the Treeview; the
+    scrollbar is driven by the total capture count and pages are fetched from
+    Storage on demand, so browsing 100k captures costs the same as 100.
+    Fetches run on the storage worker; the visible rows stay in place until
+    the page they need arrives.
+    """
+
+    # Captures fetched per Storage request
+    PAGE_SIZE = 200
+
+    # Pages kept in memory (least recently used are dropped)
+    MAX_CACHED_PAGES = 4
+
+    def __init__(self, parent, storage: Storage, storage_worker: StorageWorker, game_colors: Dict[int, str]):
+        """
+        Create the widget.
+
+        Args:
+            parent: Container widget
+            storage: Storage instance providing the history pages
+            storage_worker: Worker that runs the Storage reads
+            game_colors: Row colour per game ID
+        """
+        self.storage = storage
+        self.storage_worker = storage_worker
+
+        self.offset = 0
+        self.total = 0
+        self.visible_rows = 10
+        self._pages: "OrderedDict[int, List[dict]]" = OrderedDict()
+        self._pending_pages: Set[int] = set()
+        self._game_names: Dict[int, str] = {}
+
+        # Bumped on every reload so pages fetched before it are discarded
+        self._generation = 0
+
+        self.frame = ttk.Frame(parent)
+
+        # Jump to date
+        jump_frame = ttk.Frame(self.frame)
+        jump_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+
+        ttk.Label(jump_frame, text="Ir para data:", font=("Arial", 9)).pack(side=tk.LEFT, padx=(0, 5))
+        self.date_entry = ttk.Entry(jump_frame, width=12, font=("Arial", 9))
+        self.date_entry.pack(side=tk.LEFT, padx=(0, 5))
+        self.date_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        self.date_entry.bind("<Return>", lambda event: self.jump_to_date())
+
+        ttk.Button(jump_frame, text="Ir", width=4, command=self.jump_to_date).pack(side=tk.LEFT)
+
+        self.position_label = tk.Label(jump_frame, text="", font=("Arial", 8), fg="gray")
+        self.position_label.pack(side=tk.RIGHT)
+
+        # Scrollbar
+        self.scrollbar = ttk.Scrollbar(self.frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Treeview
+        columns = ("ID", "Jogo", "Valor", "Data/Hora")
+        self.tree = ttk.Treeview(
+            self.frame,
+            columns=columns,
+            show="headings",
+            height=self.visible_rows
+        )
+
+        # Configure columns
+        self.tree.heading("ID", text="ID")
+        self.tree.heading("Jogo", text="Jogo")
+        self.tree.heading("Valor", text="Valor")
+        self.tree.heading("Data/Hora", text="Data/Hora")
+
+        self.tree.column("ID", width=50, anchor=tk.CENTER)
+        self.tree.column("Jogo", width=120, anchor=tk.W)
+        self.tree.column("Valor", width=120, anchor=tk.E)
+        self.tree.column("Data/Hora", width=150, anchor=tk.CENTER)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Color rows by game
+        for game_id, color in game_colors.items():
+            self.tree.tag_configure(f"game_{game_id}", foreground=color)
+
+        # Scrolling is handled here, not by the Treeview (it never holds more than a screen)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_mouse_wheel)
+        self.tree.bind("<Configure>", self._on_resize)
+
+    def pack(self, **kwargs):
+        """Pack the widget container."""
+        self.frame.pack(**kwargs)
+
+    def refresh(self):
+        """Reload game names and the history, then redraw the visible window."""
+        self.storage_worker.submit(self.storage.get_all_games, callback=self._on_games_loaded)
+        self._reload()
+
+    def _on_games_loaded(self, games: dict):
+        """Store the game names used in the Jogo column."""
+        self._game_names = {
+            int(game_id): config.get("name", f"Jogo {game_id}")
+            for game_id, config in games.items()
+            if config
+        }
+
+    def _reload(self):
+        """Drop cached pages, reload the capture count and redraw."""
+        self._generation += 1
+        generation = self._generation
+
+        self.storage_worker.submit(
+            self.storage.count_captures,
+            callback=lambda total: self._on_count_loaded(generation, total)
+        )
+
+    def _on_count_loaded(self, generation: int, total: int):
+        """Apply a reloaded capture count."""
+        if generation != self._generation:
+            return
+
+        self._pages.clear()
+        self._pending_pages.clear()
+        self.total = total
+        self._render()
+
+    def on_storage_event(self, event: str, payload: dict):
+        """Update the view after a Storage change notification."""
+        if event == "capture_saved" and self.offset > 0:
+            # Keep the rows the user is looking at in place
+            self.offset += 1
+        elif event == "history_cleared":
+            self.offset = 0
+
+        self._reload()
+
+    def scroll_to(self, offset: int):
+        """Show the rows starting at the given history position."""
+        self.offset = offset
+        self._render()
+
+    def jump_to_date(self):
+        """Scroll to the first capture made on or before the typed date."""
+        text = self.date_entry.get().strip()
+        try:
+            datetime.strptime(text, "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Erro", "Digite a data no formato AAAA-MM-DD")
+            return
+
+        self.storage_worker.submit(
+            self.storage.find_capture_offset,
+            f"{text} 23:59:59",
+            callback=self.scroll_to
+        )
+
+    def _get_page(self, page_number: int) -> Optional[List[dict]]:
+        """Get a cached page, requesting it from the worker if it is missing."""
+        page = self._pages.get(page_number)
+        if page is not None:
+            self._pages.move_to_end(page_number)
+            return page
+
+        if page_number not in self._pending_pages:
+            self._pending_pages.add(page_number)
+            generation = self._generation
+            self.storage_worker.submit(
+                self.storage.load_history_page,
+                page_number * self.PAGE_SIZE,
+                self.PAGE_SIZE,
+                callback=lambda rows: self._on_page_loaded(generation, page_number, rows)
+            )
+
+        return None
+
+    def _on_page_loaded(self, generation: int, page_number: int, rows: List[dict]):
+        """Cache a fetched page and redraw."""
+        if generation != self._generation:
+            return
+
+        self._pending_pages.discard(page_number)
+        self._pages[page_number] = rows
+        if len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+
+        self._render()
+
+    def _render(self):
+        """Materialize exactly the visible rows, reusing rows already shown."""
+        self.offset = max(0, min(self.offset, self.total - self.visible_rows))
+        end = min(self.offset + self.visible_rows, self.total)
+
+        # Wait until every page covering the visible window is loaded
+        pages = {}
+        for page_number in range(self.offset // self.PAGE_SIZE, (max(end, 1) - 1) // self.PAGE_SIZE + 1):
+            page = self._get_page(page_number)
+            if page is None:
+                return
+            pages[page_number] = page
+
+        wanted = []
+        for position in range(self.offset, end):
+            page_number, index = divmod(position, self.PAGE_SIZE)
+            page = pages[page_number]
+            if index < len(page):
+                wanted.append(page[index])
+
+        wanted_ids = [str(capture["id"]) for capture in wanted]
+        wanted_set = set(wanted_ids)
+
+        # Remove rows that scrolled out (or were deleted)
+        stale = [iid for iid in self.tree.get_children() if iid not in wanted_set]
+        if stale:
+            self.tree.delete(*stale)
+
+        # Insert the missing rows at their position; existing ones stay untouched
+        for index, (iid, capture) in enumerate(zip(wanted_ids, wanted)):
+            if not self.tree.exists(iid):
+                self._insert_row(capture, index)
+            elif self.tree.index(iid) != index:
+                self.tree.move(iid, "", index)
+
+        # Update scrollbar and position
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(wanted)) / self.total)
+            self.position_label.config(
+                text=f"{self.offset + 1}-{self.offset + len(wanted)} de {self.total:,}"
+            )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.position_label.config(text="Nenhuma captura")
+
+    def _insert_row(self, capture: dict, index: int):
+        """Insert one capture row."""
+        game_id = capture.get("game_id", 1)
+
+        self.tree.insert(
+            "",
+            index,
+            iid=str(capture["id"]),
+            values=(
+                capture["id"],
+                self._game_names.get(game_id, f"Jogo {game_id}"),
+                f"{capture['value']:,.2f}",
+                capture["timestamp"]
+            ),
+            tags=(f"game_{game_id}",)
+        )
+
+    def _on_scrollbar(self, *args):
+        """Handle scrollbar drags and arrow clicks."""
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.total))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_rows
+            self.scroll_to(self.offset + amount)
+
+    def _on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch."""
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def _on_resize(self, event):
+        """Adapt the number of materialized rows to the widget height."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        heading_height = row_height + 5
+        rows = max((event.height - heading_height) // row_height, 1)
+
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._render()
@@ -0,0 +1,246 @@
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, features
+
+
+class ImageArchive:
+    """
+    Content-addressed archive of raw capture crops.
+
+    Each image is stored once under the SHA-256 of its pixels
+    (directory/ab/abcd....png), so identical frames share a file and capture
+    records only keep the hash. Encoding and writing happen on a background
+    thread; store() only hashes the pixels. When the archive grows past
+    max_bytes, the least recently stored or reused images are deleted
+    (file modification times keep that order across restarts).
+    """
+
+    # Images waiting to be written; store() skips archiving when full
+    MAX_QUEUED = 64
+
+    def __init__(
+        self,
+        directory: str = "capture_images",
+        max_bytes: int = 200 * 1024 * 1024,
+        image_format: str = "png"
+    ):
+        """
+        Initialize the archive and start the writer thread.
+
+        Args:
+            directory: Archive root directory (created if needed)
+            max_bytes: Size limit enforced by LRU eviction
+            image_format: "png" or "webp" (lossless; falls back to PNG if
+                          Pillow was built without WebP)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.extension = "webp" if image_format.lower() == "webp" and features.check("webp") else "png"
+        if image_format.lower() == "webp" and self.extension != "webp":
+            print("Warning: Pillow has no WebP support; archiving images as PNG")
+
+        # hash -> (path, size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.MAX_QUEUED)
+
+        # Measurements
+        self.stored = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.evicted = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._run, name="image-archive", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def hash_image(image: Image.Image) -> str:
+        """Get the content hash of an image (mode, size and pixels)."""
+        digest = hashlib.sha256(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def store(self, image: Image.Image) -> Optional[str]:
+        """
+        Archive an image (asynchronously) and get its hash.
+
+        The image must not be modified afterwards (the pipeline only derives
+        new images from it).
+
+        Returns:
+            Content hash, or None if the writer is too far behind to accept it
+        """
+        digest = self.hash_image(image)
+
+        with self._lock:
+            if digest in self._pending or digest in self._entries:
+                # Already stored (or queued ahead of this touch): only refresh its LRU position
+                self.deduplicated += 1
+                if digest in self._entries:
+                    self._entries.move_to_end(digest)
+                action = ("touch", digest, None)
+            else:
+                action = ("write", digest, image)
+
+            try:
+                self._queue.put_nowait(action)
+            except queue.Full:
+                if action[0] == "write":
+                    self.dropped += 1
+                    return None
+                # A lost touch only makes the LRU order slightly stale
+                return digest
+
+            if action[0] == "write":
+                self._pending.add(digest)
+
+        return digest
+
+    def get_path(self, digest: str) -> Optional[str]:
+        """Get the file of an archived image (None if missing or evicted)."""
+        with self._lock:
+            entry = self._entries.get(digest)
+        if entry is not None:
+            return entry[0]
+
+        # Not indexed yet (startup scan still running) or stored in the other format
+        for extension in ("png", "webp"):
+            path = self._make_path(digest, extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get archive size and counters."""
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._total_bytes,
+                "stored": self.stored,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "evicted": self.evicted,
+                "queued": self._queue.qsize()
+            }
+
+    def stop(self):
+        """Write the queued images and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=10.0)
+
+    def _make_path(self, digest: str, extension: Optional[str] = None) -> str:
+        """Path of an image: two-character fan-out keeps directories small."""
+        return os.path.join(self.directory, digest[:2], f"{digest}.{extension or self.extension}")
+
+    def _run(self):
+        """Index existing images, then write queued ones (writer thread)."""
+        self._scan()
+
+        while True:
+            action = self._queue.get()
+            if action is None:
+                break
+
+            kind, digest, image = action
+            try:
+                if kind == "write":
+                    self._write(digest, image)
+                else:
+                    self._touch(digest)
+            except Exception as e:
+                print(f"Error archiving capture image: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(digest)
+
+            self._evict()
+
+    def _scan(self):
+        """Index the images already in the archive, oldest first."""
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                digest, _, extension = name.partition(".")
+                if extension not in ("png", "webp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, digest, path, stat.st_size))
+
+        found.sort()
+        with self._lock:
+            for _, digest, path, size in found:
+                if digest not in self._entries:
+                    self._entries[digest] = (path, size)
+                    self._total_bytes += size
+
+        self._evict()
+
+    def _write(self, digest: str, image: Image.Image):
+        """Encode and save one image, or reuse the copy already on disk."""
+        existing = self.get_path(digest)
+        if existing is not None:
+            self._touch(digest)
+            with self._lock:
+                self.deduplicated += 1
+            return
+
+        path = self._make_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file and swap it in, so a crash never leaves a truncated image
+        tmp_path = f"{path}.tmp"
+        if self.extension == "webp":
+            image.save(tmp_path, format="WEBP", lossless=True)
+        else:
+            image.save(tmp_path, format="PNG")
+        os.replace(tmp_path, path)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self._entries[digest] = (path, size)
+            self._total_bytes += size
+            self.stored += 1
+
+    def _touch(self, digest: str):
+        """Mark an image as recently used, in memory and on disk."""
+        path = self.get_path(digest)
+        if path is None:
+            return
+
+        os.utime(path)
+        with self._lock:
+            if digest not in self._entries:
+                size = os.path.getsize(path)
+                self._entries[digest] = (path, size)
+                self._total_bytes += size
+            self._entries.move_to_end(digest)
+
+    def _evict(self):
+        """Delete least recently used images until the archive fits max_bytes."""
+        while True:
+            with self._lock:
+                # Always keep the most recent image, even if it alone is too big
+                if self._total_bytes <= self.max_bytes or len(self._entries) <= 1:
+                    return
+                digest, (path, size) = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                self.evicted += 1
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
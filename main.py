@@ -5,59 +5,39 @@ Ntropy - Screen Value Capture Application
 Main entry point for the application.
 """
 
+import argparse
+import importlib.util
 import sys
-import os
-import tkinter as tk
-from tkinter import messagebox
 
-
-def _is_frozen():
-    """Verifica se está rodando como executável PyInstaller."""
-    return getattr(sys, 'frozen', False)
+from startup_profiler import StartupProfiler
 
 
 def check_dependencies():
-    """Check if all required dependencies are installed."""
+    """
+    Check if the required Python packages are installed.
+
+    Packages are only located, not imported, so this stays cheap; the
+    Tesseract binary is probed in the background once the window is shown.
+    """
     missing = []
 
-    try:
-        import PIL
-    except ImportError:
+    if importlib.util.find_spec("PIL") is None:
         missing.append("Pillow")
 
-    try:
-        import pytesseract
-
-        # Se está rodando como executável, configurar Tesseract embutido
-        if _is_frozen():
-            base_path = sys._MEIPASS
-            tesseract_path = os.path.join(base_path, 'tesseract', 'tesseract.exe')
-            if os.path.exists(tesseract_path):
-                pytesseract.pytesseract.tesseract_cmd = tesseract_path
-                tessdata_path = os.path.join(base_path, 'tesseract', 'tessdata')
-                os.environ['TESSDATA_PREFIX'] = tessdata_path
-
-        # Try to get Tesseract version to verify it's installed
-        try:
-            pytesseract.get_tesseract_version()
-        except Exception:
-            if not _is_frozen():
-                missing.append("Tesseract OCR (sistema)")
-            else:
-                missing.append("Tesseract OCR (embutido não encontrado)")
-    except ImportError:
+    if importlib.util.find_spec("pytesseract") is None:
         missing.append("pytesseract")
 
-    try:
-        import pynput
-    except ImportError:
-        missing.append("pynput (opcional - para atalhos)")
+    if importlib.util.find_spec("pynput") is None:
+        print("Aviso: pynput não instalado (opcional - para atalhos)")
 
     return missing
 
 
 def show_dependency_error(missing):
     """Show error dialog for missing dependencies."""
+    import tkinter as tk
+    from tkinter import messagebox
+
     root = tk.Tk()
     root.withdraw()
 
@@ -81,12 +61,44 @@ def show_dependency_error(missing):
 
 def main():
     """Main application entry point."""
+    parser = argparse.ArgumentParser(description="Ntropy - captura de valores de gacha")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="mostrar o tempo de cada import e fase da inicialização"
+    )
+    parser.add_argument(
+        "--record-frames",
+        metavar="PASTA",
+        help="salvar cada quadro capturado nesta pasta, para replay (python daemon.py --source replay:PASTA)"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="capturar sem interface gráfica (demais opções: python daemon.py --help)"
+    )
+    args, daemon_args = parser.parse_known_args()
+
+    # Headless mode never imports Tk
+    if args.headless:
+        if args.record_frames:
+            daemon_args += ["--record", args.record_frames]
+        from daemon import main as daemon_main
+        sys.exit(daemon_main(daemon_args))
+
+    if daemon_args:
+        parser.error(f"argumentos não reconhecidos: {' '.join(daemon_args)}")
+
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    profiler.install_import_hook()
+
     print("=" * 50)
     print("Ntropy - Iniciando...")
     print("=" * 50)
 
     # Check dependencies
-    missing_deps = check_dependencies()
+    with profiler.phase("check_dependencies"):
+        missing_deps = check_dependencies()
 
     if missing_deps:
         print("\n❌ Erro: Dependências faltando!")
@@ -103,13 +115,17 @@ def main():
 
     # Import GUI (after dependency check)
     try:
-        from gui import NtropyGUI
+        with profiler.phase("import_gui"):
+            from gui import NtropyGUI
 
         # Create main window
-        root = tk.Tk()
+        with profiler.phase("create_root"):
+            import tkinter as tk
+            root = tk.Tk()
 
         # Create and run application
-        app = NtropyGUI(root)
+        with profiler.phase("create_gui"):
+            app = NtropyGUI(root, profiler, record_frames=args.record_frames)
 
         print("✓ Aplicação iniciada com sucesso!")
         print("  Pressione F9 para capturar valores")
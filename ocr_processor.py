@@ -1,8 +1,11 @@
 import re
 import sys
 import os
-from PIL import Image
-from typing import Optional
+import time
+from PIL import Image, ImageDraw
+from typing import Callable, Optional
+
+from tracing import span
 
 try:
     import pytesseract
@@ -64,7 +67,8 @@ class OCRProcessor:
             custom_config = r'--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789.,-'
 
             # Extract text
-            text = pytesseract.image_to_string(image, config=custom_config)
+            with span("ocr.tesseract"):
+                text = pytesseract.image_to_string(image, config=custom_config)
 
             if debug:
                 print(f"OCR Raw output: '{text}'")
@@ -156,6 +160,35 @@ class OCRProcessor:
         except Exception as e:
             return False, f"Tesseract not found or not working: {e}"
 
+    def warm_up(self, preprocess: Optional[Callable[[Image.Image], Image.Image]] = None) -> Optional[float]:
+        """
+        Run the OCR pipeline once on a synthetic image so the first real capture is fast.
+
+        Loads Tesseract's traineddata and the PIL resampling paths.
+
+        Args:
+            preprocess: Preprocessing applied to real captures (e.g. ScreenCapture.preprocess_for_ocr)
+
+        Returns:
+            Time taken in seconds, or None if the pipeline failed
+        """
+        start = time.perf_counter()
+
+        try:
+            # Dark digits on a light background, like the in-game currency counters
+            image = Image.new("RGB", (160, 40), "white")
+            ImageDraw.Draw(image).text((10, 12), "12,345", fill="black")
+
+            if preprocess:
+                image = preprocess(image)
+
+            self.extract_number(image)
+        except Exception as e:
+            print(f"Error during OCR warm-up: {e}")
+            return None
+
+        return time.perf_counter() - start
+
     @staticmethod
     def extract_multiple_numbers(image: Image.Image) -> list:
         """
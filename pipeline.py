@@ -0,0 +1,141 @@
+from typing import Any, Callable, Optional, Tuple
+
+from storage import Storage
+from tracing import traced
+
+
+class CaptureError(Exception):
+    """A capture could not be completed; the message is meant for the user."""
+
+
+class CapturePipeline:
+    """
+    Screen capture → OCR → Storage pipeline for one game.
+
+    Shared by the GUI (which routes Storage calls through its worker thread)
+    and the headless daemon; it never touches Tk.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        screen_capture,
+        ocr,
+        storage_call: Optional[Callable[..., Any]] = None,
+        debug: bool = False,
+        archive=None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            storage: Storage instance receiving the captures
+            screen_capture: ScreenCapture instance or a frame source (frame_source.py)
+            ocr: OCRProcessor instance
+            storage_call: Runs a Storage method, e.g. StorageWorker.call
+                          (default: call it directly)
+            debug: Print the raw OCR output and the calculation
+            archive: ImageArchive keeping the raw crops (None: not kept)
+        """
+        self.storage = storage
+        self.screen_capture = screen_capture
+        self.ocr = ocr
+        self.storage_call = storage_call or (lambda func, *args, **kwargs: func(*args, **kwargs))
+        self.debug = debug
+        self.archive = archive
+
+    @traced("pipeline.capture")
+    def capture(self, game_id: int) -> dict:
+        """
+        Capture both regions of a game, compute the total and save it.
+
+        Args:
+            game_id: Game identifier (1-4)
+
+        Returns:
+            Dictionary with {capture_id, game_id, value, value_converted, value_integer, images}
+            (images: archive hashes of the raw crops, empty without an archive)
+
+        Raises:
+            CaptureError: If the regions are not configured or cannot be captured
+        """
+        # Get region coordinates for the game
+        game_config = self.storage_call(self.storage.get_game_config, game_id)
+        region_converted = game_config.get("region_converted") if game_config else None
+        region_integer = game_config.get("region_integer") if game_config else None
+
+        if not region_converted or not region_integer:
+            raise CaptureError("Regiões não configuradas. Configure ambas as regiões.")
+
+        # Get conversion ratio
+        ratio = self.storage_call(self.storage.get_conversion_ratio)
+
+        # === CAPTURE CONVERTED VALUES ===
+        value_converted, image_converted = self.read_region(region_converted, "Falha ao capturar valores convertidos")
+
+        # === CAPTURE INTEGER VALUES ===
+        value_integer, image_integer = self.read_region(region_integer, "Falha ao capturar valores inteiros")
+
+        # === CALCULATE TOTAL ===
+        # Formula: Total = Converted + (Integer / 160)
+        total_value = value_converted + (value_integer / ratio)
+
+        if self.debug:
+            print(f"Convertidos: {value_converted}")
+            print(f"Inteiros: {value_integer}")
+            print(f"Cálculo: {value_converted} + ({value_integer} / {ratio}) = {total_value}")
+
+        images = {}
+        if image_converted:
+            images["converted"] = image_converted
+        if image_integer:
+            images["integer"] = image_integer
+
+        # Save to storage with game_id
+        capture_id = self.storage_call(
+            self.storage.save_capture,
+            total_value,
+            game_id=game_id,
+            images=images or None
+        )
+
+        return {
+            "capture_id": capture_id,
+            "game_id": game_id,
+            "value": total_value,
+            "value_converted": value_converted,
+            "value_integer": value_integer,
+            "images": images
+        }
+
+    @traced("pipeline.read_region")
+    def read_region(self, region: dict, error_message: str) -> Tuple[float, Optional[str]]:
+        """
+        Capture a screen region and read its number.
+
+        Args:
+            region: Region as stored in the game config {x, y, width, height}
+            error_message: CaptureError message if the screen cannot be read
+
+        Returns:
+            Tuple of (number read, 0 if OCR could not read one;
+            archive hash of the raw crop, or None)
+        """
+        image = self.screen_capture.capture_region(
+            region["x"],
+            region["y"],
+            region["width"],
+            region["height"]
+        )
+
+        if image is None:
+            raise CaptureError(error_message)
+
+        # Hash now, encode and write in the archive's thread
+        image_hash = self.archive.store(image) if self.archive else None
+
+        image = self.screen_capture.preprocess_for_ocr(image)
+        value = self.ocr.extract_number(image, debug=self.debug)
+
+        # Se não conseguir ler, assume 0
+        return (value if value is not None else 0), image_hash
@@ -0,0 +1,139 @@
+"""
+Pull Allocation Optimizer
+
+Splits the available pulls of a game between its objectives so that the
+expected number of objectives met (or a weighted utility) is maximized.
+"""
+
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from gacha_probability import GachaProbabilityCalculator, get_calculator
+
+
+class PullAllocationOptimizer:
+    """Dynamic programming optimizer over the precomputed probability table."""
+
+    def __init__(self, calculator: Optional[GachaProbabilityCalculator] = None):
+        """
+        Initialize the optimizer.
+
+        Args:
+            calculator: Calculator providing the probability table (singleton by default)
+        """
+        if np is None:
+            raise ImportError(
+                "numpy is not installed. "
+                "Please install it with: pip install numpy"
+            )
+
+        self.calculator = calculator or get_calculator()
+
+    def optimize(
+        self,
+        objectives: List[dict],
+        available_pulls: float,
+        weights: Optional[List[float]] = None
+    ) -> dict:
+        """
+        Find the split of pulls that maximizes the (weighted) expected objectives met.
+
+        Each objective is treated as its own banner, starting from its own
+        current_pity/guaranteed state.
+
+        Args:
+            objectives: Objectives as returned by Storage.get_objectives
+            available_pulls: Current pull balance of the game
+            weights: Optional utility per objective (defaults to the objective's
+                     "weight" field, or 1.0 = expected number of objectives met)
+
+        Returns:
+            Dictionary with {allocations, expected_met, utility, unallocated}, where
+            allocations is a list of {objective, pulls, probability} in input order
+        """
+        total_pulls = max(int(available_pulls), 0)
+
+        if weights is None:
+            weights = [float(obj.get("weight", 1.0)) for obj in objectives]
+
+        table = self.calculator.get_probability_table(total_pulls)
+
+        # best[p] = best utility of the objectives processed so far using at most p pulls
+        best = np.zeros(total_pulls + 1)
+        choices = []
+        curves = []
+
+        for obj, weight in zip(objectives, weights):
+            pity = min(max(int(obj.get("current_pity", 0)), 0), self.calculator.HARD_PITY - 1)
+            curve = table[int(bool(obj.get("guaranteed", False))), pity]
+
+            # Pulls beyond the point where the curve saturates are never useful
+            useful = int(np.argmax(curve >= curve[-1])) + 1
+            curve = curve[:useful]
+            curves.append(curve)
+
+            # candidates[p, a] = best[p - a] + weight * curve[a] (max-plus convolution)
+            p_index = np.arange(total_pulls + 1)[:, None]
+            a_index = np.arange(useful)[None, :]
+            previous = p_index - a_index
+
+            candidates = np.where(
+                previous >= 0,
+                best[np.maximum(previous, 0)] + weight * curve[None, :],
+                -np.inf
+            )
+
+            choice = np.argmax(candidates, axis=1)
+            best = candidates[np.arange(total_pulls + 1), choice]
+            choices.append(choice)
+
+        # Walk the choices backwards to recover each objective's share
+        pulls_left = total_pulls
+        shares = [0] * len(objectives)
+        for index in range(len(objectives) - 1, -1, -1):
+            shares[index] = int(choices[index][pulls_left])
+            pulls_left -= shares[index]
+
+        allocations = []
+        expected_met = 0.0
+        utility = 0.0
+        for obj, weight, curve, pulls in zip(objectives, weights, curves, shares):
+            probability = float(curve[pulls])
+            expected_met += probability
+            utility += weight * probability
+            allocations.append({
+                "objective": obj,
+                "pulls": pulls,
+                "probability": probability
+            })
+
+        return {
+            "allocations": allocations,
+            "expected_met": expected_met,
+            "utility": utility,
+            "unallocated": total_pulls - sum(shares)
+        }
+
+    def optimize_game(self, storage, game_id: int, available_pulls: Optional[float] = None) -> dict:
+        """
+        Optimize the pending objectives of a game using its last captured pull balance.
+
+        Args:
+            storage: Storage instance
+            game_id: Game identifier (1-4)
+            available_pulls: Pull balance to split (defaults to the last capture)
+
+        Returns:
+            Same dictionary as optimize()
+        """
+        objectives = [obj for obj in storage.get_objectives(game_id) if not obj.get("completed", False)]
+
+        if available_pulls is None:
+            last_capture = storage.get_last_capture(game_id=game_id)
+            available_pulls = last_capture.get("value", 0) if last_capture else 0
+
+        return self.optimize(objectives, available_pulls)
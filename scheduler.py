@@ -0,0 +1,156 @@
+import time
+from typing import Callable, Dict, Optional
+
+
+class _PollingTask:
+    """State of a periodic task managed by PollingScheduler."""
+
+    def __init__(self, name: str, callback: Callable[[], bool], min_interval: int, max_interval: int, backoff: float):
+        self.name = name
+        self.callback = callback
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+
+        self.interval = min_interval
+        self.after_id = None
+
+        # Measurements
+        self.runs = 0
+        self.time_spent = 0.0
+
+
+class PollingScheduler:
+    """
+    Adaptive scheduler for the GUI's periodic background tasks.
+
+    Each task reports whether anything changed. While results stay the same
+    the interval grows exponentially up to a maximum; any change, window
+    focus or hotkey activity (wake) snaps it back to the fastest rate. All
+    tasks pause while the window is iconified.
+    """
+
+    def __init__(self, root):
+        """
+        Initialize the scheduler.
+
+        Args:
+            root: Tk root window used for timers and window state events
+        """
+        self.root = root
+        self.tasks: Dict[str, _PollingTask] = {}
+        self._paused = False
+
+        self.root.bind("<Unmap>", self._on_unmap, add="+")
+        self.root.bind("<Map>", self._on_map, add="+")
+        self.root.bind("<FocusIn>", lambda event: self.wake(), add="+")
+
+    def add_task(
+        self,
+        name: str,
+        callback: Callable[[], bool],
+        min_interval: int,
+        max_interval: Optional[int] = None,
+        backoff: float = 2.0
+    ):
+        """
+        Register and start a periodic task.
+
+        Args:
+            name: Unique task name (used in stats)
+            callback: Function run on the Tk thread; returns True if state changed
+            min_interval: Fastest interval in milliseconds
+            max_interval: Slowest interval in milliseconds (defaults to min_interval)
+            backoff: Interval multiplier applied after each run without changes
+        """
+        task = _PollingTask(name, callback, min_interval, max_interval or min_interval, backoff)
+        self.tasks[name] = task
+        self._schedule(task, 0)
+
+    def wake(self):
+        """Return every backed-off task to its fastest interval and run it now."""
+        if self._paused:
+            return
+
+        for task in self.tasks.values():
+            if task.interval > task.min_interval:
+                task.interval = task.min_interval
+                self._schedule(task, 0)
+
+    def pause(self):
+        """Stop running tasks until resume() is called."""
+        self._paused = True
+        for task in self.tasks.values():
+            if task.after_id is not None:
+                self.root.after_cancel(task.after_id)
+                task.after_id = None
+
+    def resume(self):
+        """Restart all tasks at their fastest interval."""
+        if not self._paused:
+            return
+
+        self._paused = False
+        for task in self.tasks.values():
+            task.interval = task.min_interval
+            self._schedule(task, 0)
+
+    def is_paused(self) -> bool:
+        """Check if the scheduler is paused."""
+        return self._paused
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        Get per-task measurements.
+
+        Returns:
+            Dictionary mapping task name to {runs, time_spent, average_ms, interval}
+            (time_spent in seconds, interval in milliseconds)
+        """
+        return {
+            name: {
+                "runs": task.runs,
+                "time_spent": task.time_spent,
+                "average_ms": (task.time_spent / task.runs * 1000) if task.runs else 0.0,
+                "interval": task.interval
+            }
+            for name, task in self.tasks.items()
+        }
+
+    def _schedule(self, task: _PollingTask, delay: int):
+        """(Re)arm a task's timer."""
+        if task.after_id is not None:
+            self.root.after_cancel(task.after_id)
+        task.after_id = self.root.after(delay, lambda: self._run(task))
+
+    def _run(self, task: _PollingTask):
+        """Run a task and schedule its next run according to the result."""
+        task.after_id = None
+        if self._paused:
+            return
+
+        start = time.perf_counter()
+        try:
+            changed = task.callback()
+        except Exception as e:
+            print(f"Error in task '{task.name}': {e}")
+            changed = False
+        task.runs += 1
+        task.time_spent += time.perf_counter() - start
+
+        if changed:
+            task.interval = task.min_interval
+        else:
+            task.interval = min(int(task.interval * task.backoff), task.max_interval)
+
+        self._schedule(task, task.interval)
+
+    def _on_unmap(self, event):
+        """Pause when the main window is iconified."""
+        if event.widget is self.root and self.root.state() == "iconic":
+            self.pause()
+
+    def _on_map(self, event):
+        """Resume when the main window is restored."""
+        if event.widget is self.root:
+            self.resume()
@@ -0,0 +1,111 @@
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """
+    Records how long each startup phase and module import takes.
+
+    Disabled profilers accept the same calls and do nothing, so callers do
+    not need to check whether profiling was requested (--profile-startup).
+    """
+
+    # Slowest imports listed in the report
+    TOP_IMPORTS = 15
+
+    def __init__(self, enabled: bool = False):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled: Record and report timings
+        """
+        self.enabled = enabled
+        self.start = time.perf_counter()
+
+        # (phase, thread name, start offset, duration) in seconds
+        self.phases: List[Tuple[str, str, float, float]] = []
+
+        # module name -> cumulative import time (includes its own imports)
+        self.imports: Dict[str, float] = {}
+
+        self._original_import = None
+        self._lock = threading.Lock()
+
+    def install_import_hook(self):
+        """Time every module imported from now on (until report())."""
+        if not self.enabled or self._original_import is not None:
+            return
+
+        original_import = builtins.__import__
+        self._original_import = original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level != 0 or name in sys.modules:
+                return original_import(name, globals, locals, fromlist, level)
+
+            started = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                with self._lock:
+                    self.imports.setdefault(name, time.perf_counter() - started)
+
+        builtins.__import__ = timed_import
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of startup work."""
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append((
+                    name,
+                    threading.current_thread().name,
+                    started - self.start,
+                    time.perf_counter() - started
+                ))
+
+    def mark(self, name: str):
+        """Record an instant (e.g. first frame shown)."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.phases.append((name, threading.current_thread().name, time.perf_counter() - self.start, 0.0))
+
+    def report(self):
+        """Print the phase and import breakdown and remove the import hook."""
+        if not self.enabled:
+            return
+
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase[2])
+            imports = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+
+        print("=" * 50)
+        print("Perfil de inicialização")
+        print("=" * 50)
+        print(f"{'Fase':<32} {'Thread':<14} {'Início':>9} {'Duração':>9}")
+        for name, thread, offset, duration in phases:
+            duration_text = f"{duration*1000:7.1f}ms" if duration else "        -"
+            print(f"{name:<32} {thread[:14]:<14} {offset*1000:7.1f}ms {duration_text}")
+
+        print(f"\nImports mais lentos (tempo acumulado, {len(imports)} módulos):")
+        for name, duration in imports[:self.TOP_IMPORTS]:
+            print(f"  {name:<40} {duration*1000:7.1f}ms")
+        print("=" * 50)
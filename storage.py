@@ -1,7 +1,55 @@
+import functools
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+
+from tracing import span, traced
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _lock_file(f):
+    """Block until this process holds the advisory lock of an open file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+
+    f.seek(0)
+    while True:
+        try:
+            # LK_LOCK gives up after 10 one-second retries
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            pass
+
+
+def _unlock_file(f):
+    """Release the advisory lock taken by _lock_file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _exclusive(method: Callable) -> Callable:
+    """Decorator running a Storage method under its inter-process file lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._file_lock():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class Storage:
     """Handles all data persistence for the Ntropy application."""
@@ -9,8 +57,26 @@ class Storage:
     def __init__(self, data_file="data.json", config_file="config.json"):
         self.data_file = data_file
         self.config_file = config_file
+
+        # Last snapshot() result and the file signatures it was built from
+        self._snapshot_cache = None
+
+        # Captures sorted most recent first, with the data file signature they came from
+        self._sorted_captures_cache = None
+
+        # Change notification callbacks: callback(event, payload)
+        self._listeners: List[Callable[[str, dict], None]] = []
+
+        # Advisory lock serializing read-modify-write updates across processes
+        # (the GUI and the capture daemon share the same files); reentrant
+        self.lock_file = f"{data_file}.lock"
+        self._thread_lock = threading.RLock()
+        self._lock_handle = None
+        self._lock_depth = 0
+
         self._ensure_files_exist()
 
+    @_exclusive
     def _ensure_files_exist(self):
         """Create data and config files if they don't exist."""
         if not os.path.exists(self.data_file):
@@ -31,6 +97,7 @@ class Storage:
             # Migrate old format if needed
             self.migrate_old_data()
 
+    @traced("storage.read_json")
     def _read_json(self, file_path: str) -> dict:
         """Read and parse JSON file."""
         try:
@@ -39,10 +106,99 @@ class Storage:
         except (json.JSONDecodeError, FileNotFoundError):
             return {}
 
+    @traced("storage.write_json")
     def _write_json(self, file_path: str, data: dict):
         """Write data to JSON file."""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._snapshot_cache = None
+        self._sorted_captures_cache = None
+        # Write to a temp file and swap it in, so readers never see a partial file;
+        # the name is unique so concurrent writers never replace each other's temp file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(file_path)),
+            prefix=f"{os.path.basename(file_path)}.",
+            suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Hold the advisory lock on lock_file.
+
+        Every read-modify-write of the data or config file runs under it, so
+        an update made by another process (e.g. the daemon next to the GUI)
+        is never lost. Nested use in the same process is allowed.
+        """
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                handle = open(self.lock_file, 'a+b')
+                try:
+                    _lock_file(handle)
+                except BaseException:
+                    handle.close()
+                    raise
+                self._lock_handle = handle
+            self._lock_depth += 1
+
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    handle, self._lock_handle = self._lock_handle, None
+                    try:
+                        _unlock_file(handle)
+                    finally:
+                        handle.close()
+
+    def _file_signature(self, file_path: str) -> Optional[tuple]:
+        """Get (mtime_ns, size) of a file, used to detect external changes."""
+        try:
+            stat = os.stat(file_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def get_signature(self) -> tuple:
+        """
+        Get a cheap fingerprint of the data and config files (stat only, no read).
+
+        Changes whenever either file is rewritten, including by another process.
+        """
+        return self._file_signature(self.data_file), self._file_signature(self.config_file)
+
+    # Change notifications
+
+    def add_listener(self, callback: Callable[[str, dict], None]):
+        """
+        Register a callback for capture history changes.
+
+        The callback is called as callback(event, payload) from the thread that
+        made the change, with one of:
+            "capture_saved": {"capture": capture}
+            "capture_deleted": {"capture_id": id}
+            "history_cleared": {}
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, dict], None]):
+        """Unregister a change callback."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event: str, payload: dict):
+        """Call every registered listener, isolating their errors."""
+        for callback in list(self._listeners):
+            try:
+                callback(event, payload)
+            except Exception as e:
+                print(f"Storage listener error: {e}")
 
     # Configuration methods
 
@@ -55,6 +211,7 @@ class Storage:
         config = self.get_config()
         return config.get("region")
 
+    @_exclusive
     def save_region(self, x: int, y: int, width: int, height: int):
         """Save screen region coordinates."""
         config = self.get_config()
@@ -76,6 +233,72 @@ class Storage:
         config = self.get_config()
         return config.get("always_on_top", True)
 
+    def get_api_config(self) -> dict:
+        """
+        Get the local HTTP API settings.
+
+        Returns:
+            Dictionary with {enabled, port} (disabled by default)
+        """
+        config = self.get_config()
+        api = config.get("api", {})
+        return {
+            "enabled": api.get("enabled", False),
+            "port": api.get("port", 8765)
+        }
+
+    def get_event_feed_config(self) -> dict:
+        """
+        Get the capture event feed settings.
+
+        Returns:
+            Dictionary with {enabled, socket_path} (enabled by default where
+            Unix sockets are available)
+        """
+        config = self.get_config()
+        feed = config.get("event_feed", {})
+        return {
+            "enabled": feed.get("enabled", True),
+            "socket_path": feed.get("socket_path", "ntropy-events.sock")
+        }
+
+    def get_image_archive_config(self) -> dict:
+        """
+        Get the raw capture image archive settings.
+
+        Returns:
+            Dictionary with {enabled, directory, max_mb, format} (disabled by default)
+        """
+        config = self.get_config()
+        archive = config.get("image_archive", {})
+        return {
+            "enabled": archive.get("enabled", False),
+            "directory": archive.get("directory", "capture_images"),
+            "max_mb": archive.get("max_mb", 200),
+            "format": archive.get("format", "png")
+        }
+
+    def get_daemon_config(self) -> dict:
+        """
+        Get the headless daemon settings.
+
+        Returns:
+            Dictionary with {schedule, require_active}, where schedule is a
+            list of {game_id, interval_minutes}
+        """
+        config = self.get_config()
+        daemon = config.get("daemon", {})
+        return {
+            "schedule": daemon.get("schedule", []),
+            "require_active": daemon.get("require_active", True)
+        }
+
+    def get_ocr_warm_up(self) -> bool:
+        """Get whether the OCR engine is warmed up at launch."""
+        config = self.get_config()
+        return config.get("ocr_warm_up", True)
+
+    @_exclusive
     def update_config(self, **kwargs):
         """Update configuration with provided key-value pairs."""
         config = self.get_config()
@@ -94,6 +317,7 @@ class Storage:
         games = self.get_all_games()
         return games.get(str(game_id))
 
+    @_exclusive
     def save_game_region(self, game_id: int, x: int, y: int, width: int, height: int):
         """Save screen region coordinates for a specific game."""
         config = self.get_config()
@@ -110,6 +334,7 @@ class Storage:
         }
         self._write_json(self.config_file, config)
 
+    @_exclusive
     def update_game(self, game_id: int, **kwargs):
         """Update game configuration with provided key-value pairs."""
         config = self.get_config()
@@ -121,6 +346,7 @@ class Storage:
         config["games"][str(game_id)].update(kwargs)
         self._write_json(self.config_file, config)
 
+    @_exclusive
     def save_game_region_converted(self, game_id: int, x: int, y: int, width: int, height: int):
         """Save region coordinates for converted values."""
         config = self.get_config()
@@ -135,6 +361,7 @@ class Storage:
         }
         self._write_json(self.config_file, config)
 
+    @_exclusive
     def save_game_region_integer(self, game_id: int, x: int, y: int, width: int, height: int):
         """Save region coordinates for integer values."""
         config = self.get_config()
@@ -154,6 +381,7 @@ class Storage:
         config = self.get_config()
         return config.get("conversion_ratio", 160)
 
+    @_exclusive
     def migrate_old_data(self):
         """Migrate old single-game format to new multi-game format."""
         try:
@@ -196,25 +424,32 @@ class Storage:
 
     # Data capture methods
 
-    def save_capture(self, value: float, game_id: int, notes: str = "") -> int:
-        """Save a new captured value and return its ID."""
-        data = self._read_json(self.data_file)
-        captures = data.get("captures", [])
-
-        # Generate new ID
-        new_id = max([c.get("id", 0) for c in captures], default=0) + 1
+    @traced("storage.save_capture")
+    def save_capture(self, value: float, game_id: int, notes: str = "", images: Optional[Dict[str, str]] = None) -> int:
+        """Save a new captured value and return its ID (images: archive hashes of the raw crops)."""
+        with self._file_lock():
+            data = self._read_json(self.data_file)
+            captures = data.get("captures", [])
+
+            # Generate new ID
+            new_id = max([c.get("id", 0) for c in captures], default=0) + 1
+
+            capture = {
+                "id": new_id,
+                "value": value,
+                "game_id": game_id,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "notes": notes
+            }
+            if images:
+                capture["images"] = images
 
-        capture = {
-            "id": new_id,
-            "value": value,
-            "game_id": game_id,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "notes": notes
-        }
+            captures.append(capture)
+            data["captures"] = captures
+            self._write_json(self.data_file, data)
 
-        captures.append(capture)
-        data["captures"] = captures
-        self._write_json(self.data_file, data)
+        with span("storage.notify"):
+            self._notify("capture_saved", {"capture": capture})
 
         return new_id
 
@@ -227,8 +462,8 @@ class Storage:
         if game_id is not None:
             captures = [c for c in captures if c.get("game_id") == game_id]
 
-        # Sort by timestamp (most recent first)
-        captures.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        # Sort by timestamp (most recent first, newest ID first within the same second)
+        captures.sort(key=lambda x: (x.get("timestamp", ""), x.get("id", 0)), reverse=True)
 
         if limit:
             return captures[:limit]
@@ -269,24 +504,155 @@ class Storage:
             all_stats[game_id] = self.get_stats(game_id=game_id)
         return all_stats
 
+    def snapshot(self, limit: Optional[int] = 100) -> dict:
+        """
+        Build the read model used by GUI refreshes in a single pass.
+
+        Reads the data and config files once and derives everything a refresh
+        needs. The result is cached until either file changes, so repeated
+        refreshes without changes do no file reads. Treat it as read-only.
+
+        Args:
+            limit: Number of recent rows to include (None for all, 0 for none)
+
+        Returns:
+            Dictionary with:
+                history: Most recent captures, each with an extra "game_name" key
+                stats: {game_id: stats} for games 1-4 (same format as get_stats)
+                last_captures: {game_id: last capture or None} for games 1-4
+                count: Total number of captures
+        """
+        key = (self._file_signature(self.data_file), self._file_signature(self.config_file), limit)
+        if self._snapshot_cache is not None and self._snapshot_cache[0] == key:
+            return self._snapshot_cache[1]
+
+        captures = self._get_sorted_captures()
+        games = self._read_json(self.config_file).get("games", {})
+
+        def game_name(game_id):
+            game_config = games.get(str(game_id))
+            return game_config.get("name", f"Jogo {game_id}") if game_config else f"Jogo {game_id}"
+
+        values = {game_id: [] for game_id in range(1, 5)}
+        last_captures = {game_id: None for game_id in range(1, 5)}
+        for capture in captures:
+            game_id = capture.get("game_id")
+            if game_id in values:
+                values[game_id].append(capture.get("value", 0))
+                if last_captures[game_id] is None:
+                    last_captures[game_id] = capture
+
+        stats = {}
+        for game_id, game_values in values.items():
+            if game_values:
+                stats[game_id] = {
+                    "total": sum(game_values),
+                    "count": len(game_values),
+                    "average": sum(game_values) / len(game_values),
+                    "min": min(game_values),
+                    "max": max(game_values)
+                }
+            else:
+                stats[game_id] = {"total": 0, "count": 0, "average": 0, "min": 0, "max": 0}
+
+        recent = captures[:limit] if limit is not None else captures
+        history = [dict(capture, game_name=game_name(capture.get("game_id", 1))) for capture in recent]
+
+        result = {
+            "history": history,
+            "stats": stats,
+            "last_captures": last_captures,
+            "count": len(captures)
+        }
+
+        self._snapshot_cache = (key, result)
+        return result
+
+    def _get_sorted_captures(self) -> List[dict]:
+        """Get all captures sorted most recent first, re-reading only when the file changed."""
+        signature = self._file_signature(self.data_file)
+        if self._sorted_captures_cache is not None and self._sorted_captures_cache[0] == signature:
+            return self._sorted_captures_cache[1]
+
+        captures = self._read_json(self.data_file).get("captures", [])
+
+        # Sort by timestamp (most recent first), as load_history does
+        captures.sort(key=lambda x: (x.get("timestamp", ""), x.get("id", 0)), reverse=True)
+
+        self._sorted_captures_cache = (signature, captures)
+        return captures
+
+    def count_captures(self) -> int:
+        """Get the total number of captures."""
+        return len(self._get_sorted_captures())
+
+    def load_history_page(self, offset: int, limit: int) -> List[dict]:
+        """
+        Load one page of the capture history (most recent first).
+
+        Args:
+            offset: Number of most recent captures to skip
+            limit: Maximum number of captures to return
+
+        Returns:
+            List of capture dicts (treat as read-only)
+        """
+        return self._get_sorted_captures()[max(offset, 0):max(offset, 0) + limit]
+
+    def find_capture_offset(self, timestamp: str) -> int:
+        """
+        Find the history position of the first capture at or before a timestamp.
+
+        Args:
+            timestamp: "YYYY-MM-DD HH:MM:SS" (or a prefix such as "YYYY-MM-DD")
+
+        Returns:
+            Offset usable with load_history_page (count_captures() if none)
+        """
+        captures = self._get_sorted_captures()
+
+        # Binary search over the descending timestamps
+        low, high = 0, len(captures)
+        while low < high:
+            mid = (low + high) // 2
+            if captures[mid].get("timestamp", "") > timestamp:
+                low = mid + 1
+            else:
+                high = mid
+
+        return low
+
+    def get_capture(self, capture_id: int) -> Optional[dict]:
+        """Get a capture by ID."""
+        data = self._read_json(self.data_file)
+        for capture in data.get("captures", []):
+            if capture.get("id") == capture_id:
+                return capture
+        return None
+
     def delete_capture(self, capture_id: int) -> bool:
         """Delete a capture by ID. Returns True if deleted."""
-        data = self._read_json(self.data_file)
-        captures = data.get("captures", [])
+        with self._file_lock():
+            data = self._read_json(self.data_file)
+            captures = data.get("captures", [])
+
+            original_count = len(captures)
+            captures = [c for c in captures if c.get("id") != capture_id]
 
-        original_count = len(captures)
-        captures = [c for c in captures if c.get("id") != capture_id]
+            if len(captures) == original_count:
+                return False
 
-        if len(captures) < original_count:
             data["captures"] = captures
             self._write_json(self.data_file, data)
-            return True
 
-        return False
+        self._notify("capture_deleted", {"capture_id": capture_id})
+        return True
 
     def clear_history(self):
         """Delete all captured data."""
-        self._write_json(self.data_file, {"captures": []})
+        with self._file_lock():
+            self._write_json(self.data_file, {"captures": []})
+        self._notify("history_cleared", {})
 
     def export_to_csv(self, output_file: str):
         """Export capture history to CSV file."""
@@ -295,12 +661,13 @@ class Storage:
         captures = self.load_history()
 
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=["id", "game_id", "value", "timestamp", "notes"])
+            writer = csv.DictWriter(f, fieldnames=["id", "game_id", "value", "timestamp", "notes"], extrasaction="ignore")
             writer.writeheader()
             writer.writerows(captures)
 
     # Objective management methods
 
+    @_exclusive
     def add_objective(
         self,
         game_id: int,
@@ -351,6 +718,7 @@ class Storage:
 
         return new_id
 
+    @_exclusive
     def remove_objective(self, game_id: int, objective_id: str) -> bool:
         """Remove an objective from a specific game. Returns True if removed."""
         config = self.get_config()
@@ -393,6 +761,7 @@ class Storage:
 
         return all_objectives
 
+    @_exclusive
     def update_objective(self, game_id: int, objective_id: str, **kwargs) -> bool:
         """Update an objective with provided key-value pairs. Returns True if updated."""
         config = self.get_config()
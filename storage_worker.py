@@ -0,0 +1,125 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from storage import Storage
+from tracing import span
+
+
+class StorageWorker:
+    """
+    Dedicated thread that owns all Storage file I/O.
+
+    GUI code submits requests through a queue and receives results on the Tk
+    thread via root.after callbacks (or waits on the returned Future from
+    other threads). Requests run one at a time, in submission order, so reads
+    and read-modify-write updates never interleave.
+    """
+
+    def __init__(self, storage: Storage, root=None):
+        """
+        Start the worker.
+
+        Args:
+            storage: Storage instance owned by the worker from now on
+            root: Tk root used to deliver callbacks on the main thread
+                  (None: callbacks run on the worker thread)
+        """
+        self.storage = storage
+        self.root = root
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="storage-worker", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        callback: Optional[Callable[[Any], None]] = None,
+        error_callback: Optional[Callable[[Exception], None]] = None,
+        **kwargs
+    ) -> Future:
+        """
+        Queue a Storage call.
+
+        Args:
+            func: Storage method (e.g. storage.snapshot) or any callable doing I/O
+            *args, **kwargs: Arguments for func
+            callback: Called on the Tk thread with the result
+            error_callback: Called on the Tk thread with the exception (printed if omitted)
+
+        Returns:
+            Future with the result
+        """
+        future = Future()
+
+        if threading.current_thread() is self._thread:
+            # Nested request from a job or listener: run inline to avoid deadlock
+            self._execute(future, func, args, kwargs)
+        else:
+            self._queue.put((future, func, args, kwargs))
+
+        if callback or error_callback:
+            future.add_done_callback(lambda f: self._deliver(f, callback, error_callback))
+
+        return future
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a Storage call on the worker and wait for its result.
+
+        Must not be used from the Tk thread (use submit with a callback there).
+        """
+        # Includes the time spent queued behind other requests
+        with span("storage_worker.call", func=getattr(func, "__name__", "?")):
+            return self.submit(func, *args, **kwargs).result()
+
+    def stop(self):
+        """Finish pending requests and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=2.0)
+
+    def _run(self):
+        """Process requests in order (runs in worker thread)."""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            future, func, args, kwargs = request
+            self._execute(future, func, args, kwargs)
+
+    def _execute(self, future: Future, func: Callable, args: tuple, kwargs: dict):
+        """Run one request and resolve its future."""
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _deliver(self, future: Future, callback, error_callback):
+        """Hand a finished request to the Tk thread."""
+        error = future.exception()
+
+        if error is not None:
+            handler = error_callback or (lambda e: print(f"Storage error: {e}"))
+            args = (error,)
+        elif callback:
+            handler = callback
+            args = (future.result(),)
+        else:
+            return
+
+        if self.root is None:
+            handler(*args)
+            return
+
+        try:
+            self.root.after(0, lambda: handler(*args))
+        except Exception:
+            # Tk already shut down (TclError/RuntimeError)
+            pass
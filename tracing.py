@@ -0,0 +1,174 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+
+class Tracer:
+    """
+    Lightweight span recorder for the capture pipeline.
+
+    Each finished span (name, start, duration, thread) goes into a fixed-size
+    ring buffer, so tracing can stay on all the time: recording costs two
+    clock reads and a deque append, and old spans fall off the end. The
+    buffer can be summarized as per-stage percentiles or exported as Chrome
+    trace-event JSON (chrome://tracing, Perfetto).
+    """
+
+    # Spans kept in the ring buffer
+    CAPACITY = 5000
+
+    def __init__(self, capacity: int = CAPACITY, enabled: bool = True):
+        """
+        Initialize the tracer.
+
+        Args:
+            capacity: Number of spans kept (oldest are discarded)
+            enabled: Record spans (span() is a no-op otherwise)
+        """
+        self.enabled = enabled
+        self._spans = deque(maxlen=capacity)
+        self._thread_names: Dict[int, str] = {}
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """
+        Record the duration of a block.
+
+        Args:
+            name: Stage name, e.g. "ocr.tesseract"
+            **args: Extra values shown in the exported trace (e.g. game_id)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            thread = threading.current_thread()
+            self._thread_names[thread.ident] = thread.name
+            # deque.append is atomic; no lock needed on the hot path
+            self._spans.append((name, start, end - start, thread.ident, args))
+
+    def traced(self, name: str) -> Callable:
+        """Decorator recording every call of a function as a span."""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def clear(self):
+        """Discard all recorded spans."""
+        self._spans.clear()
+
+    def get_spans(self) -> List[tuple]:
+        """Get a copy of the recorded spans as (name, start_ns, duration_ns, thread_id, args)."""
+        return list(self._spans)
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        Summarize the recorded spans per stage.
+
+        Returns:
+            Dictionary of stage name -> {count, total_ms, p50, p95, p99, max}
+            (durations in milliseconds), sorted by stage name
+        """
+        durations: Dict[str, List[int]] = {}
+        for name, _, duration, _, _ in self.get_spans():
+            durations.setdefault(name, []).append(duration)
+
+        stats = {}
+        for name in sorted(durations):
+            samples = sorted(durations[name])
+
+            def at(fraction: float) -> float:
+                return samples[min(int(fraction * len(samples)), len(samples) - 1)] / 1e6
+
+            stats[name] = {
+                "count": len(samples),
+                "total_ms": sum(samples) / 1e6,
+                "p50": at(0.5),
+                "p95": at(0.95),
+                "p99": at(0.99),
+                "max": samples[-1] / 1e6
+            }
+
+        return stats
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Convert the recorded spans to the Chrome trace-event format.
+
+        Returns:
+            Dictionary with "traceEvents" (complete "X" events in microseconds
+            plus thread name metadata)
+        """
+        pid = os.getpid()
+        spans = self.get_spans()
+
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": thread_name}
+            }
+            for thread_id, thread_name in list(self._thread_names.items())
+        ]
+
+        for name, start, duration, thread_id, args in spans:
+            event = {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": thread_id
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, file_path: str) -> int:
+        """
+        Write the recorded spans as Chrome trace-event JSON.
+
+        Args:
+            file_path: Output file
+
+        Returns:
+            Number of spans written
+        """
+        trace = self.to_chrome_trace()
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, default=str)
+
+        return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
+
+
+# Process-wide tracer used by the instrumented modules
+tracer = Tracer()
+
+
+def span(name: str, **args):
+    """Record the duration of a block on the process-wide tracer."""
+    return tracer.span(name, **args)
+
+
+def traced(name: str) -> Callable:
+    """Decorator recording every call of a function on the process-wide tracer."""
+    return tracer.traced(name)